@@ -0,0 +1,22 @@
+"""Item owner keyset index
+
+Revision ID: 3b1f2c7d9e10
+Revises: d4867f3a4c0a
+Create Date: 2026-10-18 09:12:44.118305
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3b1f2c7d9e10"
+down_revision = "d4867f3a4c0a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_item_owner_id_id", "item", ["owner_id", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_item_owner_id_id", table_name="item")
@@ -0,0 +1,32 @@
+"""Row version columns
+
+Revision ID: 8c2e4a6f1d35
+Revises: 3b1f2c7d9e10
+Create Date: 2026-10-18 14:03:27.540912
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8c2e4a6f1d35"
+down_revision = "3b1f2c7d9e10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "user",
+        sa.Column("version_id", sa.Integer(), server_default="1", nullable=False),
+    )
+    op.add_column(
+        "item",
+        sa.Column("version_id", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("item", "version_id")
+    op.drop_column("user", "version_id")
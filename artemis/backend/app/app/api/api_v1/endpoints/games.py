@@ -1,62 +1,158 @@
+from datetime import date
 from typing import Any, Dict
 
 from bson import ObjectId
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pymongo.errors import DuplicateKeyError
 
+from app.api.cache import cache_response
+from app.api.deps import get_fields, get_object_id_cursor
+from app.api.etag import ETAG_HEADER, get_if_match, make_etag
+from app.api.responses import fields_model, trusted_detail_response, trusted_response
+from app.api.streaming import NDJSON_RESPONSES, ndjson_response, wants_ndjson
+from app.core.pagination import NEXT_CURSOR_HEADER, next_cursor
 from app.crud.mongo.game import mongo_game_crud
 from app.db.mongo.session import AsyncIOMotorClient, get_database
 from app.db.mongo.base_class import PyObjectId
-from app.models.mongo.mysportsfeeds import CreateGames, Games, UpdateGames
+from app.models.mongo.mysportsfeeds import CreateGames, Games, PartialGames, UpdateGames
 
 router = APIRouter()
 
 
+def get_game_id(id: str) -> str:
+    """
+    ``id`` path parameter, no game has an id that is not an ObjectId.
+    """
+    if not ObjectId.is_valid(id):
+        raise HTTPException(status_code=404, detail="Game not found")
+    return id
+
+
 @router.post("/", response_description="Add new game", response_model=Games)
 async def create_game(
     game: CreateGames, db: AsyncIOMotorClient = Depends(get_database)
 ) -> Games:
-    return await mongo_game_crud.create(coll=db.MySportsFeeds.games, obj_in=game)
+    try:
+        return await mongo_game_crud.create(coll=db.MySportsFeeds.games, obj_in=game)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=409, detail=f"Games for {game.date} already exist"
+        )
 
 
-@router.get("/", response_description="Get All Games", response_model=List[Games])
+@router.get(
+    "/",
+    response_description="Get All Games",
+    response_model=List[PartialGames],
+    response_model_exclude_unset=True,
+    responses=NDJSON_RESPONSES,
+)
+@cache_response(ttl=30, tags=mongo_game_crud.cache_tags())
 async def get_all_games(
-    skip: int = 0, limit: int = 100, db: AsyncIOMotorClient = Depends(get_database)
-) -> List[Games]:
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[str] = Depends(get_object_id_cursor),
+    fields: Optional[List[str]] = Depends(get_fields),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    stream: bool = Depends(wants_ndjson),
+    db: AsyncIOMotorClient = Depends(get_database),
+) -> Any:
+    """
+    Games in ``_id`` order, or in ``date`` order when ``from``/``to`` select an
+    inclusive date range through the ``date`` index.
+
+    The ``X-Next-Cursor`` header is only sent for ``_id`` order; page date
+    ranges with ``skip`` or by moving ``from``.
+    """
+    try:
+        mongo_game_crud.projection(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    query = mongo_game_crud.date_range(date_from, date_to)
+    if query and after_id is not None:
+        raise HTTPException(
+            status_code=400, detail="cursor cannot be combined with from/to"
+        )
+    sort = "date" if query else "_id"
+    model = fields_model(Games, fields)
+    if stream:
+        records = mongo_game_crud.stream_multi(
+            db.MySportsFeeds.games,
+            skip=skip,
+            limit=limit,
+            after_id=after_id,
+            fields=fields,
+            query=query,
+            sort=sort,
+        )
+        return ndjson_response(records, model)
     games = await mongo_game_crud.get_multi(
-        coll=db.MySportsFeeds.games, skip=skip, limit=limit
+        coll=db.MySportsFeeds.games,
+        skip=skip,
+        limit=limit,
+        after_id=after_id,
+        fields=fields,
+        query=query,
+        sort=sort,
     )
-    return games
+    if not query and (
+        cursor := next_cursor(games, limit, key=lambda game: str(game["_id"]))
+    ):
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return trusted_response(games, model, response=response)
 
 
 @router.get("/{id}", response_description="Get a game by ID", response_model=Games)
+@cache_response(ttl=60, tags=lambda id, **_: mongo_game_crud.cache_tags(id))
 async def get_game_by_id(
-    id: str, db: AsyncIOMotorClient = Depends(get_database)
-) -> Games:
-    game = await mongo_game_crud.get(db.MySportsFeeds.games, id)
+    id: str,
+    response: Response,
+    fields: Optional[List[str]] = Depends(get_fields),
+    db: AsyncIOMotorClient = Depends(get_database),
+) -> Any:
+    """
+    A game, trimmed to ``fields`` and ``_id`` when they are given.
+    """
+    try:
+        game = await mongo_game_crud.get(db.MySportsFeeds.games, id, fields=fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if game is None:
         raise HTTPException(404)
-    return Games(**game)
+    response.headers[ETAG_HEADER] = make_etag(mongo_game_crud.revision(game))
+    return trusted_detail_response(game, fields_model(Games, fields), response=response)
 
 
 @router.patch("/{id}", response_description="Update a game", response_model=Games)
 async def update_game(
-    id: str, game_update: UpdateGames, db: AsyncIOMotorClient = Depends(get_database)
+    game_update: UpdateGames,
+    response: Response,
+    revisions: Optional[List[int]] = Depends(get_if_match),
+    id: str = Depends(get_game_id),
+    db: AsyncIOMotorClient = Depends(get_database),
 ) -> Games:
-    update_game = await mongo_game_crud.get(db.MySportsFeeds.games, id)
-    return await mongo_game_crud.update(
-        coll=db.MySportsFeeds.games,
-        db_obj=Games(**update_game),
-        obj_in=game_update,
+    game = await mongo_game_crud.update(
+        coll=db.MySportsFeeds.games, id=id, obj_in=game_update, revisions=revisions
     )
+    if game is None:
+        if revisions is not None and await mongo_game_crud.exists(
+            db.MySportsFeeds.games, id=id
+        ):
+            raise HTTPException(status_code=412, detail="Precondition failed")
+        raise HTTPException(status_code=404, detail="Game not found")
+    response.headers[ETAG_HEADER] = make_etag(mongo_game_crud.revision(game))
+    return game
 
 
 @router.delete("/{id}", response_description="Delete a game", response_model=Games)
 async def delete_game(
-    id: str, db: AsyncIOMotorClient = Depends(get_database)
+    id: str = Depends(get_game_id), db: AsyncIOMotorClient = Depends(get_database)
 ) -> Games:
-    return await mongo_game_crud.remove(
-        coll=db.MySportsFeeds.games,
-        id=id
-    )
+    game = await mongo_game_crud.remove(coll=db.MySportsFeeds.games, id=id)
+    if game is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return game
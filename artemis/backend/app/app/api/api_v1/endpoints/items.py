@@ -1,10 +1,21 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import schemas
-from app.api.deps import get_current_active_user, get_db
+from app.api.cache import cache_response
+from app.api.deps import (
+    get_current_active_user,
+    get_db,
+    get_db_readonly,
+    get_fields,
+    get_int_cursor,
+)
+from app.api.etag import ETAG_HEADER, get_if_match, make_etag
+from app.api.responses import fields_model, trusted_detail_response, trusted_response
+from app.api.streaming import NDJSON_RESPONSES, ndjson_response, wants_ndjson
+from app.core.pagination import NEXT_CURSOR_HEADER, next_cursor
 from app.crud.postgres.item import item_crud
 from app.crud.postgres.user import user_crud
 from app.models.postgres.item import Item
@@ -13,31 +24,101 @@ from app.models.postgres.user import User
 router = APIRouter()
 
 
-@router.get("/", response_model=List[Item])
+def restricted_owner_id(current_user: User) -> Optional[int]:
+    """
+    Owner the items a user may modify are restricted to, ``None`` for superusers.
+    """
+    if user_crud.is_superuser(current_user):
+        return None
+    return current_user.id
+
+
+async def missing_item_error(
+    db: AsyncSession,
+    *,
+    id: int,
+    owner_id: Optional[int] = None,
+    versions: Optional[List[int]] = None,
+) -> HTTPException:
+    """
+    Tell apart a missing item, one owned by someone else and one whose version
+    did not match ``If-Match`` after a write statement restricted to them
+    matched no row.
+    """
+    item = await item_crud.get(db=db, id=id)
+    if item is None:
+        return HTTPException(status_code=404, detail="Item not found")
+    if versions is not None and owner_id in (None, item.owner_id):
+        return HTTPException(status_code=412, detail="Precondition failed")
+    return HTTPException(status_code=400, detail="Not enough permissions")
+
+
+@router.get("/", response_model=List[Item], responses=NDJSON_RESPONSES)
+@cache_response(ttl=30, tags=item_crud.cache_tags())
 async def read_items(
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_db_readonly),
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[int] = Depends(get_int_cursor),
+    fields: Optional[List[str]] = Depends(get_fields),
+    stream: bool = Depends(wants_ndjson),
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
 
     Args:
+        response (:class:`~fastapi.Response`):
         db (`sqlmodel.ext.asyncio.session.AsyncSession`):
         skip (int):
         limit (int):
+        after_id (Optional[int]): decoded ``cursor`` query parameter, replaces
+            ``skip`` with keyset pagination when given
+        fields (Optional[List[str]]): only select and return these columns,
+            and ``id``
+        stream (bool): stream the items as NDJSON instead of a JSON list
         current_user (:class:`~models.postgres.user.User`):
 
     Returns:
-        Any
+        Any: the page of items, the cursor of the next page is sent in the
+            ``X-Next-Cursor`` header
     """
+    try:
+        item_crud.columns(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    model = fields_model(Item, fields)
+    if stream:
+        if user_crud.is_superuser(current_user):
+            records = item_crud.stream_multi(
+                db, skip=skip, limit=limit, after_id=after_id, fields=fields
+            )
+        else:
+            records = item_crud.stream_multi_by_owner(
+                db,
+                owner_id=current_user.id,  # type: ignore
+                skip=skip,
+                limit=limit,
+                after_id=after_id,
+                fields=fields,
+            )
+        return ndjson_response(records, model)
     if user_crud.is_superuser(current_user):
-        items = await item_crud.get_multi(db, skip=skip, limit=limit)
+        items = await item_crud.get_multi(
+            db, skip=skip, limit=limit, after_id=after_id, fields=fields
+        )
     else:
         items = await item_crud.get_multi_by_owner(
-            db=db, owner_id=current_user.id, skip=skip, limit=limit  # type: ignore
+            db=db,
+            owner_id=current_user.id,  # type: ignore
+            skip=skip,
+            limit=limit,
+            after_id=after_id,
+            fields=fields,
         )
-    return items
+    if cursor := next_cursor(items, limit, key=lambda item: item.id):
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return trusted_response(items, model, response=response)
 
 
 @router.post("/", response_model=Item)
@@ -56,42 +137,73 @@ async def create_item(
     return item
 
 
+@router.post("/bulk", response_model=List[Item])
+async def create_items(
+    *,
+    db: AsyncSession = Depends(get_db),
+    items_in: List[schemas.ItemCreate],
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Create many items in a single transaction.
+    """
+    items = await item_crud.create_many_with_owner(
+        db=db, objs_in=items_in, owner_id=current_user.id  # type: ignore
+    )
+    return items
+
+
 @router.put("/{id}", response_model=Item)
 async def update_item(
     *,
     db: AsyncSession = Depends(get_db),
     id: int,
     item_in: schemas.ItemUpdate,
+    response: Response,
+    versions: Optional[List[int]] = Depends(get_if_match),
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
-    Update an item.
+    Update an item, only if its ETag matches ``If-Match`` when it is sent.
     """
-    item = await item_crud.get(db=db, id=id)
+    owner_id = restricted_owner_id(current_user)
+    item = await item_crud.update_with_owner(
+        db=db, id=id, obj_in=item_in, owner_id=owner_id, versions=versions
+    )
     if not item:
-        raise HTTPException(status_code=404, detail="Item not found")
-    if not user_crud.is_superuser(current_user) and (item.owner_id != current_user.id):
-        raise HTTPException(status_code=400, detail="Not enough permissions")
-    item = await item_crud.update(db=db, db_obj=item, obj_in=item_in)
+        raise await missing_item_error(db, id=id, owner_id=owner_id, versions=versions)
+    response.headers[ETAG_HEADER] = make_etag(item.version_id)
     return item
 
 
 @router.get("/{id}", response_model=Item)
+@cache_response(ttl=60, tags=lambda id, **_: item_crud.cache_tags(id))
 async def read_item(
     *,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
     id: int,
+    response: Response,
+    fields: Optional[List[str]] = Depends(get_fields),
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
-    Get item by ID.
+    Get item by ID, 304 when ``If-None-Match`` holds its current ETag.
+
+    With ``fields`` only those columns, and ``id``, are read and returned.
     """
-    item = await item_crud.get(db=db, id=id)
+    try:
+        item_crud.columns(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # The owner and version are always read for the permission check and ETag
+    columns = None if fields is None else [*fields, "owner_id", "version_id"]
+    item = await item_crud.get(db=db, id=id, fields=columns)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
     if not user_crud.is_superuser(current_user) and (item.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
-    return item
+    response.headers[ETAG_HEADER] = make_etag(item.version_id)
+    return trusted_detail_response(item, fields_model(Item, fields), response=response)
 
 
 @router.delete("/{id}", response_model=Item)
@@ -104,10 +216,9 @@ async def delete_item(
     """
     Delete an item.
     """
-    item = await item_crud.get(db=db, id=id)
+    item = await item_crud.remove_with_owner(
+        db=db, id=id, owner_id=restricted_owner_id(current_user)
+    )
     if not item:
-        raise HTTPException(status_code=404, detail="Item not found")
-    if not user_crud.is_superuser(current_user) and (item.owner_id != current_user.id):
-        raise HTTPException(status_code=400, detail="Not enough permissions")
-    item = await item_crud.remove(db=db, id=id)
+        raise await missing_item_error(db, id=id)
     return item
@@ -9,8 +9,9 @@ from app import schemas
 from app.api import deps
 from app.core import security
 from app.core.config import settings
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 from app.crud.postgres.user import user_crud
+from app.crud.postgres.user_cache import user_cache
 from app.models.postgres.user import User
 from app.utils import (
     generate_password_reset_token,
@@ -92,8 +93,9 @@ async def reset_password(
         )
     elif not user_crud.is_active(user):
         raise HTTPException(status_code=400, detail="Inactive user")
-    hashed_password = get_password_hash(new_password)
+    hashed_password = await get_password_hash_async(new_password)
     user.hashed_password = hashed_password
     db.add(user)
     await db.commit()
+    await user_cache.invalidate(user.id)
     return {"msg": "Password updated successfully"}
@@ -3,24 +3,38 @@ from typing import Any, List, Optional
 from aredis_om import NotFoundError
 from fastapi import APIRouter, HTTPException
 
+from app.crud.redis.item import redis_item_crud
 from app.models.redis.item import Item
-from app.schemas.redis.item import ItemCreate
+from app.schemas.redis.item import (
+    ItemBulkCreate,
+    ItemBulkPks,
+    ItemBulkResult,
+    ItemCreate,
+)
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[Item])
-async def list_redis_items(name: Optional[str] = None) -> Any:
-    items = []
-    pks = [pk async for pk in await Item.all_pks()]
-    for pk in pks:
-        item = await Item.get(pk)
-        if name is None:
-            items.append(item)
-        else:
-            if item.name == name:
-                items.append(item)
-    return items
+async def list_redis_items(
+    name: Optional[str] = None, skip: int = 0, limit: int = 100
+) -> Any:
+    """
+    Lists Redis Items, newest first, through the RediSearch index
+
+    Filtering, sorting and paging all happen inside Redis in a single FT.SEARCH.
+
+    Args:
+        name (Optional[str]): only return `Item`s with exactly this name
+        skip (int): number of matching `Item`s to skip
+        limit (int): maximum number of `Item`s to return
+
+    Returns:
+        List[Item]: page of matching `Item`s
+    """
+    query = Item.find(Item.name == name) if name is not None else Item.find()
+    query = query.sort_by("-timestamp").copy(offset=skip, limit=limit)
+    return await query.execute(exhaust_results=False)
 
 
 @router.post("/", response_model=Item)
@@ -28,15 +42,79 @@ async def post_redis_item(item: ItemCreate) -> Any:
     return await Item(name=item.name).save()
 
 
+@router.post("/bulk", response_model=List[ItemBulkResult])
+async def post_redis_items(bulk: ItemBulkCreate) -> Any:
+    """
+    Creates many Redis Items, pipelining the writes in `REDIS_BATCH_SIZE` batches
+
+    Args:
+        bulk (ItemBulkCreate): `Item`s to create
+
+    Returns:
+        List[ItemBulkResult]: created `Item` or error for each input, in order
+    """
+    results = await redis_item_crud.create_many(objs_in=bulk.items)
+    return [
+        ItemBulkResult(error=str(r))
+        if isinstance(r, Exception)
+        else ItemBulkResult(pk=r.pk, item=r)
+        for r in results
+    ]
+
+
+@router.post("/bulk/get", response_model=List[ItemBulkResult])
+async def get_redis_items(bulk: ItemBulkPks) -> Any:
+    """
+    Fetches many Redis Items by pk, pipelining the reads in `REDIS_BATCH_SIZE` batches
+
+    Args:
+        bulk (ItemBulkPks): pks of the `Item`s to fetch
+
+    Returns:
+        List[ItemBulkResult]: `Item` or error for each pk, in order
+    """
+    results = await redis_item_crud.get_many(pks=bulk.pks)
+    return [
+        ItemBulkResult(pk=pk, error=bulk_error(pk, r))
+        if isinstance(r, Exception)
+        else ItemBulkResult(pk=pk, item=r)
+        for pk, r in zip(bulk.pks, results)
+    ]
+
+
+@router.post("/bulk/delete", response_model=List[ItemBulkResult])
+async def delete_redis_items(bulk: ItemBulkPks) -> Any:
+    """
+    Deletes many Redis Items by pk, pipelining the deletes in `REDIS_BATCH_SIZE`
+    batches
+
+    Args:
+        bulk (ItemBulkPks): pks of the `Item`s to delete
+
+    Returns:
+        List[ItemBulkResult]: whether each pk was deleted or its error, in order
+    """
+    results = await redis_item_crud.remove_many(pks=bulk.pks)
+    return [
+        ItemBulkResult(pk=pk, error=str(r))
+        if isinstance(r, Exception)
+        else ItemBulkResult(pk=pk, deleted=bool(r))
+        for pk, r in zip(bulk.pks, results)
+    ]
+
+
+def bulk_error(pk: str, error: Exception) -> str:
+    if isinstance(error, NotFoundError):
+        return f"Item {pk} not found"
+    return str(error)
+
+
 @router.get("/{pk}", response_model=Item)
 async def get_redis_item(pk: str) -> Any:
-    pks = [val async for val in await Item.all_pks()]
-    for val in pks:
-        item = await Item.get(val)
-        if item.pk == pk:
-            return item
-
-    raise HTTPException(status_code=404, detail=f"Item {id} not found")
+    try:
+        return await Item.get(pk)
+    except NotFoundError:
+        raise HTTPException(status_code=404, detail=f"Item {pk} not found")
 
 
 @router.put("/{id}", response_model=Item)
@@ -1,13 +1,21 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Body, Depends, HTTPException
-from fastapi.encoders import jsonable_encoder
+from fastapi import APIRouter, Body, Depends, HTTPException, Response
 from pydantic.networks import EmailStr
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import schemas
-from app.api.deps import get_current_active_superuser, get_current_active_user, get_db
+from app.api.deps import (
+    get_current_active_superuser,
+    get_current_active_user,
+    get_db,
+    get_db_readonly,
+    get_int_cursor,
+)
+from app.api.responses import trusted_response
+from app.api.streaming import NDJSON_RESPONSES, ndjson_response, wants_ndjson
 from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER, next_cursor
 from app.crud.postgres.user import user_crud
 from app.models.postgres.user import User
 from app.utils import send_new_account_email
@@ -15,18 +23,29 @@ from app.utils import send_new_account_email
 router = APIRouter()
 
 
-@router.get("/", response_model=List[User])
+@router.get("/", response_model=List[User], responses=NDJSON_RESPONSES)
 async def read_users(
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_db_readonly),
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[int] = Depends(get_int_cursor),
+    stream: bool = Depends(wants_ndjson),
     current_user: User = Depends(get_current_active_superuser),
 ) -> Any:
     """
     Retrieve users.
+
+    Pass the ``X-Next-Cursor`` header of a page as ``cursor`` to read the next one,
+    or ``stream=true`` to stream the users as NDJSON.
     """
-    users = await user_crud.get_multi(db, skip=skip, limit=limit)
-    return users
+    if stream:
+        records = user_crud.stream_multi(db, skip=skip, limit=limit, after_id=after_id)
+        return ndjson_response(records, User)
+    users = await user_crud.get_multi(db, skip=skip, limit=limit, after_id=after_id)
+    if cursor := next_cursor(users, limit, key=lambda user: user.id):
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return trusted_response(users, User, response=response)
 
 
 @router.post("/", response_model=User)
@@ -64,9 +83,10 @@ async def update_user_me(
 ) -> Any:
     """
     Update own user.
+
+    Only the given fields are written, ``current_user`` may be a cached copy.
     """
-    current_user_data = jsonable_encoder(current_user)
-    user_in = schemas.UserUpdate(**current_user_data)
+    user_in = schemas.UserUpdate()
     if password is not None:
         user_in.password = password
     if full_name is not None:
@@ -77,13 +97,13 @@ async def update_user_me(
     return user
 
 
-@router.get("/me", response_model=User)
+@router.get("/me", response_model=schemas.User)
 def read_user_me(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
-    Get current user.
+    Get current user, without the password hash the cached user doesn't have.
     """
     return current_user
 
@@ -118,14 +138,14 @@ async def create_user_open(
 @router.get("/{user_id}", response_model=User)
 async def read_user_by_id(
     user_id: int,
+    db: AsyncSession = Depends(get_db_readonly),
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
 ) -> Any:
     """
     Get a specific user by id.
     """
     user = await user_crud.get(db, id=user_id)
-    if user == current_user:
+    if user is not None and user.id == current_user.id:
         return user
     if not user_crud.is_superuser(current_user):
         raise HTTPException(
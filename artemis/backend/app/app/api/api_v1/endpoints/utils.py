@@ -1,11 +1,24 @@
-from typing import Any
+from typing import Any, List, Literal, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 from pydantic.networks import EmailStr
 
 from app import schemas
 from app.api import deps
+from app.core.cache import response_cache
 from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.memory import MemoryTracingError, memory_tracker
+from app.core.profiling import (
+    MIN_INTERVAL_SECONDS,
+    ProfilerRunningError,
+    loop_monitor,
+    profiler,
+)
+from app.crud.postgres.user_cache import user_cache
+from app.db.postgres.pool import pool_stats
+from app.db.postgres.session import engine
 from app.models.postgres.user import User
 from app.utils import send_test_email
 
@@ -34,3 +47,167 @@ def test_email(
     """
     send_test_email(email_to=email_to)
     return {"msg": "Test email sent"}
+
+
+@router.get("/db-pool-stats/", response_model=schemas.DBPoolStats)
+def read_db_pool_stats(
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Postgres connection pool usage and checkout wait times of this worker.
+    """
+    return pool_stats(engine.sync_engine.pool)
+
+
+@router.get("/user-cache-stats/", response_model=schemas.UserCacheStats)
+def read_user_cache_stats(
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Hits and misses of this worker's authenticated user cache.
+    """
+    return user_cache.stats()
+
+
+@router.get("/response-cache-stats/", response_model=schemas.ResponseCacheStats)
+def read_response_cache_stats(
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    In-process and Redis hits, misses and coalesced misses of this worker's
+    response cache.
+    """
+    return response_cache.stats()
+
+
+@router.post("/profiler/start/", response_model=schemas.ProfilerStatus)
+def start_profiler(
+    interval: Optional[float] = Query(
+        None, ge=MIN_INTERVAL_SECONDS, le=settings.PROFILER_MAX_SECONDS
+    ),
+    duration: Optional[float] = Query(None, gt=0, le=settings.PROFILER_MAX_SECONDS),
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Start sampling the stacks of this worker every ``interval`` seconds, for at
+    most ``duration`` seconds, dropping the previous profile.
+    """
+    try:
+        profiler.start(interval=interval, duration=duration)
+    except ProfilerRunningError:
+        raise HTTPException(status_code=409, detail="The profiler is already running")
+    return profiler.status()
+
+
+@router.post("/profiler/stop/", response_model=schemas.ProfilerStatus)
+def stop_profiler(
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Stop the profiler, its profile stays available for download.
+    """
+    profiler.stop()
+    return profiler.status()
+
+
+@router.get("/profiler/", response_class=PlainTextResponse)
+def download_profile(
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    The profile as collapsed stacks, for ``flamegraph.pl`` or speedscope.
+    """
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={"Content-Disposition": 'attachment; filename="profile.collapsed"'},
+    )
+
+
+@router.get("/loop-lag/", response_model=schemas.LoopLagStats)
+def read_loop_lag(
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Percentiles, in seconds, of the recent event loop lag of this worker.
+    """
+    return loop_monitor.stats()
+
+
+@router.get("/slow-callbacks/", response_model=List[schemas.SlowCallback])
+def read_slow_callbacks(
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Recent stalls of this worker's event loop, newest first, with the stack
+    that blocked it.
+    """
+    return list(reversed(loop_monitor.slow_callbacks))
+
+
+@router.post("/memory/start/", response_model=schemas.MemoryStatus)
+def start_memory_tracing(
+    frames: Optional[int] = Query(None, ge=1),
+    sample_rate: float = Query(0.0, ge=0.0, le=1.0),
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Start tracemalloc in this worker, keeping ``frames`` frames per allocation,
+    and record the allocation peaks of a ``sample_rate`` fraction of requests.
+    """
+    memory_tracker.start(frames=frames, sample_rate=sample_rate)
+    return memory_tracker.status()
+
+
+@router.post("/memory/stop/", response_model=schemas.MemoryStatus)
+def stop_memory_tracing(
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Stop tracemalloc and drop the snapshots, the route peaks stay available.
+    """
+    memory_tracker.stop()
+    return memory_tracker.status()
+
+
+@router.post("/memory/snapshots/{name}", response_model=schemas.MemorySnapshot)
+def take_memory_snapshot(
+    name: str,
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Take a tracemalloc snapshot named ``name``.
+    """
+    try:
+        return memory_tracker.take_snapshot(name)
+    except MemoryTracingError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/memory/diff/", response_model=List[schemas.MemoryStatDiff])
+def read_memory_diff(
+    base: str,
+    target: Optional[str] = None,
+    group_by: Literal["filename", "lineno"] = "lineno",
+    limit: int = Query(20, ge=1, le=1000),
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    The files or lines whose allocations grew the most from the ``base``
+    snapshot to the ``target`` one, or to now without ``target``.
+    """
+    try:
+        return memory_tracker.diff(base, target, group_by=group_by, limit=limit)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Unknown snapshot {e}")
+    except MemoryTracingError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/memory/routes/", response_model=List[schemas.RouteMemoryStats])
+def read_route_memory(
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Allocation peaks, in bytes, of the sampled requests by route, largest first.
+    """
+    return memory_tracker.route_stats()
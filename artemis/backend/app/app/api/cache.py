@@ -0,0 +1,151 @@
+import functools
+import hashlib
+import inspect
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Union
+
+from fastapi import Request, Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.api.etag import ETAG_HEADER, not_modified
+from app.core.cache import response_cache
+from app.core.config import settings
+
+CACHE_STATUS_HEADER = "X-Cache"
+
+Tags = Union[Sequence[str], Callable[..., Iterable[str]]]
+
+
+def cache_key(request: Request, principal: Optional[Any] = None) -> str:
+    """
+    Key of a cached response: the path, the sorted query parameters, the
+    ``Accept`` header and the principal the response was computed for.
+    """
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    raw = "|".join(
+        (
+            request.url.path,
+            query,
+            request.headers.get("accept", ""),
+            "" if principal is None else str(principal),
+        )
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+async def serialize(
+    request: Request, result: Any, endpoint_kwargs: Dict[str, Any]
+) -> Response:
+    """
+    Build the response FastAPI would send for an endpoint's return value, with
+    the route's ``response_model`` and ``response_class`` and the headers set on
+    the endpoint's ``Response`` parameter.
+    """
+    route: APIRoute = request.scope["route"]
+    content = await serialize_response(
+        field=route.secure_cloned_response_field,
+        response_content=result,
+        include=route.response_model_include,
+        exclude=route.response_model_exclude,
+        by_alias=route.response_model_by_alias,
+        exclude_unset=route.response_model_exclude_unset,
+        exclude_defaults=route.response_model_exclude_defaults,
+        exclude_none=route.response_model_exclude_none,
+    )
+    response_class = route.response_class
+    if isinstance(response_class, DefaultPlaceholder):
+        response_class = response_class.value
+    response = response_class(content, status_code=route.status_code or 200)
+    sub_response = next(
+        (v for v in endpoint_kwargs.values() if isinstance(v, Response)), None
+    )
+    if sub_response is not None:
+        if sub_response.status_code:
+            response.status_code = sub_response.status_code
+        for name, value in sub_response.headers.items():
+            response.headers[name] = value
+    return response
+
+
+def cache_response(
+    *, ttl: int, tags: Tags = (), user_param: str = "current_user"
+) -> Callable:
+    """
+    Cache the serialized responses of a GET endpoint in-process and in Redis.
+
+    Dependencies, including authentication, still run on every request, only
+    the endpoint body is skipped on a hit. Concurrent misses of the same
+    response in a worker wait for a single run of the endpoint, see
+    :class:`app.core.cache.ResponseCache`. Responses are serialized the way the
+    route would, with its ``response_model`` and ``response_class``, and headers
+    the endpoint set on its ``Response`` parameter are cached with them.
+    Endpoints may also return a ``Response`` themselves, e.g. a
+    :func:`app.api.responses.trusted_response`, which is cached as is, but
+    streaming responses such as NDJSON are never cached.
+
+    When the endpoint sets an ``ETag`` header, requests whose ``If-None-Match``
+    matches it get a 304, answered from the cache on a hit.
+
+    Args:
+        ttl (int): seconds a response stays cached
+        tags (Tags): invalidation tags, or a callable returning them from the
+            endpoint's arguments, see :func:`app.core.cache.invalidate_tags`
+        user_param (str): argument holding the current user; when the endpoint
+            has it, responses are cached per user
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, cache_request: Request, **kwargs: Any) -> Any:
+            async def compute() -> Any:
+                result = await func(*args, **kwargs)
+                if isinstance(result, StreamingResponse):
+                    return result
+                if isinstance(result, Response):
+                    response = result
+                else:
+                    response = await serialize(cache_request, result, kwargs)
+                headers = dict(response.headers)
+                headers.pop("content-length", None)
+                return {
+                    "status_code": response.status_code,
+                    "headers": headers,
+                    "body": response.body.decode(),
+                }
+
+            cache_headers: Dict[str, str] = {}
+            if settings.RESPONSE_CACHE_ENABLED:
+                route_tags = list(tags(**kwargs) if callable(tags) else tags)
+                user = kwargs.get(user_param)
+                key = cache_key(cache_request, None if user is None else user.id)
+                entry, hit = await response_cache.fetch(
+                    key, route_tags, ttl=ttl, compute=compute
+                )
+                cache_headers[CACHE_STATUS_HEADER] = "HIT" if hit else "MISS"
+            else:
+                entry = await compute()
+            if isinstance(entry, Response):
+                return entry
+            etag = entry["headers"].get("etag")
+            if etag is not None and not_modified(cache_request, etag):
+                return Response(
+                    status_code=304, headers={ETAG_HEADER: etag, **cache_headers}
+                )
+            return Response(
+                content=entry["body"],
+                status_code=entry["status_code"],
+                headers={**entry["headers"], **cache_headers},
+            )
+
+        request_param = inspect.Parameter(
+            "cache_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request
+        )
+        wrapper.__signature__ = signature.replace(  # type: ignore
+            parameters=[*signature.parameters.values(), request_param]
+        )
+        return wrapper
+
+    return decorator
@@ -1,17 +1,25 @@
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, List, Optional
 
-from fastapi import Depends, HTTPException, status
+from bson import ObjectId
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import schemas
 from app.core import security
 from app.core.config import settings
+from app.core.pagination import InvalidCursorError, decode_cursor
 from app.crud.postgres.user import user_crud
-from app.db.postgres.session import SessionLocal
+from app.db.postgres.session import (
+    READ_ONLY,
+    SessionLocal,
+    autocommit_engine,
+    has_pending_writes,
+)
 from app.models.postgres.user import User
 
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -20,18 +28,86 @@ reusable_oauth2 = OAuth2PasswordBearer(
 
 
 async def get_db() -> AsyncGenerator:
+    """
+    Request scoped session.
+
+    The session only checks a connection out of the pool for its first query,
+    and only commits at the end of the request when something was written, so
+    handlers that fail early or only read cost no extra round trip.
+    """
     async with SessionLocal() as session:
         try:
             yield session
-            await session.commit()
+            if has_pending_writes(session):
+                await session.commit()
         except SQLAlchemyError as sql_ex:
-            await session.rollback()
+            if session.in_transaction():
+                await session.rollback()
             raise sql_ex
         except HTTPException as http_ex:
-            await session.rollback()
+            if session.in_transaction():
+                await session.rollback()
             raise http_ex
-        finally:
-            await session.close()
+
+
+async def get_db_readonly(db: AsyncSession = Depends(get_db)) -> AsyncGenerator:
+    """
+    The request session, restricted to reads, for GET handlers.
+
+    It is the same session :func:`get_current_user` uses. Writes raise
+    :class:`~app.db.postgres.session.ReadOnlySessionError`, and unless a query
+    already ran, the queries run in autocommit mode without BEGIN/ROLLBACK
+    round trips.
+    """
+    if not db.in_transaction() and isinstance(db.sync_session.bind, Engine):
+        db.sync_session.bind = autocommit_engine.sync_engine
+    db.info[READ_ONLY] = True
+    try:
+        yield db
+    finally:
+        db.info.pop(READ_ONLY, None)
+
+
+def get_cursor(cursor: Optional[str] = None) -> Optional[Any]:
+    """
+    Decode the opaque ``cursor`` query parameter of list endpoints.
+
+    Returns the last ``id`` the client has seen, or ``None`` for offset paging.
+    """
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def get_int_cursor(after_id: Optional[Any] = Depends(get_cursor)) -> Optional[int]:
+    if after_id is not None and (
+        isinstance(after_id, bool) or not isinstance(after_id, int)
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return after_id
+
+
+def get_object_id_cursor(
+    after_id: Optional[Any] = Depends(get_cursor),
+) -> Optional[str]:
+    if after_id is not None and not (
+        isinstance(after_id, str) and ObjectId.is_valid(after_id)
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return after_id
+
+
+def get_fields(
+    fields: Optional[str] = Query(
+        None, description="Comma separated fields to return, all if omitted"
+    ),
+) -> Optional[List[str]]:
+    if fields is None:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()]
 
 
 async def get_current_user(
@@ -47,7 +123,7 @@ async def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = await user_crud.get(db, id=token_data.sub)
+    user = await user_crud.get_cached(db, id=token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -0,0 +1,59 @@
+from typing import List, Optional
+
+from fastapi import Header, HTTPException, Request
+
+ETAG_HEADER = "ETag"
+
+
+def make_etag(revision: int) -> str:
+    """
+    Strong ETag of a row version or document revision.
+    """
+    return f'"{revision}"'
+
+
+def _split_etags(header: str) -> List[str]:
+    return [etag.strip() for etag in header.split(",") if etag.strip()]
+
+
+def _opaque_tag(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """
+    Whether the request's ``If-None-Match`` header matches ``etag``, using the
+    weak comparison RFC 9110 specifies for it.
+    """
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return False
+    etags = _split_etags(header)
+    return "*" in etags or _opaque_tag(etag) in {_opaque_tag(e) for e in etags}
+
+
+def get_if_match(
+    if_match: Optional[str] = Header(
+        None, description="Only update when the ETag is one of these"
+    ),
+) -> Optional[List[int]]:
+    """
+    Revisions the ``If-Match`` header allows, ``None`` when it allows any, i.e.
+    when it is missing or ``*``.
+
+    ``If-Match`` uses strong comparison, weak ETags and ETags that are not ours
+    never match, so a header holding only those fails right away with 412.
+    """
+    if if_match is None:
+        return None
+    etags = _split_etags(if_match)
+    if "*" in etags:
+        return None
+    revisions = [
+        int(etag[1:-1])
+        for etag in etags
+        if len(etag) > 2 and etag[0] == etag[-1] == '"' and etag[1:-1].isdigit()
+    ]
+    if not revisions:
+        raise HTTPException(status_code=412, detail="Precondition failed")
+    return revisions
@@ -0,0 +1,160 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+import orjson
+from bson import ObjectId
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, create_model
+from pydantic.fields import ModelField
+from pydantic.json import ENCODERS_BY_TYPE
+
+from app.models.mongo.mysportsfeeds import MongoBaseModel
+
+# pydantic's encoders for the types orjson does not serialize natively, with
+# the ``json_encoders`` of our Mongo models taking precedence
+ENCODERS: Dict[Any, Callable[[Any], Any]] = {
+    **ENCODERS_BY_TYPE,
+    ObjectId: str,
+    **MongoBaseModel.__config__.json_encoders,
+}
+
+
+def orjson_default(obj: Any) -> Any:
+    """
+    Serialize what orjson cannot, the way ``BaseModel.json`` would.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.dict(by_alias=True)
+    for base in obj.__class__.__mro__[:-1]:
+        encoder = ENCODERS.get(base)
+        if encoder is not None:
+            return encoder(obj)
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson, the app's ``default_response_class``.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache()
+def _model_fields(model: Type[BaseModel]) -> Tuple[ModelField, ...]:
+    return tuple(model.__fields__.values())
+
+
+@lru_cache()
+def _trimmed_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    keep = {"id", *fields}
+    definitions: Dict[str, Any] = {
+        f.name: (f.outer_type_, f.field_info)
+        for f in model.__fields__.values()
+        if f.name in keep or f.alias in keep
+    }
+    return create_model(  # type: ignore
+        f"{model.__name__}Fields", __config__=model.__config__, **definitions
+    )
+
+
+def fields_model(
+    model: Type[BaseModel], fields: Optional[Sequence[str]] = None
+) -> Type[BaseModel]:
+    """
+    ``model`` trimmed to ``fields``, given by name or alias, and its ``id``, for
+    responses of a ``fields=`` request. ``model`` itself without ``fields``.
+    """
+    if fields is None:
+        return model
+    return _trimmed_model(model, tuple(sorted(fields)))
+
+
+def trusted_record(
+    record: Any, model: Type[BaseModel], *, exclude_unset: bool = False
+) -> Dict[str, Any]:
+    """
+    Shape a row or document read from our own databases like ``model`` without
+    validating it.
+
+    Only ``model``'s fields are kept, under their aliases, so a row never leaks
+    columns the model leaves out. Documents are looked up by alias, e.g.
+    ``_id``, and rows by attribute name.
+
+    Args:
+        record (Any): ORM row or Mongo document
+        model (Type[BaseModel]): the endpoint's response model for one record
+        exclude_unset (bool): leave out fields missing from a document, e.g.
+            because of a projection
+    """
+    fields = _model_fields(model)
+    if isinstance(record, dict):
+        if exclude_unset:
+            return {f.alias: record[f.alias] for f in fields if f.alias in record}
+        return {f.alias: record.get(f.alias, f.get_default()) for f in fields}
+    return {f.alias: getattr(record, f.name) for f in fields}
+
+
+def trusted_content(
+    records: Iterable[Any], model: Type[BaseModel], *, exclude_unset: bool = False
+) -> List[Dict[str, Any]]:
+    return [trusted_record(r, model, exclude_unset=exclude_unset) for r in records]
+
+
+def trusted_response(
+    records: Iterable[Any],
+    model: Type[BaseModel],
+    *,
+    response: Optional[Response] = None,
+    exclude_unset: bool = False,
+) -> ORJSONResponse:
+    """
+    Serialize rows or documents read from our own databases straight to JSON.
+
+    FastAPI validates a returned list against the ``response_model`` and then
+    runs it through ``jsonable_encoder``, which costs more than the query on
+    large pages. Records we wrote ourselves are already valid, so list
+    endpoints return this response instead and keep ``response_model`` for
+    the OpenAPI schema only.
+
+    Args:
+        records (Iterable[Any]): ORM rows or Mongo documents
+        model (Type[BaseModel]): model of one record, as in the endpoint's
+            ``response_model``
+        response (Optional[Response]): the endpoint's ``Response`` parameter,
+            whose headers and status code are carried over
+        exclude_unset (bool): leave out fields missing from the documents
+
+    Returns:
+        ORJSONResponse: the JSON list
+    """
+    content = trusted_content(records, model, exclude_unset=exclude_unset)
+    return _response(content, response)
+
+
+def trusted_detail_response(
+    record: Any, model: Type[BaseModel], *, response: Optional[Response] = None
+) -> ORJSONResponse:
+    """
+    Like :func:`trusted_response` for a single row or document.
+    """
+    return _response(trusted_record(record, model), response)
+
+
+def _response(content: Any, response: Optional[Response]) -> ORJSONResponse:
+    if response is None:
+        return ORJSONResponse(content)
+    headers = {
+        name: value
+        for name, value in response.headers.items()
+        if name != "content-length"
+    }
+    return ORJSONResponse(
+        content, status_code=response.status_code or 200, headers=headers
+    )
@@ -0,0 +1,63 @@
+from typing import Any, AsyncIterator, Dict, Type
+
+from fastapi import Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.api.responses import dumps, trusted_record
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# OpenAPI ``responses`` entry for list endpoints that can stream
+NDJSON_RESPONSES: Dict[int, Dict[str, Any]] = {
+    200: {
+        "content": {NDJSON_MEDIA_TYPE: {}},
+        "description": "One JSON record per line when streaming",
+    }
+}
+
+
+def wants_ndjson(
+    request: Request,
+    stream: bool = Query(
+        False, description=f"Stream the records as {NDJSON_MEDIA_TYPE}"
+    ),
+) -> bool:
+    """
+    Whether the client opted into streaming, with ``?stream=true`` or by
+    accepting ``application/x-ndjson``.
+    """
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_response(
+    records: AsyncIterator[Any],
+    response_model: Type[BaseModel],
+    *,
+    exclude_unset: bool = False,
+) -> StreamingResponse:
+    """
+    Stream ``records`` as newline delimited JSON.
+
+    Each record is shaped like ``response_model`` without being validated
+    again, see :func:`app.api.responses.trusted_record`, and written as soon as
+    it is read, so memory use does not grow with the number of records.
+
+    Args:
+        records (AsyncIterator[Any]): rows or documents, usually read from a DB
+            cursor by a ``stream_multi`` CRUD method
+        response_model (Type[BaseModel]): model of one record, as in the
+            endpoint's ``response_model``
+        exclude_unset (bool): leave out fields missing from the record
+
+    Returns:
+        StreamingResponse: the ``application/x-ndjson`` response
+    """
+
+    async def lines() -> AsyncIterator[bytes]:
+        async for record in records:
+            yield dumps(
+                trusted_record(record, response_model, exclude_unset=exclude_unset)
+            ) + b"\n"
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,144 @@
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from datetime import datetime
+from typing import List, Optional
+
+from httpx import AsyncClient
+
+from app.benchmarks.backends import connect
+from app.benchmarks.runner import BenchmarkReport, compare, run_scenario
+from app.benchmarks.scenarios import SCENARIOS
+from app.benchmarks.seed import SeedCounts, clear, seed
+from app.core.config import settings
+
+logger = logging.getLogger("app.benchmarks")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.benchmarks",
+        description="Seed synthetic data and load the API with concurrent clients.",
+    )
+    parser.add_argument(
+        "--backends",
+        choices=["auto", "local", "stand-in"],
+        default="auto",
+        help="local Postgres/Mongo/Redis, in-process stand-ins, or local when "
+        "they answer (default)",
+    )
+    parser.add_argument(
+        "--url",
+        help="load a running server instead of the app in-process, local "
+        "backends only",
+    )
+    parser.add_argument("--users", type=int, default=SeedCounts().users)
+    parser.add_argument("--items", type=int, default=SeedCounts().items)
+    parser.add_argument("--games", type=int, default=SeedCounts().games)
+    parser.add_argument("--redis-items", type=int, default=SeedCounts().redis_items)
+    parser.add_argument("--requests", type=int, default=500, help="per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[scenario.name for scenario in SCENARIOS],
+        help="run only these scenarios, all by default",
+    )
+    parser.add_argument(
+        "--no-response-cache",
+        action="store_true",
+        help="measure the endpoints themselves, in-process only",
+    )
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="allowed slowdown against the baseline, 0.1 for 10%%",
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="keep the seeded data of the run"
+    )
+    return parser.parse_args(argv)
+
+
+async def main(args: argparse.Namespace) -> BenchmarkReport:
+    from app.main import app
+
+    if args.no_response_cache:
+        settings.RESPONSE_CACHE_ENABLED = False
+    counts = SeedCounts(
+        users=args.users,
+        items=args.items,
+        games=args.games,
+        redis_items=args.redis_items,
+    )
+    async with connect(app, args.backends) as backends:
+        if args.url and backends.name != "local":
+            raise SystemExit("--url needs the local backends the server uses")
+        logger.info(f"Seeding {counts} into {backends.name} backends")
+        data = await seed(backends, counts)
+        report = BenchmarkReport(
+            created_at=datetime.utcnow(),
+            backends=backends.name,
+            concurrency=args.concurrency,
+            seed=counts,
+        )
+        client = (
+            AsyncClient(base_url=args.url)
+            if args.url
+            else AsyncClient(app=app, base_url="http://bench")
+        )
+        try:
+            async with client:
+                for scenario in SCENARIOS:
+                    if args.scenario and scenario.name not in args.scenario:
+                        continue
+                    if scenario.redisearch and not backends.redisearch:
+                        logger.info(f"Skipping {scenario.name}, needs RediSearch")
+                        continue
+                    result = await run_scenario(
+                        client,
+                        scenario,
+                        data,
+                        requests=args.requests,
+                        concurrency=args.concurrency,
+                    )
+                    report.results[scenario.name] = result
+                    logger.info(
+                        f"{result.name:<20} {result.requests_per_second:>9.1f} req/s"
+                        f"  p50 {result.p50:>7.2f}ms  p95 {result.p95:>7.2f}ms"
+                        f"  p99 {result.p99:>7.2f}ms  errors {result.errors}"
+                    )
+        finally:
+            if not args.keep:
+                await clear(backends, data)
+    return report
+
+
+def run(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_args(argv)
+    report = asyncio.run(main(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report.json(indent=2))
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        baseline = BenchmarkReport(**json.load(f))
+    if baseline.backends != report.backends:
+        logger.warning(
+            f"Comparing {report.backends} results with a {baseline.backends} baseline"
+        )
+    regressions = compare(report, baseline, tolerance=args.tolerance)
+    for regression in regressions:
+        logger.error(f"Regression: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
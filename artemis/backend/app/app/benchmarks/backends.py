@@ -0,0 +1,152 @@
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Literal
+
+from fastapi import Depends, FastAPI
+from motor.motor_asyncio import AsyncIOMotorClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.deps import get_db, get_db_readonly
+from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.db.mongo.session import db
+from app.db.postgres.session import SessionLocal, engine
+from app.db.redis.session import redis_conn
+
+logger = logging.getLogger(__name__)
+
+Mode = Literal["auto", "local", "stand-in"]
+
+
+class Backends:
+    """
+    Where a benchmark run reads and writes: a session factory for Postgres, a
+    Mongo client, and whether Redis supports RediSearch.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        sessions: Callable[[], AsyncSession],
+        mongo: AsyncIOMotorClient,
+        redisearch: bool,
+    ) -> None:
+        self.name = name
+        self.sessions = sessions
+        self.mongo = mongo
+        self.redisearch = redisearch
+
+
+async def local_available() -> bool:
+    """
+    Whether the Postgres, Mongo and Redis of the settings answer.
+    """
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        mongo = AsyncIOMotorClient(
+            settings.MONGO_DATABASE_URI, serverSelectionTimeoutMS=2000
+        )
+        try:
+            await mongo.admin.command("ping")
+        finally:
+            mongo.close()
+        await redis_conn.ping()
+    except Exception as e:
+        logger.info(f"Local backends unavailable: {e}")
+        return False
+    return True
+
+
+@asynccontextmanager
+async def local_backends(app: FastAPI) -> AsyncIterator[Backends]:
+    """
+    The Postgres, Mongo and Redis of the settings, e.g. the docker-compose
+    containers, set up by the app's own startup handlers.
+    """
+    await app.router.startup()
+    try:
+        yield Backends("local", sessions=SessionLocal, mongo=db.client, redisearch=True)
+    finally:
+        await app.router.shutdown()
+
+
+@asynccontextmanager
+async def stand_in_backends(app: FastAPI) -> AsyncIterator[Backends]:
+    """
+    In-process stand-ins: SQLite for Postgres, mongomock for Mongo and
+    fakeredis for Redis, from the dev dependencies.
+
+    Numbers measured on stand-ins are only comparable with other stand-in runs,
+    and fakeredis has no RediSearch, so scenarios needing it are skipped.
+    """
+    try:
+        from fakeredis.aioredis import FakeRedis
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError as e:
+        raise RuntimeError(
+            "Stand-in backends need the aiosqlite, fakeredis and mongomock-motor "
+            "dev dependencies"
+        ) from e
+
+    sqlite = create_async_engine(
+        "sqlite+aiosqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    instrument_engine(sqlite.sync_engine)
+    async with sqlite.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    sessions = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=sqlite,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
+    async def get_stand_in_db() -> AsyncGenerator:
+        async with sessions() as session:
+            yield session
+            await session.commit()
+
+    async def get_stand_in_db_readonly(
+        session: AsyncSession = Depends(get_db),
+    ) -> AsyncGenerator:
+        yield session
+
+    # Every user of the shared Redis client, the caches and the redis-om
+    # models, talks to fakeredis through its connection pool
+    redis_pool: Any = redis_conn.connection_pool
+    redis_conn.connection_pool = FakeRedis(decode_responses=True).connection_pool
+    mongo_client = db.client
+    db.client = AsyncMongoMockClient()
+    app.dependency_overrides[get_db] = get_stand_in_db
+    app.dependency_overrides[get_db_readonly] = get_stand_in_db_readonly
+    try:
+        yield Backends("stand-in", sessions=sessions, mongo=db.client, redisearch=False)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_db_readonly, None)
+        db.client = mongo_client
+        redis_conn.connection_pool = redis_pool
+        await sqlite.dispose()
+
+
+@asynccontextmanager
+async def connect(app: FastAPI, mode: Mode = "auto") -> AsyncIterator[Backends]:
+    """
+    Local backends, stand-ins, or with ``auto`` the local backends when they
+    answer and stand-ins otherwise.
+    """
+    if mode == "auto":
+        mode = "local" if await local_available() else "stand-in"
+    backends = local_backends if mode == "local" else stand_in_backends
+    async with backends(app) as connected:
+        yield connected
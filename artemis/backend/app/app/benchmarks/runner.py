@@ -0,0 +1,133 @@
+import asyncio
+import itertools
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from httpx import AsyncClient
+from pydantic import BaseModel
+
+from app.benchmarks.scenarios import Scenario
+from app.benchmarks.seed import SeedCounts, SeedData
+from app.core.config import settings
+from app.core.profiling import percentile
+
+logger = logging.getLogger(__name__)
+
+
+class ScenarioResult(BaseModel):
+    name: str
+    requests: int
+    errors: int
+    seconds: float
+    requests_per_second: float
+    # Latencies in milliseconds
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+class BenchmarkReport(BaseModel):
+    created_at: datetime
+    backends: str
+    concurrency: int
+    seed: SeedCounts
+    results: Dict[str, ScenarioResult] = {}
+
+
+async def run_scenario(
+    client: AsyncClient,
+    scenario: Scenario,
+    data: SeedData,
+    *,
+    requests: int,
+    concurrency: int,
+    warmup: int = 10,
+) -> ScenarioResult:
+    """
+    Send ``requests`` requests of ``scenario`` from ``concurrency`` concurrent
+    clients, after ``warmup`` untimed ones.
+
+    Responses with a 4xx or 5xx status count as errors, and are timed like the
+    others, as do exceptions the in-process app raises instead of responding.
+    """
+    headers: Dict[str, str] = {}
+    if scenario.user is not None:
+        user_id = data.superuser_id if scenario.user == "superuser" else data.user_id
+        headers = data.headers(user_id)
+
+    async def send(n: int) -> bool:
+        try:
+            response = await client.request(
+                scenario.method,
+                f"{settings.API_V1_STR}{scenario.path(data, n)}",
+                headers=headers,
+                json=None if scenario.body is None else scenario.body(data, n),
+            )
+        except Exception as e:
+            logger.debug(f"{scenario.name} request {n} failed: {e!r}")
+            return False
+        return response.status_code < 400
+
+    for n in range(warmup):
+        await send(n)
+
+    counter = itertools.count()
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while (n := next(counter)) < requests:
+            start = time.perf_counter()
+            ok = await send(warmup + n)
+            latencies.append(time.perf_counter() - start)
+            if not ok:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    return ScenarioResult(
+        name=scenario.name,
+        requests=requests,
+        errors=errors,
+        seconds=seconds,
+        requests_per_second=requests / seconds if seconds else 0.0,
+        p50=percentile(latencies, 0.5) * 1000,
+        p95=percentile(latencies, 0.95) * 1000,
+        p99=percentile(latencies, 0.99) * 1000,
+        max=latencies[-1] * 1000 if latencies else 0.0,
+    )
+
+
+def compare(
+    report: BenchmarkReport, baseline: BenchmarkReport, *, tolerance: float
+) -> List[str]:
+    """
+    Regressions of ``report`` against ``baseline``: scenarios serving fewer
+    requests per second, or with a higher p95, by more than ``tolerance``, e.g.
+    ``0.1`` for 10%, or with errors the baseline did not have.
+    """
+    regressions = []
+    for name, result in report.results.items():
+        before: Optional[ScenarioResult] = baseline.results.get(name)
+        if before is None:
+            continue
+        if result.requests_per_second < before.requests_per_second * (1 - tolerance):
+            regressions.append(
+                f"{name}: {result.requests_per_second:.1f} req/s, "
+                f"{before.requests_per_second:.1f} in the baseline"
+            )
+        if result.p95 > before.p95 * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {result.p95:.2f}ms, {before.p95:.2f}ms in the baseline"
+            )
+        if result.errors > before.errors:
+            regressions.append(
+                f"{name}: {result.errors} errors, {before.errors} in the baseline"
+            )
+    return regressions
@@ -0,0 +1,65 @@
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from app.benchmarks.seed import SeedData
+
+
+class Scenario(BaseModel):
+    """
+    A request sent over and over by a benchmark, ``path`` and ``body`` build
+    the ``n``-th request from the seeded data.
+    """
+
+    name: str
+    method: str = "GET"
+    path: Callable[[SeedData, int], str]
+    body: Optional[Callable[[SeedData, int], Dict[str, Any]]] = None
+    # Who sends the requests, None for anonymous ones
+    user: Optional[str] = "superuser"
+    redisearch: bool = False
+
+
+def _nth(values: List[Any], n: int) -> Any:
+    return values[n % len(values)]
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario(name="users_me", path=lambda data, n: "/users/me"),
+    Scenario(name="items_list", path=lambda data, n: "/items/?limit=100"),
+    Scenario(
+        name="items_list_owner",
+        path=lambda data, n: "/items/?limit=100",
+        user="user",
+    ),
+    Scenario(
+        name="items_list_fields",
+        path=lambda data, n: "/items/?limit=100&fields=title",
+    ),
+    Scenario(
+        name="item_detail",
+        path=lambda data, n: f"/items/{_nth(data.item_ids, n)}",
+    ),
+    Scenario(
+        name="item_create",
+        method="POST",
+        path=lambda data, n: "/items/",
+        body=lambda data, n: {
+            "title": f"{data.run} created {n}",
+            "description": "bench",
+        },
+        user="user",
+    ),
+    Scenario(name="games_list", path=lambda data, n: "/games/?limit=100", user=None),
+    Scenario(
+        name="game_detail",
+        path=lambda data, n: f"/games/{_nth(data.game_ids, n)}",
+        user=None,
+    ),
+    Scenario(
+        name="redis_items_list",
+        path=lambda data, n: f"/redis_item/?name={data.run}-{n % 10}&limit=100",
+        user=None,
+        redisearch=True,
+    ),
+]
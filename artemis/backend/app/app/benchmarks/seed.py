@@ -0,0 +1,138 @@
+import secrets
+from typing import Dict, List
+
+from bson import ObjectId
+from pydantic import BaseModel
+from sqlalchemy import delete, insert
+from sqlmodel import select
+
+from app.benchmarks.backends import Backends
+from app.core.config import settings
+from app.core.security import create_access_token, get_password_hash
+from app.crud.redis.item import redis_item_crud
+from app.models.postgres.item import Item
+from app.models.postgres.user import User
+from app.models.redis.item import Item as RedisItem
+from app.schemas.redis.item import ItemCreate as RedisItemCreate
+
+
+class SeedCounts(BaseModel):
+    users: int = 10
+    items: int = 1000
+    games: int = 200
+    redis_items: int = 200
+
+
+class SeedData(BaseModel):
+    """
+    Ids of the synthetic records of a run, tagged with ``run`` so several runs
+    can share local backends.
+    """
+
+    run: str
+    user_ids: List[int] = []
+    item_ids: List[int] = []
+    game_ids: List[str] = []
+    redis_item_pks: List[str] = []
+
+    def headers(self, user_id: int) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {create_access_token(user_id)}"}
+
+    @property
+    def superuser_id(self) -> int:
+        return self.user_ids[0]
+
+    @property
+    def user_id(self) -> int:
+        return self.user_ids[-1]
+
+
+def game_document(run: str, n: int) -> Dict:
+    """
+    A daily games document shaped like the MySportsFeeds ones, with a dozen
+    games of box score sized payloads.
+    """
+    return {
+        "_id": ObjectId(),
+        "date": f"{run}-{n:06d}",
+        "games": {
+            str(game): {
+                "schedule": {"id": game, "venue": f"venue {game}"},
+                "score": {"home": game % 7, "away": game % 5, "innings": [0] * 9},
+            }
+            for game in range(12)
+        },
+        "_rev": 1,
+    }
+
+
+async def seed(backends: Backends, counts: SeedCounts) -> SeedData:
+    """
+    Insert ``counts`` synthetic users, items, games and Redis items.
+
+    The first user is a superuser, the others own the items in turn. Every user
+    shares one password hash, bcrypt would otherwise dominate the seeding.
+    """
+    data = SeedData(run=f"bench-{secrets.token_hex(4)}")
+    hashed_password = get_password_hash(secrets.token_urlsafe(16))
+    async with backends.sessions() as session:
+        for n in range(max(counts.users, 1)):
+            user = User(
+                email=f"{data.run}-{n}@example.com",
+                hashed_password=hashed_password,
+                full_name=f"Bench User {n}",
+                is_superuser=n == 0,
+            )
+            session.add(user)
+            await session.flush()
+            data.user_ids.append(user.id)  # type: ignore
+        owners = data.user_ids[1:] or data.user_ids
+        rows = [
+            {
+                "title": f"{data.run} item {n}",
+                "description": "bench",
+                "owner_id": owners[n % len(owners)],
+            }
+            for n in range(counts.items)
+        ]
+        for start in range(0, len(rows), settings.BULK_INSERT_CHUNK_SIZE):
+            end = start + settings.BULK_INSERT_CHUNK_SIZE
+            chunk = rows[start:end]
+            await session.execute(insert(Item.__table__), chunk)  # type: ignore
+        q = await session.exec(
+            select(Item.id).where(Item.owner_id.in_(data.user_ids))  # type: ignore
+        )
+        data.item_ids = list(q.all())
+        await session.commit()
+
+    documents = [game_document(data.run, n) for n in range(counts.games)]
+    if documents:
+        await backends.mongo.MySportsFeeds.games.insert_many(documents)
+    data.game_ids = [str(document["_id"]) for document in documents]
+
+    results = await redis_item_crud.create_many(
+        objs_in=[
+            RedisItemCreate(name=f"{data.run}-{n % 10}")
+            for n in range(counts.redis_items)
+        ]
+    )
+    data.redis_item_pks = [r.pk for r in results if isinstance(r, RedisItem)]
+    return data
+
+
+async def clear(backends: Backends, data: SeedData) -> None:
+    """
+    Delete the records of :func:`seed`, and the items the run created.
+    """
+    async with backends.sessions() as session:
+        await session.execute(
+            delete(Item).where(Item.owner_id.in_(data.user_ids))  # type: ignore
+        )
+        await session.execute(
+            delete(User).where(User.id.in_(data.user_ids))  # type: ignore
+        )
+        await session.commit()
+    await backends.mongo.MySportsFeeds.games.delete_many(
+        {"_id": {"$in": [ObjectId(id) for id in data.game_ids]}}
+    )
+    await redis_item_crud.remove_many(pks=data.redis_item_pks)
@@ -0,0 +1,397 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from aioredis import Redis
+from aioredis.exceptions import RedisError
+from redis import Redis as SyncRedis
+from redis.exceptions import RedisError as SyncRedisError
+
+from app.core.config import settings
+from app.core.metrics import (
+    RESPONSE_CACHE_COALESCED,
+    RESPONSE_CACHE_IN_FLIGHT,
+    RESPONSE_CACHE_LOOKUPS,
+)
+from app.db.redis.session import redis_conn
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class TTLCache(Generic[T]):
+    """
+    Bounded in-process LRU cache whose entries expire ``ttl`` seconds after they
+    were set.
+
+    It is not shared between worker processes, keep ``ttl`` short for data that
+    other workers may change.
+    """
+
+    def __init__(self, *, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, T]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[T]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: T, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def prune(self, predicate: Callable[[T], bool]) -> int:
+        """
+        Drop the entries whose value matches ``predicate``, returns how many.
+        """
+        keys = [key for key, (_, value) in self._entries.items() if predicate(value)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one.
+
+    The first caller of a key runs the call, callers arriving while it is in
+    flight wait for its result, or its exception, instead of running their own.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self, key: Hashable, call: Callable[[], Awaitable[T]]
+    ) -> Tuple[T, bool]:
+        """
+        Run ``call`` once for all concurrent callers of ``key``.
+
+        Returns:
+            Tuple[T, bool]: the result and whether it was shared by another
+                caller's call
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            # Shielded so a waiter being cancelled does not cancel the call
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The caller running the call was cancelled, run it ourselves
+                return await self.do(key, call)
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Marks the exception retrieved when nobody waited for it
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._calls[key]
+
+
+class ResponseCache:
+    """
+    Two tier cache of serialized responses with tag based invalidation.
+
+    Entries are looked up in a bounded in-process LRU first, then in Redis, and
+    concurrent misses of a key in a worker share a single computation.
+
+    Every tag has a version counter in Redis. An entry records the versions of
+    its tags when its response was computed, and :meth:`invalidate` bumps the
+    versions, so entries of an invalidated tag stop matching right away and
+    expire on their own. The entry and its tags' versions are read in a single
+    round trip.
+
+    In-process entries are dropped by the invalidations every worker publishes
+    on :attr:`channel`, see :meth:`listen`. They live at most
+    ``RESPONSE_CACHE_LOCAL_TTL_SECONDS`` in case a message is missed.
+
+    Lookups are counted in :meth:`stats` for this worker, and in the
+    ``response_cache_*`` Prometheus metrics for all of them.
+    """
+
+    key_prefix = "response-cache:"
+    tag_prefix = "cache-tag:"
+    channel = "response-cache:invalidations"
+
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+        self.local: TTLCache[Tuple[Dict[str, Any], frozenset]] = TTLCache(
+            maxsize=settings.RESPONSE_CACHE_LOCAL_MAX_SIZE,
+            ttl=settings.RESPONSE_CACHE_LOCAL_TTL_SECONDS,
+        )
+        self.flights = SingleFlight()
+        # Bumped by every invalidation this worker hears of, responses computed
+        # across one are not kept in-process
+        self._invalidations = 0
+        self._listener: Optional["asyncio.Task[None]"] = None
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def tag_key(self, tag: str) -> str:
+        return f"{self.tag_prefix}{tag}"
+
+    async def fetch(
+        self,
+        key: str,
+        tags: Sequence[str],
+        *,
+        ttl: int,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Tuple[Any, bool]:
+        """
+        Get the entry for ``key`` from either tier, or compute and cache it.
+
+        Args:
+            key (str): cache key
+            tags (Sequence[str]): tags the entry is invalidated by
+            ttl (int): seconds the entry stays in Redis
+            compute (Callable[[], Awaitable[Any]]): returns the entry, a JSON
+                serializable dict, on a miss. Anything else it returns is
+                handed back uncached and is not shared with coalesced callers,
+                which compute their own.
+
+        Returns:
+            Tuple[Any, bool]: the entry, or what ``compute`` returned, and
+                whether it came from the cache
+        """
+        hit = self.local.get(key)
+        if hit is not None:
+            self.local_hits += 1
+            RESPONSE_CACHE_LOOKUPS.labels("local").inc()
+            return hit[0], True
+        invalidations = self._invalidations
+        entry, versions = await self.lookup(key, tags)
+        if entry is not None:
+            self.redis_hits += 1
+            RESPONSE_CACHE_LOOKUPS.labels("redis").inc()
+            self._store_local(key, entry, tags, ttl, invalidations)
+            return entry, True
+
+        self.misses += 1
+        RESPONSE_CACHE_LOOKUPS.labels("miss").inc()
+
+        async def compute_and_store() -> Any:
+            with RESPONSE_CACHE_IN_FLIGHT.track_inprogress():
+                value = await compute()
+            if isinstance(value, dict):
+                await self.store(key, value, ttl=ttl, versions=versions)
+                self._store_local(key, value, tags, ttl, invalidations)
+            return value
+
+        value, shared = await self.flights.do(key, compute_and_store)
+        if shared:
+            self.coalesced += 1
+            RESPONSE_CACHE_COALESCED.inc()
+            if not isinstance(value, dict):
+                return await compute(), False
+        return value, False
+
+    def _store_local(
+        self,
+        key: str,
+        entry: Dict[str, Any],
+        tags: Sequence[str],
+        ttl: int,
+        invalidations: int,
+    ) -> None:
+        if invalidations != self._invalidations:
+            return
+        self.local.set(key, (entry, frozenset(tags)), ttl=min(ttl, self.local.ttl))
+
+    async def lookup(
+        self, key: str, tags: Sequence[str]
+    ) -> Tuple[Optional[Dict[str, Any]], List[Optional[str]]]:
+        """
+        Fetch the entry for ``key`` from Redis if it is still valid for ``tags``.
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], List[Optional[str]]]: the entry, or
+                ``None`` on a miss, and the current tag versions to pass to
+                :meth:`store` with the response computed after the miss
+        """
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.get(f"{self.key_prefix}{key}")
+                if tags:
+                    pipe.mget([self.tag_key(tag) for tag in tags])
+                raw, *rest = await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"response cache lookup failed: {e}")
+            return None, []
+        versions = rest[0] if rest else []
+        if raw is None:
+            return None, versions
+        entry = json.loads(raw)
+        if entry.pop("versions") != versions:
+            return None, versions
+        return entry, versions
+
+    async def store(
+        self,
+        key: str,
+        entry: Dict[str, Any],
+        *,
+        ttl: int,
+        versions: List[Optional[str]],
+    ) -> None:
+        try:
+            await self.redis.set(
+                f"{self.key_prefix}{key}",
+                json.dumps(dict(entry, versions=versions)),
+                ex=ttl,
+            )
+        except RedisError as e:
+            logger.warning(f"response cache store failed: {e}")
+
+    async def invalidate(self, *tags: str) -> None:
+        """
+        Bump the versions of ``tags`` and tell every worker to drop its
+        in-process entries carrying them.
+        """
+        if not tags:
+            return
+        self.drop_local(tags)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for tag in tags:
+                    pipe.incr(self.tag_key(tag))
+                pipe.publish(self.channel, json.dumps(tags))
+                await pipe.execute()
+        except RedisError as e:
+            logger.error(f"response cache invalidation of {tags} failed: {e}")
+
+    def drop_local(self, tags: Sequence[str]) -> None:
+        self._invalidations += 1
+        tag_set = set(tags)
+        self.local.prune(lambda value: not tag_set.isdisjoint(value[1]))
+
+    async def listen(self) -> None:
+        """
+        Drop in-process entries on the invalidations published by any worker,
+        reconnecting until cancelled.
+
+        In-process entries are cleared on every (re)connection since messages
+        published while disconnected are lost.
+        """
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                self.local.clear()
+                self._invalidations += 1
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.drop_local(json.loads(message["data"]))
+            except RedisError as e:
+                logger.warning(f"response cache invalidation listener failed: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.close()
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self.listen())
+
+    async def stop(self) -> None:
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        redis_lookups = self.redis_hits + self.misses
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "local_hit_rate": self.local_hits / lookups if lookups else 0.0,
+            "redis_hit_rate": self.redis_hits / redis_lookups if redis_lookups else 0.0,
+            "local_size": len(self.local),
+            "in_flight": len(self.flights),
+        }
+
+
+response_cache = ResponseCache(redis_conn)
+
+
+async def invalidate_tags(*tags: str) -> None:
+    """
+    Drop every cached response tagged with one of ``tags``.
+    """
+    await response_cache.invalidate(*tags)
+
+
+def invalidate_tags_sync(redis: SyncRedis, *tags: str) -> None:
+    """
+    :func:`invalidate_tags` for code running outside the event loop, e.g. the
+    Celery worker, through a synchronous client of the same Redis.
+    """
+    if not tags:
+        return
+    try:
+        with redis.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(response_cache.tag_key(tag))
+            pipe.publish(response_cache.channel, json.dumps(tags))
+            pipe.execute()
+    except SyncRedisError as e:
+        logger.error(f"response cache invalidation of {tags} failed: {e}")
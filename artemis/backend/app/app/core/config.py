@@ -1,5 +1,6 @@
 import secrets
-from typing import Any, Dict, List, Optional, Union
+from datetime import date
+from typing import Any, Dict, List, Literal, Optional, Union
 
 from pydantic import AnyHttpUrl, BaseSettings, EmailStr, HttpUrl, PostgresDsn, validator
 
@@ -7,6 +8,11 @@ from pydantic import AnyHttpUrl, BaseSettings, EmailStr, HttpUrl, PostgresDsn, v
 class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = secrets.token_urlsafe(32)
+    # bcrypt runs in a pool of PASSWORD_HASH_WORKERS threads or processes, with
+    # at most PASSWORD_HASH_QUEUE_LIMIT calls pending before answering 503
+    PASSWORD_HASH_POOL: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64
     # 60 minutes * 24 hours * 8 days = 8 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
     SERVER_NAME: str
@@ -30,12 +36,33 @@ class Settings(BaseSettings):
             return None
         return v
 
+    # Postgres connections kept open (MIN) and the most opened under load (MAX)
     MAX_CONNECTION_COUNT: int = 10
     MIN_CONNECTION_COUNT: int = 10
+
+    @validator("MIN_CONNECTION_COUNT")
+    def min_connections_within_max(cls, v: int, values: Dict[str, Any]) -> int:
+        max_connections = values.get("MAX_CONNECTION_COUNT")
+        if max_connections is not None and v > max_connections:
+            raise ValueError("MIN_CONNECTION_COUNT must be <= MAX_CONNECTION_COUNT")
+        return v
+
+    BULK_INSERT_CHUNK_SIZE: int = 1000
+    # Rows read per keyset query when streaming list endpoints
+    STREAM_BATCH_SIZE: int = 500
     POSTGRES_SERVER: str
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
+    # Pre-ping costs a round trip per checkout; recycling stale connections
+    # after POSTGRES_POOL_RECYCLE seconds (-1 never) is usually enough
+    POSTGRES_POOL_PRE_PING: bool = False
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_TIMEOUT: float = 30.0
+    POSTGRES_STATEMENT_CACHE_SIZE: int = 100
+    # Disables prepared statement caching for pgbouncer transaction pooling
+    POSTGRES_PGBOUNCER: bool = False
+    SQLALCHEMY_ECHO: bool = False
     SQLALCHEMY_DATABASE_URI: Optional[PostgresDsn] = None
 
     @validator("SQLALCHEMY_DATABASE_URI", pre=True)
@@ -62,6 +89,9 @@ class Settings(BaseSettings):
             return v
         return values["MONGO_DATBASE_URI"]
 
+    # Documents fetched per getMore when streaming Mongo cursors
+    MONGO_BATCH_SIZE: int = 100
+
     SMTP_TLS: bool = True
     SMTP_PORT: Optional[int] = None
     SMTP_HOST: Optional[str] = None
@@ -95,6 +125,57 @@ class Settings(BaseSettings):
 
     REDIS_HOST: str
     REDIS_PORT: int
+    # Commands sent per pipeline round trip by the bulk Redis endpoints
+    REDIS_BATCH_SIZE: int = 500
+    # GET endpoints decorated with app.api.cache.cache_response cache in-process,
+    # then in Redis
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_LOCAL_MAX_SIZE: int = 1024
+    RESPONSE_CACHE_LOCAL_TTL_SECONDS: float = 5.0
+
+    # Request timings middleware and the /metrics endpoint, backend calls are
+    # always timed
+    METRICS_ENABLED: bool = True
+    # Send the Postgres/Mongo/Redis round trips of each request in an
+    # X-Query-Count header, for development
+    QUERY_COUNT_HEADER_ENABLED: bool = False
+
+    # A watchdog thread measures event loop lag every
+    # LOOP_MONITOR_INTERVAL_SECONDS and logs the stack of stalls longer than
+    # LOOP_MONITOR_SLOW_SECONDS
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.25
+    LOOP_MONITOR_SLOW_SECONDS: float = 0.1
+    # The sampling profiler started from /utils/profiler/ stops on its own after
+    # PROFILER_MAX_SECONDS
+    PROFILER_INTERVAL_SECONDS: float = 0.01
+    PROFILER_MAX_SECONDS: float = 300.0
+    # Frames kept per allocation and snapshots kept by the /utils/memory/ tools
+    TRACEMALLOC_FRAMES: int = 10
+    MEMORY_MAX_SNAPSHOTS: int = 10
+
+    # Authenticated users are cached in-process, then in Redis
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_MAX_SIZE: int = 1024
+    USER_CACHE_LOCAL_TTL_SECONDS: float = 5.0
+    USER_CACHE_TTL_SECONDS: int = 60
+
+    # MySportsFeeds ingestion, point MSF_BASE_URL at a fake feed server offline
+    MSF_BASE_URL: str = "https://api.mysportsfeeds.com/v2.1/pull/mlb"
+    MSF_API_KEY: Optional[str] = None
+    MSF_CONCURRENCY: int = 4
+    MSF_REQUESTS_PER_SECOND: float = 2.0
+    MSF_REQUEST_TIMEOUT: float = 30.0
+    MSF_MAX_RETRIES: int = 3
+    MSF_BULK_WRITE_BATCH_SIZE: int = 100
+    # Celery beat syncs each feed every MSF_SYNC_INTERVAL_SECONDS from its
+    # checkpoint, re-reading MSF_SYNC_LOOKBACK_DAYS days for late corrections
+    MSF_SEASON: str = "current"
+    MSF_SYNC_FEEDS: List[str] = ["games", "gamelogs", "lines", "futures", "dfs"]
+    MSF_SYNC_INTERVAL_SECONDS: float = 900.0
+    MSF_SYNC_LOOKBACK_DAYS: int = 2
+    MSF_SYNC_START_DATE: Optional[date] = None
+    MSF_SYNC_LOCK_TIMEOUT: int = 3600
 
     class Config:
         case_sensitive = True
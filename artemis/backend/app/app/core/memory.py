@@ -0,0 +1,200 @@
+import random
+import threading
+import tracemalloc
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import route_template
+
+# Allocations of tracemalloc itself and of imports are noise when hunting leaks
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+class MemoryTracingError(Exception):
+    """
+    Raised when snapshots are requested while tracemalloc is not tracing.
+    """
+
+
+class MemoryTracker:
+    """
+    Named tracemalloc snapshots and per-route allocation peaks of this worker.
+
+    tracemalloc slows allocations down noticeably while it traces, so it only
+    runs between :meth:`start` and :meth:`stop`. The last
+    ``MEMORY_MAX_SNAPSHOTS`` snapshots are kept.
+
+    With a ``sample_rate``, that fraction of requests records the peak of the
+    memory traced while they ran, by method and route template. tracemalloc has a single
+    peak per process, so one request is sampled at a time, and allocations of
+    the requests running concurrently are attributed to it as well, which
+    averages out over many samples under load. Without ``tracemalloc.reset_peak``
+    (Python < 3.9) the growth of the traced memory is recorded instead.
+    """
+
+    def __init__(self) -> None:
+        self.frames = settings.TRACEMALLOC_FRAMES
+        self.sample_rate = 0.0
+        self.snapshots: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.routes: Dict[str, Dict[str, Any]] = {}
+        self.sampling_lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: Optional[int] = None, sample_rate: float = 0.0) -> None:
+        self.frames = frames or settings.TRACEMALLOC_FRAMES
+        self.sample_rate = sample_rate
+        self.routes.clear()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        tracemalloc.start(self.frames)
+
+    def stop(self) -> None:
+        self.sample_rate = 0.0
+        self.snapshots.clear()
+        tracemalloc.stop()
+
+    def take_snapshot(self, name: str) -> Dict[str, Any]:
+        """
+        Take a snapshot named ``name``, replacing one with the same name.
+
+        Raises:
+            MemoryTracingError: tracemalloc is not tracing
+        """
+        snapshot = self._snapshot()
+        self.snapshots.pop(name, None)
+        self.snapshots[name] = {
+            "name": name,
+            "taken_at": datetime.utcnow(),
+            "size": sum(trace.size for trace in snapshot.traces),
+            "snapshot": snapshot,
+        }
+        while len(self.snapshots) > settings.MEMORY_MAX_SNAPSHOTS:
+            self.snapshots.popitem(last=False)
+        return self.snapshots[name]
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        if not tracemalloc.is_tracing():
+            raise MemoryTracingError("Start tracing before taking snapshots")
+        return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+    def diff(
+        self,
+        base: str,
+        target: Optional[str] = None,
+        *,
+        group_by: str = "lineno",
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """
+        The ``limit`` files or lines whose allocations grew the most from the
+        ``base`` snapshot to ``target``, or to now when ``target`` is ``None``.
+
+        Args:
+            base (str): name of the first snapshot
+            target (Optional[str]): name of the second snapshot
+            group_by (str): ``filename`` or ``lineno``
+            limit (int): number of statistics to return
+
+        Raises:
+            KeyError: no snapshot with that name
+            MemoryTracingError: ``target`` is ``None`` and tracemalloc is not
+                tracing
+        """
+        old = self.snapshots[base]["snapshot"]
+        if target is None:
+            new = self._snapshot()
+        else:
+            new = self.snapshots[target]["snapshot"]
+        stats = new.compare_to(old, group_by)[:limit]
+        return [
+            {
+                "filename": stat.traceback[0].filename,
+                "lineno": stat.traceback[0].lineno if group_by == "lineno" else None,
+                "size": stat.size,
+                "size_diff": stat.size_diff,
+                "count": stat.count,
+                "count_diff": stat.count_diff,
+            }
+            for stat in stats
+        ]
+
+    def record_peak(self, route: str, peak: int) -> None:
+        stats = self.routes.setdefault(
+            route, {"route": route, "samples": 0, "max_peak": 0, "total_peak": 0}
+        )
+        stats["samples"] += 1
+        stats["max_peak"] = max(stats["max_peak"], peak)
+        stats["total_peak"] += peak
+
+    def route_stats(self) -> List[Dict[str, Any]]:
+        return sorted(
+            (
+                {**stats, "avg_peak": stats["total_peak"] / stats["samples"]}
+                for stats in self.routes.values()
+            ),
+            key=lambda stats: stats["max_peak"],
+            reverse=True,
+        )
+
+    def status(self) -> Dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": self.tracing,
+            "frames": self.frames,
+            "sample_rate": self.sample_rate,
+            "traced_current": current,
+            "traced_peak": peak,
+            "snapshots": list(self.snapshots),
+        }
+
+
+memory_tracker = MemoryTracker()
+
+
+class MemorySamplingMiddleware:
+    """
+    Record the allocation peak of the ``memory_tracker.sample_rate`` fraction
+    of requests, see :class:`MemoryTracker`. Requests pass straight through
+    while sampling is off.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        tracker = memory_tracker
+        if (
+            scope["type"] != "http"
+            or not tracker.sample_rate
+            or random.random() >= tracker.sample_rate
+            or not tracker.sampling_lock.acquire(blocking=False)
+        ):
+            await self.app(scope, receive, send)
+            return
+        try:
+            reset_peak = getattr(tracemalloc, "reset_peak", None)
+            if reset_peak is not None:
+                reset_peak()
+            start, _ = tracemalloc.get_traced_memory()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                current, peak = tracemalloc.get_traced_memory()
+                if tracemalloc.is_tracing():
+                    used = peak if reset_peak is not None else current
+                    route = f"{scope['method']} {route_template(scope)}"
+                    tracker.record_peak(route, max(0, used - start))
+        finally:
+            tracker.sampling_lock.release()
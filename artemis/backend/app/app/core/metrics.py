@@ -0,0 +1,270 @@
+import os
+import time
+from typing import Any, Dict, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+from pymongo import monitoring
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.query_counter import record_query
+
+# Route label of requests no route matched, so unknown paths cannot blow up the
+# number of series
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Backend calls are mostly sub-millisecond to tens of milliseconds, finer than
+# the default buckets
+BACKEND_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to answer HTTP requests, by route template",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being answered",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+POSTGRES_QUERY_DURATION = Histogram(
+    "postgres_query_duration_seconds",
+    "Time to execute Postgres statements, by statement type",
+    ["operation"],
+    buckets=BACKEND_BUCKETS,
+)
+MONGO_COMMAND_DURATION = Histogram(
+    "mongo_command_duration_seconds",
+    "Time to run Mongo commands, by command and outcome",
+    ["command", "outcome"],
+    buckets=BACKEND_BUCKETS,
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Time to run Redis commands, pipelines as PIPELINE",
+    ["command"],
+    buckets=BACKEND_BUCKETS,
+)
+RESPONSE_CACHE_LOOKUPS = Counter(
+    "response_cache_lookups",
+    "Response cache lookups, by the tier that answered: local, redis or miss",
+    ["result"],
+)
+RESPONSE_CACHE_COALESCED = Counter(
+    "response_cache_coalesced",
+    "Response cache misses that waited for a concurrent computation of their key",
+)
+RESPONSE_CACHE_IN_FLIGHT = Gauge(
+    "response_cache_in_flight",
+    "Responses being computed after a response cache miss",
+    multiprocess_mode="livesum",
+)
+
+
+class PrometheusMiddleware:
+    """
+    Time every HTTP request and count the ones in progress.
+
+    Requests are labelled with the template of the route that answered them,
+    e.g. ``/api/v1/items/{id}``, which FastAPI leaves in the scope once routed.
+    This is a plain ASGI middleware, it adds two clock reads and a few dict
+    lookups to each request and nothing to the response body.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._durations: Dict[Tuple[str, str, str], Any] = {}
+        self._in_progress: Dict[str, Any] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        in_progress = self._in_progress.get(method)
+        if in_progress is None:
+            in_progress = self._in_progress[method] = REQUESTS_IN_PROGRESS.labels(
+                method
+            )
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            in_progress.dec()
+            key = (method, route_template(scope), str(status))
+            histogram = self._durations.get(key)
+            if histogram is None:
+                histogram = self._durations[key] = REQUEST_DURATION.labels(*key)
+            histogram.observe(duration)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Path template of the route that matched the request.
+
+    Routes that are not API routes, e.g. the docs, have no template and no path
+    parameters, their path is used as is.
+    """
+    route = scope.get("route")
+    if route is not None:
+        return route.path_format
+    if "endpoint" in scope:
+        return scope["path"]
+    return UNMATCHED_ROUTE
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Time the statements of ``engine``, and of the engines derived from it with
+    ``execution_options``, by their first keyword, e.g. ``SELECT``, and count
+    them in :func:`app.core.query_counter.count_queries` blocks.
+
+    Pass ``AsyncEngine.sync_engine`` for async engines.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _observe(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        _observe_statement(statement, context)
+
+    @event.listens_for(engine, "handle_error")
+    def _observe_error(exception_context: Any) -> None:
+        context = exception_context.execution_context
+        if context is not None and exception_context.statement is not None:
+            _observe_statement(exception_context.statement, context)
+
+
+def _observe_statement(statement: str, context: Any) -> None:
+    start = getattr(context, "_query_start", None)
+    if start is None:
+        return
+    del context._query_start
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+    POSTGRES_QUERY_DURATION.labels(operation).observe(time.perf_counter() - start)
+    record_query("postgres", statement)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    Time and count Mongo commands from pymongo's command monitoring events,
+    pass it to the client in ``event_listeners``.
+    """
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        MONGO_COMMAND_DURATION.labels(event.command_name, "success").observe(
+            event.duration_micros / 1e6
+        )
+        record_query("mongo", event.command_name)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        MONGO_COMMAND_DURATION.labels(event.command_name, "failure").observe(
+            event.duration_micros / 1e6
+        )
+        record_query("mongo", event.command_name)
+
+
+def instrument_redis(client: Any) -> None:
+    """
+    Time and count the commands and pipelines sent by an ``aioredis.Redis``
+    client, including the ones of the redis-om models using it.
+    """
+    execute_command = client.execute_command
+    pipeline = client.pipeline
+
+    async def timed_execute_command(*args: Any, **options: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return await execute_command(*args, **options)
+        finally:
+            command = str(args[0]).upper() if args else ""
+            REDIS_COMMAND_DURATION.labels(command).observe(time.perf_counter() - start)
+            record_query("redis", command)
+
+    def timed_pipeline(*args: Any, **kwargs: Any) -> Any:
+        pipe = pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        async def timed_execute(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await execute(*args, **kwargs)
+            finally:
+                REDIS_COMMAND_DURATION.labels("PIPELINE").observe(
+                    time.perf_counter() - start
+                )
+                record_query("redis", "PIPELINE")
+
+        pipe.execute = timed_execute
+        return pipe
+
+    client.execute_command = timed_execute_command
+    client.pipeline = timed_pipeline
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    The metrics in the Prometheus text format, and its content type.
+
+    When ``PROMETHEUS_MULTIPROC_DIR`` is set, e.g. under gunicorn, the metrics
+    of every worker process are read from there and aggregated.
+    """
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
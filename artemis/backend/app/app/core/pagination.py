@@ -0,0 +1,67 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, Optional, Sequence
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when a pagination cursor cannot be decoded.
+    """
+
+
+def encode_cursor(last_id: Any) -> str:
+    """
+    Encode the last ``id`` of a page into an opaque, URL safe cursor token.
+
+    Args:
+        last_id (Any): JSON serializable key of the last row that was returned
+
+    Returns:
+        str: cursor token to hand back to the client
+    """
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Any:
+    """
+    Decode a cursor token produced by :func:`encode_cursor`.
+
+    Args:
+        cursor (str): cursor token sent by the client
+
+    Returns:
+        Any: the last ``id`` seen by the client
+
+    Raises:
+        InvalidCursorError: the token is not a cursor we issued
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(cursor) from e
+
+
+def next_cursor(
+    rows: Sequence[Any], limit: int, key: Callable[[Any], Any]
+) -> Optional[str]:
+    """
+    Build the cursor for the page following ``rows``.
+
+    A full page means there may be more rows to fetch; a short page is the last one.
+
+    Args:
+        rows (Sequence[Any]): rows of the current page, ordered by their key
+        limit (int): page size that was requested
+        key (Callable[[Any], Any]): returns the JSON serializable key of a row
+
+    Returns:
+        Optional[str]: cursor for the next page or ``None`` if this was the last one
+    """
+    if not rows or len(rows) < limit:
+        return None
+    return encode_cursor(key(rows[-1]))
@@ -0,0 +1,268 @@
+import asyncio
+import inspect
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from types import FrameType
+from typing import Any, Counter, Deque, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sampling more often mostly measures the profiler itself
+MIN_INTERVAL_SECONDS = 0.001
+
+
+class ProfilerRunningError(Exception):
+    """
+    Raised when starting the profiler while it is already running.
+    """
+
+
+def frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+def frame_stack(frame: Optional[FrameType]) -> List[str]:
+    """
+    Labels of ``frame`` and its callers, outermost first.
+    """
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def innermost_coroutine(frame: Optional[FrameType]) -> Optional[str]:
+    """
+    Label of the innermost coroutine in the stack of ``frame``, the one that
+    made the blocking call when the event loop thread is stuck.
+    """
+    while frame is not None:
+        if frame.f_code.co_flags & inspect.CO_COROUTINE:
+            return frame_label(frame)
+        frame = frame.f_back
+    return None
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler sampling the stacks of every thread of the process.
+
+    A background thread reads ``sys._current_frames()`` every ``interval``
+    seconds, nothing is traced, so the profiled code runs at full speed and
+    the cost is one stack walk per thread per sample. Stacks are aggregated in
+    the collapsed format of ``flamegraph.pl`` and speedscope, one
+    ``thread;outer;...;inner count`` line per distinct stack.
+
+    The profiler only sees the worker process it runs in.
+    """
+
+    def __init__(self) -> None:
+        self.interval = settings.PROFILER_INTERVAL_SECONDS
+        self.samples = 0
+        self.started_at: Optional[datetime] = None
+        self._stacks: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(
+        self, interval: Optional[float] = None, duration: Optional[float] = None
+    ) -> None:
+        """
+        Drop the previous profile and start sampling, for at most ``duration``
+        seconds. ``interval`` is raised to ``MIN_INTERVAL_SECONDS`` and
+        ``duration`` capped at ``PROFILER_MAX_SECONDS``.
+
+        Raises:
+            ProfilerRunningError: the profiler is already running
+        """
+        if self.running:
+            raise ProfilerRunningError()
+        self.interval = max(
+            interval or settings.PROFILER_INTERVAL_SECONDS, MIN_INTERVAL_SECONDS
+        )
+        max_seconds = settings.PROFILER_MAX_SECONDS
+        if duration is None or duration <= 0 or duration > max_seconds:
+            duration = max_seconds
+        deadline = time.monotonic() + duration
+        with self._lock:
+            self._stacks.clear()
+            self.samples = 0
+        self.started_at = datetime.utcnow()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(deadline,), name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self, deadline: float) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval) and time.monotonic() < deadline:
+            self.sample(exclude=own)
+
+    def sample(self, exclude: Optional[int] = None) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        frames = sys._current_frames()
+        with self._lock:
+            for ident, frame in frames.items():
+                if ident == exclude:
+                    continue
+                stack = [names.get(ident, str(ident)), *frame_stack(frame)]
+                self._stacks[";".join(stack)] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        with self._lock:
+            stacks = sorted(self._stacks.items())
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "samples": self.samples,
+            "started_at": self.started_at,
+        }
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Nearest-rank ``q`` percentile, ``q`` in ``[0, 1]``, of sorted ``values``.
+    """
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class LoopMonitor:
+    """
+    Measure how late the event loop runs callbacks, from a watchdog thread.
+
+    Every ``interval`` seconds the thread schedules a callback on the loop and
+    times how long it takes to run, which is how long any request would have
+    waited at that moment. When the loop does not answer within
+    ``slow_threshold`` seconds the thread captures the stack of the loop thread
+    while it is still blocked, so the slow callback log names the coroutine
+    that made the blocking call, e.g. a synchronous bcrypt or SMTP call, and
+    not just the task it ran in as asyncio's debug mode would.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float,
+        slow_threshold: float,
+        history: int = 1000,
+        slow_history: int = 100,
+    ) -> None:
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.lags: Deque[float] = deque(maxlen=history)
+        self.slow_callbacks: Deque[Dict[str, Any]] = deque(maxlen=slow_history)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    async def start(self) -> None:
+        """
+        Start monitoring the running loop.
+        """
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="loop-monitor", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        await asyncio.get_running_loop().run_in_executor(None, self._thread.join)
+        self._thread = None
+
+    def _run(self) -> None:
+        assert self._loop is not None
+        while not self._stop.wait(self.interval):
+            answered = threading.Event()
+            start = time.perf_counter()
+            try:
+                self._loop.call_soon_threadsafe(answered.set)
+            except RuntimeError:
+                # The loop was closed
+                return
+            blocked = None
+            if not answered.wait(self.slow_threshold):
+                blocked = self._blocked_on()
+                while not answered.wait(self.interval):
+                    if self._stop.is_set():
+                        return
+            lag = time.perf_counter() - start
+            self.lags.append(lag)
+            if blocked is not None:
+                self._record_slow(lag, blocked)
+
+    def _blocked_on(self) -> Dict[str, Any]:
+        assert self._loop_thread is not None
+        frame = sys._current_frames().get(self._loop_thread)
+        task = asyncio.current_task(self._loop)
+        return {
+            "task": None if task is None else task.get_name(),
+            "coroutine": innermost_coroutine(frame),
+            "stack": frame_stack(frame),
+        }
+
+    def _record_slow(self, duration: float, blocked: Dict[str, Any]) -> None:
+        self.slow_callbacks.append(
+            {"at": datetime.utcnow(), "duration": duration, **blocked}
+        )
+        logger.warning(
+            f"Event loop blocked for {duration:.3f}s in "
+            f"{blocked['coroutine'] or blocked['task']}"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        lags = sorted(self.lags)
+        return {
+            "running": self.running,
+            "samples": len(lags),
+            "p50": percentile(lags, 0.5),
+            "p90": percentile(lags, 0.9),
+            "p99": percentile(lags, 0.99),
+            "max": lags[-1] if lags else 0.0,
+        }
+
+
+profiler = SamplingProfiler()
+loop_monitor = LoopMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL_SECONDS,
+    slow_threshold=settings.LOOP_MONITOR_SLOW_SECONDS,
+)
@@ -0,0 +1,101 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+BACKENDS = ("postgres", "mongo", "redis")
+
+
+class QueryCounts:
+    """
+    Round trips to each backend, and what they ran, within a
+    :func:`count_queries` block.
+    """
+
+    def __init__(self) -> None:
+        self.postgres = 0
+        self.mongo = 0
+        self.redis = 0
+        self.queries: List[Tuple[str, str]] = []
+
+    @property
+    def total(self) -> int:
+        return self.postgres + self.mongo + self.redis
+
+    def add(self, backend: str, query: str) -> None:
+        setattr(self, backend, getattr(self, backend) + 1)
+        self.queries.append((backend, query))
+
+    def merge(self, other: "QueryCounts") -> None:
+        for backend, query in other.queries:
+            self.add(backend, query)
+
+    def __str__(self) -> str:
+        return ", ".join(f"{backend}={getattr(self, backend)}" for backend in BACKENDS)
+
+
+_counts: ContextVar[Optional[QueryCounts]] = ContextVar("query_counts", default=None)
+
+
+def record_query(backend: str, query: str) -> None:
+    """
+    Count a round trip to ``backend`` in the current :func:`count_queries`
+    block, if any. Called by the backend hooks of :mod:`app.core.metrics`.
+    """
+    counts = _counts.get()
+    if counts is not None:
+        counts.add(backend, query)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounts]:
+    """
+    Count the Postgres statements, Mongo commands and Redis commands or
+    pipelines run by the current task, and the threads and tasks it starts,
+    within the block.
+
+    Blocks nest, the queries of an inner block are also counted by the outer
+    one, so a test counting around a request sees the queries the request's
+    own counter saw.
+    """
+    outer = _counts.get()
+    counts = QueryCounts()
+    token = _counts.set(counts)
+    try:
+        yield counts
+    finally:
+        _counts.reset(token)
+        if outer is not None:
+            outer.merge(counts)
+
+
+class QueryCountMiddleware:
+    """
+    Count the queries of each request and send them in the ``X-Query-Count``
+    header, e.g. ``postgres=2, mongo=0, redis=1``, to spot handlers that
+    multiply queries during development.
+
+    The header goes out with the response headers, so queries a streaming
+    response runs while sending its body are not in it.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with count_queries() as counts:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers[QUERY_COUNT_HEADER] = str(counts)
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
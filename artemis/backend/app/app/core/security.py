@@ -1,5 +1,7 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Optional, TypeVar, Union
 
 from jose import jwt
 from passlib.context import CryptContext
@@ -11,6 +13,14 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 ALGORITHM = "HS256"
 
+T = TypeVar("T")
+
+
+class PasswordHasherBusyError(Exception):
+    """
+    Raised when ``PASSWORD_HASH_QUEUE_LIMIT`` password hashes are already pending.
+    """
+
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
@@ -32,3 +42,56 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated pool so it does not block the event loop.
+
+    At most ``PASSWORD_HASH_QUEUE_LIMIT`` calls may be running or waiting for a
+    worker, further calls fail fast with :class:`PasswordHasherBusyError`.
+    """
+
+    def __init__(self) -> None:
+        self._executor: Optional[Executor] = None
+        self.pending = 0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if settings.PASSWORD_HASH_POOL == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    thread_name_prefix="password-hash",
+                )
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.pending >= settings.PASSWORD_HASH_QUEUE_LIMIT:
+            raise PasswordHasherBusyError()
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, fn, *args)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hasher.run(get_password_hash, password)
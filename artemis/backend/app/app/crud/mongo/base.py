@@ -1,9 +1,24 @@
 from bson import ObjectId
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from motor.motor_asyncio import AsyncIOMotorCollection
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from pymongo import ReturnDocument
+
+from app.core.cache import invalidate_tags
+from app.core.config import settings
 
 ModelType = TypeVar("ModelType", bound=BaseModel)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -11,6 +26,12 @@ UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Tag of the cached responses showing documents of this model, see
+    # :func:`app.api.cache.cache_response`; ``None`` when none are cached
+    cache_tag: Optional[str] = None
+    # Incremented by every write, documents written before it existed are at 0
+    revision_field = "_rev"
+
     def __init__(self, model: Type[ModelType]):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
@@ -22,45 +43,218 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self.model = model
 
-    async def get(self, coll: AsyncIOMotorCollection, id: str) -> Optional[Any]:
-        if (db_obj := await coll.find_one({"_id": ObjectId(id)})) is not None:
+    def cache_tags(self, id: Optional[str] = None) -> List[str]:
+        """
+        Tags of cached lists of this model, or of the cached document ``id``.
+        """
+        if self.cache_tag is None:
+            return []
+        return [self.cache_tag if id is None else f"{self.cache_tag}:{id}"]
+
+    async def invalidate_cache(self, *ids: str) -> None:
+        """
+        Drop cached lists of this model and the cached documents ``ids``, call
+        it once a write is acknowledged.
+        """
+        if self.cache_tag is not None:
+            await invalidate_tags(
+                self.cache_tag, *(f"{self.cache_tag}:{id}" for id in ids)
+            )
+
+    def revision(self, db_obj: Dict[str, Any]) -> int:
+        """
+        Revision of a document, served as its ETag.
+        """
+        return db_obj.get(self.revision_field, 0)
+
+    def _id_filter(
+        self, id: str, revisions: Optional[Sequence[int]] = None
+    ) -> Dict[str, Any]:
+        query: Dict[str, Any] = {"_id": ObjectId(id)}
+        if revisions is not None:
+            # ``$in`` with ``None`` also matches documents without a revision
+            matching = [*revisions, None] if 0 in revisions else list(revisions)
+            query[self.revision_field] = {"$in": matching}
+        return query
+
+    def projection(
+        self, fields: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, int]]:
+        """
+        Build a Mongo projection that only returns ``fields`` (plus ``_id`` and
+        the revision).
+
+        Args:
+            fields (Optional[Sequence[str]]): model fields to return, all if ``None``
+
+        Returns:
+            Optional[Dict[str, int]]: projection for ``find``
+
+        Raises:
+            ValueError: a field is not part of the model
+        """
+        if fields is None:
+            return None
+        known = {f.alias for f in self.model.__fields__.values()}  # type: ignore
+        unknown = [field for field in fields if field not in known]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return {**{field: 1 for field in fields}, self.revision_field: 1}
+
+    async def get(
+        self,
+        coll: AsyncIOMotorCollection,
+        id: str,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[Any]:
+        if (
+            db_obj := await coll.find_one(
+                {"_id": ObjectId(id)}, self.projection(fields)
+            )
+        ) is not None:
             return db_obj  # type: ignore
         return None
 
+    async def exists(self, coll: AsyncIOMotorCollection, *, id: str) -> bool:
+        return await coll.count_documents({"_id": ObjectId(id)}, limit=1) > 0
+
     async def get_multi(
-            self, coll: AsyncIOMotorCollection, *, skip: int = 0, limit: int = 100
+        self,
+        coll: AsyncIOMotorCollection,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        query: Optional[Dict[str, Any]] = None,
+        sort: str = "_id",
     ) -> List[Any]:
-        cursor = coll.find()
-        return await cursor.to_list(length=limit)
+        return [
+            db_obj
+            async for db_obj in self.stream_multi(
+                coll,
+                skip=skip,
+                limit=limit,
+                after_id=after_id,
+                fields=fields,
+                query=query,
+                sort=sort,
+                batch_size=min(limit, settings.MONGO_BATCH_SIZE) or None,
+            )
+        ]
+
+    async def stream_multi(
+        self,
+        coll: AsyncIOMotorCollection,
+        *,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        query: Optional[Dict[str, Any]] = None,
+        sort: str = "_id",
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Yield documents in ``sort`` order, fetching ``batch_size`` at a time.
+
+        Only one batch is held in memory, so callers can walk a whole
+        collection without loading it.
+
+        Args:
+            coll (AsyncIOMotorCollection): collection to read
+            skip (int): documents to skip after the cursor position
+            limit (Optional[int]): maximum documents to yield, all if ``None``
+            after_id (Optional[str]): only yield documents after this ``_id``,
+                only meaningful when sorting by ``_id``
+            fields (Optional[Sequence[str]]): fields to return, see
+                :meth:`projection`
+            query (Optional[Dict[str, Any]]): filter, sort by an indexed field
+                so the filter and the sort share the index
+            sort (str): field to sort by, ascending
+            batch_size (Optional[int]): documents per round trip, defaults to
+                ``MONGO_BATCH_SIZE``
+        """
+        query = dict(query or {})
+        if after_id is not None:
+            query["_id"] = {"$gt": ObjectId(after_id)}
+        # batch_size is a find() argument rather than a chained call, the
+        # mongomock-motor cursor of the benchmark stand-ins can't chain it
+        cursor = (
+            coll.find(
+                query,
+                self.projection(fields),
+                batch_size=batch_size or settings.MONGO_BATCH_SIZE,
+            )
+            .sort(sort, 1)
+            .skip(skip)
+        )
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        async for db_obj in cursor:
+            yield db_obj
 
     async def create(
         self, coll: AsyncIOMotorCollection, *, obj_in: CreateSchemaType
-    ) -> ModelType:
-        await coll.insert_one(jsonable_encoder(obj_in))
-        return obj_in
+    ) -> Any:
+        db_obj = jsonable_encoder(obj_in)
+        db_obj[self.revision_field] = 1
+        # insert_one adds the generated ``_id`` to the document
+        await coll.insert_one(db_obj)
+        await self.invalidate_cache()
+        return db_obj
 
     async def update(
         self,
         coll: AsyncIOMotorCollection,
         *,
-        db_obj: ModelType,
-        obj_in: UpdateSchemaType,
-    ) -> ModelType:
-        update_data = obj_in.dict(exclude_unset=True)
-        for field in list(db_obj.dict().keys()):
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        _id = db_obj.id
-        delattr(db_obj, "id")
-        await coll.update_one(
-            {"_id": _id},
-            {"$set": jsonable_encoder(db_obj)}
+        id: str,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        revisions: Optional[Sequence[int]] = None,
+    ) -> Optional[Any]:
+        """
+        ``$set`` the fields the client set and bump the revision, in one round
+        trip.
+
+        Only the changed fields go to the server and only the updated document
+        comes back, so the document is never read or rewritten in full.
+
+        Args:
+            coll (AsyncIOMotorCollection): collection holding the document
+            id (str): ``_id`` of the document
+            obj_in (Union[UpdateSchemaType, Dict[str, Any]]): fields to change,
+                unset fields of a schema are left alone
+            revisions (Optional[Sequence[int]]): revisions the document must be
+                at, from an ``If-Match`` header
+
+        Returns:
+            Optional[Any]: the updated document, ``None`` if there is none at
+                one of ``revisions``
+        """
+        if isinstance(obj_in, dict):
+            update_data = dict(obj_in)
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        update_data.pop("id", None)
+        update_data.pop("_id", None)
+        update_data.pop(self.revision_field, None)
+        query = self._id_filter(id, revisions)
+        if not update_data:
+            return await coll.find_one(query)
+        db_obj = await coll.find_one_and_update(
+            query,
+            {
+                "$set": jsonable_encoder(update_data),
+                "$inc": {self.revision_field: 1},
+            },
+            return_document=ReturnDocument.AFTER,
         )
-        setattr(db_obj, "id", _id)
+        if db_obj is not None:
+            await self.invalidate_cache(id)
         return db_obj
 
-    async def remove(self, coll: AsyncIOMotorCollection, *, id: int) -> ModelType:
-        q = await coll.find_one({"_id": id})
-        if q:
-            await coll.delete_one({"_id": id})
-        return q
+    async def remove(self, coll: AsyncIOMotorCollection, *, id: str) -> Optional[Any]:
+        db_obj = await coll.find_one_and_delete({"_id": ObjectId(id)})
+        if db_obj is not None:
+            await self.invalidate_cache(id)
+        return db_obj
@@ -1,5 +1,8 @@
+from datetime import date
+from typing import Any, Dict, Optional
+
 from app.crud.mongo.base import CRUDBase
-from app.models.mongo.mysportsfeeds import Games, CreateGames, UpdateGames
+from app.models.mongo.mysportsfeeds import DATE_FORMAT, CreateGames, Games, UpdateGames
 
 
 class CRUDMongoGame(CRUDBase[Games, CreateGames, UpdateGames]):
@@ -7,5 +10,22 @@ class CRUDMongoGame(CRUDBase[Games, CreateGames, UpdateGames]):
     Game CRUD class.
     """
 
+    cache_tag = "games"
+
+    def date_range(
+        self, date_from: Optional[date] = None, date_to: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """
+        Filter on the indexed ``date`` field, both bounds inclusive.
+
+        ``date`` is stored as ``YYYYMMDD`` so string order is date order.
+        """
+        bounds: Dict[str, str] = {}
+        if date_from is not None:
+            bounds["$gte"] = date_from.strftime(DATE_FORMAT)
+        if date_to is not None:
+            bounds["$lte"] = date_to.strftime(DATE_FORMAT)
+        return {"date": bounds} if bounds else {}
+
 
 mongo_game_crud = CRUDMongoGame(Games)
@@ -1,16 +1,50 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
 
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import Column, delete, update
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.sql.dml import Delete, Update
 from sqlmodel import SQLModel, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.cache import invalidate_tags
+from app.core.config import settings
+
 ModelType = TypeVar("ModelType", bound=SQLModel)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+def obj_in_data(obj_in: Union[BaseModel, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Column values of a schema or dict.
+
+    Unlike ``jsonable_encoder`` this does not walk the values or turn them into
+    JSON types, the driver binds Python values as they are.
+    """
+    return dict(obj_in) if isinstance(obj_in, dict) else obj_in.dict()
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Tag of the cached responses showing rows of this model, see
+    # :func:`app.api.cache.cache_response`; ``None`` when none are cached
+    cache_tag: Optional[str] = None
+
     def __init__(self, model: Type[ModelType]):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
@@ -22,24 +56,262 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self.model = model
 
-    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
-        q = await db.exec(select(self.model).where(self.model.id == id))  # type: ignore
+    @property
+    def version_column(self) -> Optional[Column]:
+        """
+        The model's ``version_id_col``, ``None`` for unversioned models.
+        """
+        return self.model.__mapper__.version_id_col  # type: ignore
+
+    def cache_tags(self, id: Any = None) -> List[str]:
+        """
+        Tags of cached lists of this model, or of the cached row ``id``.
+        """
+        if self.cache_tag is None:
+            return []
+        return [self.cache_tag if id is None else f"{self.cache_tag}:{id}"]
+
+    async def invalidate_cache(self, *ids: Any) -> None:
+        """
+        Drop cached lists of this model and the cached rows ``ids``, call it
+        once a write is committed.
+        """
+        if self.cache_tag is not None:
+            await invalidate_tags(
+                self.cache_tag, *(f"{self.cache_tag}:{id}" for id in ids)
+            )
+
+    def columns(self, fields: Optional[Sequence[str]] = None) -> Optional[List[Column]]:
+        """
+        Columns to select to only return ``fields`` (plus ``id``).
+
+        Args:
+            fields (Optional[Sequence[str]]): columns to return, all if ``None``
+
+        Returns:
+            Optional[List[Column]]: columns for ``select``
+
+        Raises:
+            ValueError: a field is not a column of the model
+        """
+        if fields is None:
+            return None
+        table_columns = self.model.__table__.columns  # type: ignore
+        unknown = [field for field in fields if field not in table_columns]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return [table_columns[name] for name in dict.fromkeys(["id", *fields])]
+
+    def select_fields(self, fields: Optional[Sequence[str]] = None) -> Any:
+        """
+        ``SELECT`` of whole rows, or of the ``fields`` columns only, which are
+        returned as named tuples instead of model instances.
+        """
+        columns = self.columns(fields)
+        if columns is None:
+            return select(self.model)
+        return select(*columns)
+
+    async def get(
+        self, db: AsyncSession, id: Any, fields: Optional[Sequence[str]] = None
+    ) -> Optional[ModelType]:
+        statement = self.select_fields(fields).where(
+            self.model.id == id  # type: ignore
+        )
+        q = await db.exec(statement)
         return q.first()
 
     async def get_multi(
-        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[Any] = None,
+        fields: Optional[Sequence[str]] = None,
     ) -> List[ModelType]:
-        q = await db.exec(select(self.model).offset(skip).limit(limit))  # type: ignore
+        """
+        Read a page of rows ordered by primary key.
+
+        When ``after_id`` is given the page is read with a keyset predicate
+        (``WHERE id > :after_id``) and ``skip`` is ignored, so the cost of a page
+        does not depend on how deep into the table it is. With ``fields`` only
+        those columns are read, see :meth:`select_fields`.
+        """
+        statement = self.select_fields(fields).order_by(self.model.id)  # type: ignore
+        if after_id is not None:
+            statement = statement.where(self.model.id > after_id)  # type: ignore
+        else:
+            statement = statement.offset(skip)
+        q = await db.exec(statement.limit(limit))  # type: ignore
         return q.all()
 
+    async def stream_multi(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        after_id: Optional[Any] = None,
+        fields: Optional[Sequence[str]] = None,
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[ModelType]:
+        """
+        Yield rows ordered by primary key, reading ``batch_size`` rows per query.
+
+        See :meth:`stream_pages`.
+        """
+        async for db_obj in self.stream_pages(
+            partial(self.get_multi, db, fields=fields),
+            skip=skip,
+            limit=limit,
+            after_id=after_id,
+            batch_size=batch_size,
+        ):
+            yield db_obj
+
+    async def stream_pages(
+        self,
+        get_page: Callable[..., Awaitable[List[ModelType]]],
+        *,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        after_id: Optional[Any] = None,
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[ModelType]:
+        """
+        Walk the pages of a keyset paginated read and yield their rows.
+
+        Each page after the first is read with ``after_id`` set to the last row
+        of the previous one, so only one page is held in memory and every query
+        costs the same. Works with autocommit sessions, unlike server side
+        cursors.
+
+        Args:
+            get_page (Callable[..., Awaitable[List[ModelType]]]): reads one page,
+                called with ``skip``, ``limit`` and ``after_id``
+            skip (int): rows to skip, ignored when ``after_id`` is given
+            limit (Optional[int]): maximum rows to yield, all if ``None``
+            after_id (Optional[Any]): only yield rows after this primary key
+            batch_size (Optional[int]): rows per query, defaults to
+                ``STREAM_BATCH_SIZE``
+        """
+        batch_size = batch_size or settings.STREAM_BATCH_SIZE
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            rows = await get_page(skip=skip, limit=size, after_id=after_id)
+            for db_obj in rows:
+                yield db_obj
+            if len(rows) < size:
+                return
+            if remaining is not None:
+                remaining -= len(rows)
+            after_id = rows[-1].id  # type: ignore
+
     async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
-        obj_in_data = jsonable_encoder(obj_in)
-        db_obj = self.model(**obj_in_data)  # type: ignore
+        db_obj = self.model(**obj_in_data(obj_in))  # type: ignore
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await self.invalidate_cache()
         return db_obj
 
+    async def create_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        chunk_size: Optional[int] = None,
+    ) -> List[ModelType]:
+        """
+        Insert many rows in one transaction.
+
+        Rows are sent as multi-row ``INSERT ... RETURNING`` statements of at most
+        ``chunk_size`` rows (``settings.BULK_INSERT_CHUNK_SIZE`` by default).
+        """
+        rows = [obj_in_data(obj_in) for obj_in in objs_in]
+        return await self._insert_many(db, rows=rows, chunk_size=chunk_size)
+
+    async def upsert_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        index_elements: Optional[Sequence[str]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> List[ModelType]:
+        """
+        Insert many rows in one transaction, updating the rows that already exist.
+
+        A row conflicts with an existing one on ``index_elements`` (the primary key
+        by default), which must be covered by a unique index. Conflicting rows get
+        every other column of the incoming row, so all rows must set the same
+        columns.
+
+        Returns the inserted and updated rows. When the rows set no column besides
+        ``index_elements`` there is nothing to update, conflicting rows are left
+        as they are and are not returned.
+
+        Raises:
+            ValueError: the rows do not all set the same columns
+        """
+        rows = [obj_in_data(obj_in) for obj_in in objs_in]
+        columns = set(rows[0]) if rows else set()
+        if any(set(row) != columns for row in rows):
+            raise ValueError("All rows must set the same columns")
+        if index_elements is None:
+            index_elements = [
+                column.name
+                for column in self.model.__table__.primary_key.columns  # type: ignore
+            ]
+
+        version = self.version_column
+        update_columns = [
+            name
+            for name in sorted(columns)
+            if name not in index_elements and (version is None or name != version.key)
+        ]
+
+        def on_conflict(statement: Insert) -> Insert:
+            if not update_columns:
+                return statement.on_conflict_do_nothing(index_elements=index_elements)
+            set_ = {name: statement.excluded[name] for name in update_columns}
+            if version is not None:
+                set_[version.key] = version + 1
+            return statement.on_conflict_do_update(
+                index_elements=index_elements, set_=set_
+            )
+
+        return await self._insert_many(
+            db, rows=rows, chunk_size=chunk_size, on_conflict=on_conflict
+        )
+
+    async def _insert_many(
+        self,
+        db: AsyncSession,
+        *,
+        rows: List[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+        on_conflict: Optional[Callable[[Insert], Insert]] = None,
+    ) -> List[ModelType]:
+        chunk_size = chunk_size or settings.BULK_INSERT_CHUNK_SIZE
+        db_objs: List[ModelType] = []
+        for start in range(0, len(rows), chunk_size):
+            end = start + chunk_size
+            statement = insert(self.model).values(rows[start:end])
+            if on_conflict is not None:
+                statement = on_conflict(statement)
+            q = await db.execute(
+                select(self.model)
+                .from_statement(statement.returning(self.model))  # type: ignore
+                .execution_options(populate_existing=True)
+            )
+            db_objs.extend(q.scalars().all())
+        await db.commit()
+        await self.invalidate_cache(*(db_obj.id for db_obj in db_objs))  # type: ignore
+        return db_objs
+
     async def update(
         self,
         db: AsyncSession,
@@ -47,22 +319,93 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]],
     ) -> ModelType:
-        obj_data = jsonable_encoder(db_obj)
+        updated = await self.update_by_id(
+            db, id=db_obj.id, obj_in=obj_in  # type: ignore
+        )
+        if updated is None:
+            raise NoResultFound("No row was found when one was required")
+        return updated
+
+    async def update_by_id(
+        self,
+        db: AsyncSession,
+        *,
+        id: Any,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        where: Sequence[Any] = (),
+        versions: Optional[Sequence[int]] = None,
+    ) -> Optional[ModelType]:
+        """
+        Update a row with a single ``UPDATE ... WHERE ... RETURNING`` statement.
+
+        Extra ``where`` criteria (e.g. ownership) are part of the statement, so
+        ``None`` means that no row with ``id`` matched all of them. The version
+        column of a versioned model is bumped, and when ``versions`` is given
+        the row must be at one of them, for ``If-Match`` requests.
+        """
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
+        columns = self.model.__table__.columns.keys()  # type: ignore
+        version = self.version_column
+        values = {
+            field: value
+            for field, value in update_data.items()
+            if field in columns and (version is None or field != version.key)
+        }
+        criteria = [self.model.id == id, *where]  # type: ignore
+        if versions is not None and version is not None:
+            criteria.append(version.in_(versions))
+        if not values:
+            q = await db.exec(select(self.model).where(*criteria))  # type: ignore
+            return q.first()
+        if version is not None:
+            values[version.key] = version + 1
+        statement = update(self.model).where(*criteria).values(**values)
+        obj = await self._execute_returning(db, statement)
+        if obj is not None:
+            await self.invalidate_cache(id)
+        return obj
 
     async def remove(self, db: AsyncSession, *, id: int) -> ModelType:
-        q = await db.exec(select(self.model).where(self.model.id == id))  # type: ignore
-        obj = q.one()
-        await db.delete(obj)
+        obj = await self.remove_by_id(db, id=id)
+        if obj is None:
+            raise NoResultFound("No row was found when one was required")
+        return obj
+
+    async def remove_by_id(
+        self, db: AsyncSession, *, id: Any, where: Sequence[Any] = ()
+    ) -> Optional[ModelType]:
+        """
+        Delete a row with a single ``DELETE ... WHERE ... RETURNING`` statement.
+
+        Returns the deleted row, or ``None`` when no row with ``id`` matched the
+        extra ``where`` criteria.
+        """
+        statement = delete(self.model).where(
+            self.model.id == id, *where  # type: ignore
+        )
+        obj = await self._execute_returning(db, statement)
+        if obj is not None:
+            db.expunge(obj)
+            await self.invalidate_cache(id)
+        return obj
+
+    async def exists(self, db: AsyncSession, *, id: Any) -> bool:
+        q = await db.exec(
+            select(self.model.id).where(self.model.id == id)  # type: ignore
+        )
+        return q.first() is not None
+
+    async def _execute_returning(
+        self, db: AsyncSession, statement: Union[Update, Delete]
+    ) -> Optional[ModelType]:
+        q = await db.execute(
+            select(self.model)
+            .from_statement(statement.returning(self.model))  # type: ignore
+            .execution_options(populate_existing=True)
+        )
+        obj = q.scalars().first()
         await db.commit()
-        return obj  # type: ignore
+        return obj
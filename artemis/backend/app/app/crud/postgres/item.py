@@ -1,35 +1,105 @@
-from typing import List
+from functools import partial
+from typing import Any, AsyncIterator, List, Optional, Sequence
 
-from fastapi.encoders import jsonable_encoder
-from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import schemas
-from app.crud.postgres.base import CRUDBase
+from app.crud.postgres.base import CRUDBase, obj_in_data
 from app.models.postgres.item import Item
 
 
 class CRUDItem(CRUDBase[Item, schemas.ItemCreate, schemas.ItemUpdate]):
+    cache_tag = "items"
+
     async def create_with_owner(
         self, db: AsyncSession, *, obj_in: schemas.ItemCreate, owner_id: int
     ) -> Item:
-        obj_in_data = jsonable_encoder(obj_in)
-        db_obj = self.model(**obj_in_data, owner_id=owner_id)  # type: ignore
+        db_obj = self.model(**obj_in_data(obj_in), owner_id=owner_id)  # type: ignore
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await self.invalidate_cache()
         return db_obj
 
+    async def create_many_with_owner(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[schemas.ItemCreate],
+        owner_id: int,
+        chunk_size: Optional[int] = None,
+    ) -> List[Item]:
+        rows = [dict(obj_in_data(obj_in), owner_id=owner_id) for obj_in in objs_in]
+        return await self.create_many(db, objs_in=rows, chunk_size=chunk_size)
+
+    async def update_with_owner(
+        self,
+        db: AsyncSession,
+        *,
+        id: int,
+        obj_in: schemas.ItemUpdate,
+        owner_id: Optional[int] = None,
+        versions: Optional[Sequence[int]] = None,
+    ) -> Optional[Item]:
+        """
+        Update an item, restricted to the items of ``owner_id`` when it is given
+        and to the ``versions`` of an ``If-Match`` header.
+        """
+        where = [] if owner_id is None else [Item.owner_id == owner_id]
+        return await self.update_by_id(
+            db, id=id, obj_in=obj_in, where=where, versions=versions
+        )
+
+    async def remove_with_owner(
+        self, db: AsyncSession, *, id: int, owner_id: Optional[int] = None
+    ) -> Optional[Item]:
+        """
+        Delete an item, restricted to the items of ``owner_id`` when it is given.
+        """
+        where = [] if owner_id is None else [Item.owner_id == owner_id]
+        return await self.remove_by_id(db, id=id, where=where)
+
     async def get_multi_by_owner(
-        self, db: AsyncSession, *, owner_id: int, skip: int = 0, limit: int = 100
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[Any] = None,
+        fields: Optional[Sequence[str]] = None,
     ) -> List[Item]:
-        q = await db.exec(  # type: ignore
-            select(self.model)  # type: ignore
-            .where(Item.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
+        statement = (
+            self.select_fields(fields)
+            .where(Item.owner_id == owner_id)  # type: ignore
+            .order_by(Item.id)
         )
+        if after_id is not None:
+            statement = statement.where(Item.id > after_id)
+        else:
+            statement = statement.offset(skip)
+        q = await db.exec(statement.limit(limit))  # type: ignore
         return q.all()
 
+    async def stream_multi_by_owner(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: int,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        after_id: Optional[Any] = None,
+        fields: Optional[Sequence[str]] = None,
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[Item]:
+        async for db_obj in self.stream_pages(
+            partial(self.get_multi_by_owner, db, owner_id=owner_id, fields=fields),
+            skip=skip,
+            limit=limit,
+            after_id=after_id,
+            batch_size=batch_size,
+        ):
+            yield db_obj
+
 
 item_crud = CRUDItem(Item)
@@ -4,8 +4,10 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import schemas
-from app.core.security import get_password_hash, verify_password
+from app.core.config import settings
+from app.core.security import get_password_hash_async, verify_password_async
 from app.crud.postgres.base import CRUDBase
+from app.crud.postgres.user_cache import user_cache
 from app.models.postgres.user import User
 
 
@@ -14,10 +16,25 @@ class CRUDUser(CRUDBase[User, schemas.UserCreate, schemas.UserUpdate]):
         users = await db.exec(select(User).where(User.email == email))  # type: ignore
         return users.first()
 
+    async def get_cached(self, db: AsyncSession, *, id: Any) -> Optional[User]:
+        """
+        Get a user through the user cache, for authenticating requests.
+
+        The returned user is not attached to ``db``.
+        """
+        if not settings.USER_CACHE_ENABLED:
+            return await self.get(db, id=id)
+        user = await user_cache.get(id)
+        if user is None:
+            user = await self.get(db, id=id)
+            if user is not None:
+                await user_cache.set(user)
+        return user
+
     async def create(self, db: AsyncSession, *, obj_in: schemas.UserCreate) -> User:
         db_obj = User(  # type: ignore
             email=obj_in.email,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=await get_password_hash_async(obj_in.password),
             full_name=obj_in.full_name,
             is_superuser=obj_in.is_superuser,
         )
@@ -38,10 +55,12 @@ class CRUDUser(CRUDBase[User, schemas.UserCreate, schemas.UserUpdate]):
         else:
             update_data = obj_in.dict(exclude_unset=True)
         if "password" in update_data:
-            hashed_password = get_password_hash(update_data["password"])
+            hashed_password = await get_password_hash_async(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
-        return await super().update(db, db_obj=db_obj, obj_in=update_data)
+        user = await super().update(db, db_obj=db_obj, obj_in=update_data)
+        await user_cache.invalidate(user.id)
+        return user
 
     async def authenticate(
         self, db: AsyncSession, *, email: str, password: str
@@ -49,7 +68,7 @@ class CRUDUser(CRUDBase[User, schemas.UserCreate, schemas.UserUpdate]):
         user = await self.get_by_email(db, email=email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             return None
         return user
 
@@ -0,0 +1,92 @@
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from aioredis.exceptions import RedisError
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.redis.session import redis_conn
+from app.models.postgres.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class UserCache:
+    """
+    Cache of authenticated users, keyed by user id. Cached users have no
+    ``hashed_password``.
+
+    Users are looked up in a short lived in-process LRU first, then in Redis.
+    Writes to a user must call :meth:`invalidate` once committed; the Redis
+    entry is dropped right away while other workers' in-process entries expire
+    after ``USER_CACHE_LOCAL_TTL_SECONDS``.
+    """
+
+    key_prefix = "user-principal:"
+    # Authentication only needs the principal, the password hash is never cached
+    exclude = {"hashed_password"}
+
+    def __init__(self) -> None:
+        self.local: TTLCache[Dict[str, Any]] = TTLCache(
+            maxsize=settings.USER_CACHE_MAX_SIZE,
+            ttl=settings.USER_CACHE_LOCAL_TTL_SECONDS,
+        )
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def key(self, id: Any) -> str:
+        return f"{self.key_prefix}{id}"
+
+    async def get(self, id: Any) -> Optional[User]:
+        data = self.local.get(id)
+        if data is not None:
+            self.local_hits += 1
+            return User(**data)
+        try:
+            raw = await redis_conn.get(self.key(id))
+        except RedisError as e:
+            logger.warning(f"user cache lookup failed: {e}")
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.redis_hits += 1
+        data = json.loads(raw)
+        self.local.set(id, data)
+        return User(**data)
+
+    async def set(self, user: User) -> None:
+        data = user.dict(exclude=self.exclude)
+        self.local.set(user.id, data)
+        try:
+            await redis_conn.set(
+                self.key(user.id),
+                json.dumps(data),
+                ex=settings.USER_CACHE_TTL_SECONDS,
+            )
+        except RedisError as e:
+            logger.warning(f"user cache store failed: {e}")
+
+    async def invalidate(self, id: Any) -> None:
+        self.local.delete(id)
+        try:
+            await redis_conn.delete(self.key(id))
+        except RedisError as e:
+            logger.warning(f"user cache invalidation failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": (self.local_hits + self.redis_hits) / lookups
+            if lookups
+            else 0.0,
+            "local_size": len(self.local),
+        }
+
+
+user_cache = UserCache()
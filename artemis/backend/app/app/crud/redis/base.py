@@ -0,0 +1,164 @@
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from aioredis.client import Pipeline
+from aredis_om import HashModel, NotFoundError
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, ValidationError
+
+from app.core.config import settings
+
+ModelType = TypeVar("ModelType", bound=HashModel)
+CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
+
+# Every bulk result lines up with its input; failures are returned, not raised
+BulkResult = Union[ModelType, Exception]
+
+
+class CRUDBase(Generic[ModelType, CreateSchemaType]):
+    def __init__(self, model: Type[ModelType]):
+        """
+        CRUD object with pipelined bulk methods for a Redis OM hash model.
+
+        **Parameters**
+
+        * `model`: A Redis OM `HashModel` class
+        """
+        self.model = model
+
+    async def get(self, pk: str) -> Optional[ModelType]:
+        try:
+            return await self.model.get(pk)  # type: ignore
+        except NotFoundError:
+            return None
+
+    async def create_many(
+        self,
+        *,
+        objs_in: Sequence[CreateSchemaType],
+        batch_size: Optional[int] = None,
+    ) -> List[BulkResult]:
+        """
+        Save many models with one pipeline round trip per batch.
+
+        Args:
+            objs_in (Sequence[CreateSchemaType]): models to create
+            batch_size (Optional[int]): commands per pipeline, defaults to
+                `REDIS_BATCH_SIZE`
+
+        Returns:
+            List[BulkResult]: the saved model or the error, in request order
+        """
+        results: List[BulkResult] = []
+        for obj_in in objs_in:
+            try:
+                results.append(self.model(**jsonable_encoder(obj_in)))
+            except ValidationError as e:
+                results.append(e)
+        models = [r for r in results if not isinstance(r, Exception)]
+
+        async def queue(pipe: Pipeline, db_obj: ModelType) -> None:
+            await db_obj.save(pipeline=pipe)
+
+        replies = await self._pipelined(models, queue, batch_size=batch_size)
+        saved = {
+            db_obj.pk: _error_or(db_obj_replies, db_obj)
+            for db_obj, db_obj_replies in zip(models, replies)
+        }
+        return [r if isinstance(r, Exception) else saved[r.pk] for r in results]
+
+    async def get_many(
+        self, *, pks: Sequence[str], batch_size: Optional[int] = None
+    ) -> List[BulkResult]:
+        """
+        Fetch many models by primary key, batching the HGETALLs in pipelines.
+
+        Args:
+            pks (Sequence[str]): primary keys to fetch
+            batch_size (Optional[int]): commands per pipeline, defaults to
+                `REDIS_BATCH_SIZE`
+
+        Returns:
+            List[BulkResult]: the model, `NotFoundError` or the error, in request
+                order
+        """
+
+        async def queue(pipe: Pipeline, pk: str) -> None:
+            await pipe.hgetall(self.model.make_primary_key(pk))
+
+        replies = await self._pipelined(pks, queue, batch_size=batch_size)
+        results: List[BulkResult] = []
+        for (reply,) in replies:
+            if isinstance(reply, Exception):
+                results.append(reply)
+            elif not reply:
+                results.append(NotFoundError())
+            else:
+                try:
+                    results.append(self.model.parse_obj(reply))
+                except ValidationError as e:
+                    results.append(e)
+        return results
+
+    async def remove_many(
+        self, *, pks: Sequence[str], batch_size: Optional[int] = None
+    ) -> List[Union[int, Exception]]:
+        """
+        Delete many models by primary key, batching the DELs in pipelines.
+
+        Args:
+            pks (Sequence[str]): primary keys to delete
+            batch_size (Optional[int]): commands per pipeline, defaults to
+                `REDIS_BATCH_SIZE`
+
+        Returns:
+            List[Union[int, Exception]]: number of keys deleted (0 or 1) or the
+                error, in request order
+        """
+
+        async def queue(pipe: Pipeline, pk: str) -> None:
+            await pipe.delete(self.model.make_primary_key(pk))
+
+        replies = await self._pipelined(pks, queue, batch_size=batch_size)
+        return [reply for (reply,) in replies]
+
+    async def _pipelined(
+        self,
+        values: Sequence[Any],
+        queue: Callable[[Pipeline, Any], Awaitable[None]],
+        *,
+        batch_size: Optional[int] = None,
+    ) -> List[List[Any]]:
+        """
+        Run ``queue`` for each value in pipelines of ``batch_size`` values.
+
+        Returns the replies to the commands each value queued, in order, since
+        ``queue`` may send more than one command.
+        """
+        batch_size = batch_size or settings.REDIS_BATCH_SIZE
+        replies: List[List[Any]] = []
+        for start in range(0, len(values), batch_size):
+            async with self.model.db().pipeline(transaction=False) as pipe:
+                counts = []
+                end = start + batch_size
+                for value in values[start:end]:
+                    queued = len(pipe.command_stack)
+                    await queue(pipe, value)
+                    counts.append(len(pipe.command_stack) - queued)
+                batch = iter(await pipe.execute(raise_on_error=False))
+                replies.extend([next(batch) for _ in range(count)] for count in counts)
+        return replies
+
+
+def _error_or(replies: List[Any], db_obj: Any) -> Any:
+    return next((r for r in replies if isinstance(r, Exception)), db_obj)
@@ -0,0 +1,10 @@
+from app.crud.redis.base import CRUDBase
+from app.models.redis.item import Item
+from app.schemas.redis.item import ItemCreate
+
+
+class CRUDItem(CRUDBase[Item, ItemCreate]):
+    pass
+
+
+redis_item_crud = CRUDItem(Item)
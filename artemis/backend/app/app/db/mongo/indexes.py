@@ -0,0 +1,43 @@
+import logging
+from typing import Dict, Optional, Sequence
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from app.db.mongo.session import db
+
+logger = logging.getLogger(__name__)
+
+MYSPORTSFEEDS_DB = "MySportsFeeds"
+
+# One document per feed per day, looked up and range scanned by ``date``
+DATE_INDEX = IndexModel([("date", ASCENDING)], unique=True, name="date_unique")
+
+# Collection name -> indexes of the MySportsFeeds database
+MYSPORTSFEEDS_INDEXES: Dict[str, Sequence[IndexModel]] = {
+    "games": [DATE_INDEX],
+    "gamelogs": [DATE_INDEX],
+    "team_gamelogs": [DATE_INDEX],
+    "game_lines": [DATE_INDEX],
+    "futures": [DATE_INDEX],
+    "player_stats_totals": [DATE_INDEX],
+    "team_stats_totals": [DATE_INDEX],
+    "dfs": [DATE_INDEX],
+}
+
+
+async def ensure_mongo_indexes(client: Optional[AsyncIOMotorClient] = None) -> None:
+    """
+    Create the indexes of :data:`MYSPORTSFEEDS_INDEXES`.
+
+    ``createIndexes`` is a no-op for indexes that already exist, so this runs on
+    every startup. An index the server refuses, e.g. a unique index over
+    existing duplicates, is logged instead of stopping the app.
+    """
+    database = (client or db.client)[MYSPORTSFEEDS_DB]
+    for name, indexes in MYSPORTSFEEDS_INDEXES.items():
+        try:
+            await database[name].create_indexes(list(indexes))
+        except OperationFailure as e:
+            logger.error(f"Could not create indexes on {name}: {e}")
@@ -1,7 +1,11 @@
+from functools import lru_cache
+
 import motor
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import MongoClient
 
 from app.core.config import settings
+from app.core.metrics import MongoCommandMetrics
 
 
 class DataBase:
@@ -16,8 +20,19 @@ async def get_database() -> AsyncIOMotorClient:
 
 
 async def connect_to_mongo():
-    db.client = AsyncIOMotorClient(settings.MONGO_DATABASE_URI)
+    db.client = AsyncIOMotorClient(
+        settings.MONGO_DATABASE_URI, event_listeners=[MongoCommandMetrics()]
+    )
 
 
 async def close_mongo_connection():
     db.client.close()
+
+
+@lru_cache()
+def get_sync_client() -> MongoClient:
+    """
+    Blocking client for the Celery worker, created on first use so every
+    worker process gets its own connection pool.
+    """
+    return MongoClient(settings.MONGO_DATABASE_URI)
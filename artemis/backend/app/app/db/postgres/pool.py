@@ -0,0 +1,101 @@
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from app.core.config import Settings
+
+
+class PoolWaitStats:
+    """
+    Running totals of the time callers waited to check a connection out.
+    """
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float) -> None:
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "total_wait_seconds": self.total_wait,
+            "avg_wait_seconds": self.total_wait / self.checkouts
+            if self.checkouts
+            else 0.0,
+            "max_wait_seconds": self.max_wait,
+        }
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    ``AsyncAdaptedQueuePool`` that records how long each checkout waited.
+
+    The wait covers queueing for a free connection, opening a new one when the
+    pool may grow, and the pre-ping when it is enabled.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def connect(self) -> Any:
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.wait_stats.timeouts += 1
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return connection
+
+
+def engine_pool_options(settings: Settings) -> Dict[str, Any]:
+    """
+    Keyword arguments for ``create_async_engine`` derived from the settings.
+
+    ``MIN_CONNECTION_COUNT`` connections are kept open and up to
+    ``MAX_CONNECTION_COUNT`` are opened under load. Behind pgbouncer in
+    transaction pooling mode a server connection is not pinned to a client,
+    so both the SQLAlchemy and the asyncpg prepared statement caches are
+    turned off.
+    """
+    statement_cache_size = (
+        0 if settings.POSTGRES_PGBOUNCER else settings.POSTGRES_STATEMENT_CACHE_SIZE
+    )
+    return {
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": settings.MIN_CONNECTION_COUNT,
+        "max_overflow": settings.MAX_CONNECTION_COUNT - settings.MIN_CONNECTION_COUNT,
+        "pool_pre_ping": settings.POSTGRES_POOL_PRE_PING,
+        "pool_recycle": settings.POSTGRES_POOL_RECYCLE,
+        "pool_timeout": settings.POSTGRES_POOL_TIMEOUT,
+        "pool_use_lifo": True,
+        "connect_args": {
+            "statement_cache_size": statement_cache_size,
+            "prepared_statement_cache_size": statement_cache_size,
+        },
+    }
+
+
+def pool_stats(pool: Pool) -> Dict[str, Any]:
+    """
+    Snapshot of the connection pool for monitoring.
+    """
+    stats: Dict[str, Any] = {
+        "size": pool.size(),  # type: ignore
+        "checked_in": pool.checkedin(),  # type: ignore
+        "checked_out": pool.checkedout(),  # type: ignore
+        "overflow": pool.overflow(),  # type: ignore
+    }
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        stats.update(pool.wait_stats.as_dict())
+    return stats
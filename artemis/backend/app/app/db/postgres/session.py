@@ -1,10 +1,31 @@
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.ext.asyncio import create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import ORMExecuteState, sessionmaker
+from sqlalchemy.orm.query import FromStatement
+from sqlalchemy.sql.elements import TextClause
+from sqlmodel import Session
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.db.postgres.pool import engine_pool_options
+
+# ``Session.info`` keys
+PENDING_WRITES = "pending_writes"
+READ_ONLY = "read_only"
 
-engine = create_async_engine(settings.SQLALCHEMY_DATABASE_URI, echo=True)
+engine = create_async_engine(
+    settings.SQLALCHEMY_DATABASE_URI,
+    echo=settings.SQLALCHEMY_ECHO,
+    **engine_pool_options(settings),
+)
+instrument_engine(engine.sync_engine)
+# Same pool, but statements run outside of a transaction: no BEGIN/ROLLBACK
+# round trips around the queries of read-only sessions
+autocommit_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
@@ -12,3 +33,58 @@ SessionLocal = sessionmaker(
     class_=AsyncSession,
     expire_on_commit=False,
 )
+
+
+class ReadOnlySessionError(InvalidRequestError):
+    """
+    Raised when a read-only session is asked to write.
+    """
+
+
+def has_pending_writes(session: AsyncSession) -> bool:
+    """
+    Whether the session has written, or holds changes to write, since it last
+    committed or rolled back.
+    """
+    return bool(
+        session.info.get(PENDING_WRITES)
+        or session.new
+        or session.dirty
+        or session.deleted
+    )
+
+
+def _is_write(statement: Any) -> bool:
+    if isinstance(statement, FromStatement):
+        statement = statement.element
+    # Raw SQL could be anything, assume it writes
+    return statement.is_dml or isinstance(statement, TextClause)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement_writes(orm_execute_state: ORMExecuteState) -> None:
+    if not _is_write(orm_execute_state.statement):
+        return
+    session = orm_execute_state.session
+    if session.info.get(READ_ONLY):
+        raise ReadOnlySessionError("Cannot execute a write in a read-only session")
+    session.info[PENDING_WRITES] = True
+
+
+@event.listens_for(Session, "before_flush")
+def _guard_read_only_flush(
+    session: Session, flush_context: Any, instances: Any
+) -> None:
+    if session.info.get(READ_ONLY):
+        raise ReadOnlySessionError("Cannot flush a read-only session")
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush_writes(session: Session, flush_context: Any) -> None:
+    session.info[PENDING_WRITES] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_pending_writes(session: Session) -> None:
+    session.info.pop(PENDING_WRITES, None)
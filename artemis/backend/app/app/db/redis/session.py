@@ -1,7 +1,21 @@
+from functools import lru_cache
+
 from aredis_om import get_redis_connection
+from redis import Redis
 
 from app.core.config import settings
+from app.core.metrics import instrument_redis
 
 redis_conn = get_redis_connection(
     url=f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}", decode_responses=True
 )
+instrument_redis(redis_conn)
+
+
+@lru_cache()
+def get_sync_redis() -> Redis:
+    """
+    Synchronous client for the MySportsFeeds sync locks, the Celery tasks taking
+    them run outside the event loop ``redis_conn`` needs.
+    """
+    return Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
@@ -1,18 +1,29 @@
 import uvicorn
 from aredis_om import Migrator
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
 from sqlmodel import SQLModel
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.api_v1.api import api_router
+from app.api.responses import ORJSONResponse
+from app.core.cache import response_cache
 from app.core.config import settings
+from app.core.memory import MemorySamplingMiddleware
+from app.core.metrics import PrometheusMiddleware, render_metrics
+from app.core.profiling import loop_monitor, profiler
+from app.core.query_counter import QueryCountMiddleware
+from app.core.security import PasswordHasherBusyError, password_hasher
 from app.db.init_db import init_db
 from app.db.postgres.session import SessionLocal, engine
+from app.db.mongo.indexes import ensure_mongo_indexes
 from app.db.mongo.session import connect_to_mongo, close_mongo_connection
 
 
 app = FastAPI(
-    title=settings.PROJECT_NAME, openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    title=settings.PROJECT_NAME,
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
 )
 
 # Set all CORS enabled origins
@@ -25,8 +36,42 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+app.add_middleware(MemorySamplingMiddleware)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(PrometheusMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics() -> Response:
+        content, media_type = render_metrics()
+        return Response(content, media_type=media_type)
+
+
+if settings.QUERY_COUNT_HEADER_ENABLED:
+    app.add_middleware(QueryCountMiddleware)
+
 app.add_event_handler("startup", connect_to_mongo)
+app.add_event_handler("startup", ensure_mongo_indexes)
+app.add_event_handler("startup", response_cache.start)
 app.add_event_handler("shutdown", close_mongo_connection)
+app.add_event_handler("shutdown", password_hasher.shutdown)
+app.add_event_handler("shutdown", response_cache.stop)
+app.add_event_handler("shutdown", loop_monitor.stop)
+app.add_event_handler("shutdown", profiler.stop)
+if settings.LOOP_MONITOR_ENABLED:
+    app.add_event_handler("startup", loop_monitor.start)
+
+
+@app.exception_handler(PasswordHasherBusyError)
+async def password_hasher_busy_handler(
+    request: Request, exc: PasswordHasherBusyError
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many password operations in progress"},
+        headers={"Retry-After": "1"},
+    )
+
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -1,9 +1,28 @@
+from datetime import datetime
+
 from bson import ObjectId
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
 from typing import Any, Optional
 
 from app.db.mongo.base_class import PyObjectId
 
+# MySportsFeeds dates, ``YYYYMMDD``, which sort as strings in date order
+DATE_FORMAT = "%Y%m%d"
+
+
+def check_date(value: str) -> str:
+    """
+    Reject dates that are not ``DATE_FORMAT``, date range queries compare them
+    as strings.
+    """
+    try:
+        valid = datetime.strptime(value, DATE_FORMAT).strftime(DATE_FORMAT) == value
+    except ValueError:
+        valid = False
+    if not valid:
+        raise ValueError("date must be a YYYYMMDD date")
+    return value
+
 
 class MongoBaseModel(BaseModel):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
@@ -19,6 +38,15 @@ class Games(MongoBaseModel):
     games: Any = Field(...)
 
 
+class PartialGames(MongoBaseModel):
+    """
+    A `Games` document that may have been read with a projection.
+    """
+
+    date: Optional[str] = None
+    games: Optional[Any] = None
+
+
 class CreateGames(BaseModel):
     _id: str = Field(default=str(ObjectId()))
     date: str = Field(...)
@@ -26,14 +54,18 @@ class CreateGames(BaseModel):
 
     class Config:
         schema_extra = {
-            "date": "11-22-2022",
+            "date": "20221122",
             "games": {"someGames": "theseGames"},
         }
 
+    _check_date = validator("date", allow_reuse=True)(check_date)
+
 
 class UpdateGames(BaseModel):
-    date: Optional[str] = Field(...)
-    games: Optional[Any] = Field(...)
+    date: Optional[str] = Field(None)
+    games: Optional[Any] = Field(None)
+
+    _check_date = validator("date", allow_reuse=True)(check_date)
 
 
 class GameLogs(BaseModel):
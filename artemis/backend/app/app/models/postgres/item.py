@@ -1,5 +1,7 @@
-from typing import Optional
+from typing import Any, Dict, Optional
 
+from sqlalchemy import Index
+from sqlalchemy.orm import declared_attr
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.models.postgres.user import User
@@ -11,6 +13,17 @@ class ItemBase(SQLModel):
 
 
 class Item(ItemBase, table=True):  # type: ignore
+    # Serves keyset pagination of an owner's items (``owner_id = ? AND id > ?``)
+    __table_args__ = (Index("ix_item_owner_id_id", "owner_id", "id"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     owner_id: int = Field(foreign_key="user.id")
     owner: Optional[User] = Relationship(back_populates="items")
+    # Bumped on every update, served as the item's ETag
+    version_id: int = Field(
+        default=1, nullable=False, sa_column_kwargs={"server_default": "1"}
+    )
+
+    @declared_attr
+    def __mapper_args__(cls) -> Dict[str, Any]:
+        return {"version_id_col": cls.__table__.c.version_id}
@@ -1,5 +1,6 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
+from sqlalchemy.orm import declared_attr
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -16,3 +17,11 @@ class User(UserBase, table=True):  # type: ignore
     items: List["Item"] = Relationship(  # type: ignore # noqa: F821
         back_populates="owner"
     )
+    # Bumped on every update, concurrent ORM updates raise StaleDataError
+    version_id: int = Field(
+        default=1, nullable=False, sa_column_kwargs={"server_default": "1"}
+    )
+
+    @declared_attr
+    def __mapper_args__(cls) -> Dict[str, Any]:
+        return {"version_id_col": cls.__table__.c.version_id}
@@ -7,7 +7,7 @@ from app.db.redis.session import redis_conn
 
 class Item(HashModel):
     name: str = Field(index=True)
-    timestamp: float = Field(default=time.time(), index=True)
+    timestamp: float = Field(default_factory=time.time, index=True, sortable=True)
 
     class Meta:
         database = redis_conn
@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+import requests.adapters
+from tenacity import (
+    Retrying,
+    before_sleep_log,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# MySportsFeeds authenticates with the API key as user and a fixed password
+MSF_PASSWORD = "MYSPORTSFEEDS"
+
+
+class RateLimiter:
+    """
+    Spaces calls to :meth:`acquire` at least ``1 / rate`` seconds apart, across
+    threads.
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def _is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return False
+
+
+class MSFClient:
+    """
+    Thread safe MySportsFeeds client with rate limiting and retries.
+
+    Point ``base_url`` at a fake feed server, e.g. :class:`app.msf.fake.FakeFeedServer`,
+    to run the ingestion pipeline offline.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        *,
+        requests_per_second: Optional[float] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        self.base_url = (base_url or settings.MSF_BASE_URL).rstrip("/")
+        self.timeout = timeout or settings.MSF_REQUEST_TIMEOUT
+        self.max_retries = max_retries or settings.MSF_MAX_RETRIES
+        self.rate_limiter = RateLimiter(
+            requests_per_second
+            if requests_per_second is not None
+            else settings.MSF_REQUESTS_PER_SECOND
+        )
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_maxsize=settings.MSF_CONCURRENCY
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+        api_key = api_key or settings.MSF_API_KEY
+        if api_key:
+            self.session.auth = (api_key, MSF_PASSWORD)
+
+    def fetch(
+        self, path: str, params: Optional[Dict[str, str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        GET a feed, retrying connection errors, 429s and 5xx with backoff.
+
+        Args:
+            path (str): feed path relative to ``base_url``
+            params (Optional[Dict[str, str]]): query parameters
+
+        Returns:
+            Optional[Dict[str, Any]]: the JSON payload, ``None`` when the feed has
+                no data (204) or did not change since the last request (304,
+                with ``force=false``)
+        """
+        for attempt in Retrying(
+            retry=retry_if_exception(_is_transient),
+            stop=stop_after_attempt(self.max_retries),
+            wait=wait_exponential(multiplier=0.5, max=30),
+            before_sleep=before_sleep_log(logger, logging.WARN),
+            reraise=True,
+        ):
+            with attempt:
+                self.rate_limiter.acquire()
+                response = self.session.get(
+                    f"{self.base_url}/{path}", params=params, timeout=self.timeout
+                )
+                response.raise_for_status()
+                if response.status_code in (204, 304):
+                    return None
+                return response.json()
+        return None
+
+    def close(self) -> None:
+        self.session.close()
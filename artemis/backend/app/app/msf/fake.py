@@ -0,0 +1,86 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any, Dict, List, Optional, Set, Type
+
+from app.msf.feeds import FEEDS
+
+
+def fake_payload(records: int = 15, record_bytes: int = 512) -> Dict[str, Any]:
+    """
+    A response carrying every key the feeds in :data:`FEEDS` read, each holding
+    ``records`` records of about ``record_bytes`` bytes.
+    """
+    keys = {key for feed in FEEDS.values() for key in feed.fields.values()}
+    record = {"id": 0, "padding": "x" * record_bytes}
+    payload: Dict[str, Any] = {"lastUpdatedOn": "2022-10-01T00:00:00.000Z"}
+    payload.update({key: [dict(record, id=i) for i in range(records)] for key in keys})
+    return payload
+
+
+class FakeFeedServer:
+    """
+    Local MySportsFeeds stand-in serving the same payload for every ``.json``
+    path, so the ingestion pipeline can be tested and benchmarked offline.
+
+    Use it as a context manager and point :class:`app.msf.client.MSFClient` at
+    :attr:`base_url`. Paths listed in ``empty`` answer 204 like days without
+    games, and ``latency`` seconds are slept per request. The paths requested
+    are recorded in :attr:`paths`.
+    """
+
+    def __init__(
+        self,
+        payload: Optional[Dict[str, Any]] = None,
+        *,
+        latency: float = 0.0,
+        empty: Optional[Set[str]] = None,
+    ) -> None:
+        body = json.dumps(payload or fake_payload()).encode()
+        empty_paths = empty or set()
+        self.requests = 0
+        self.paths: List[str] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                server.requests += 1
+                if latency:
+                    time.sleep(latency)
+                path = self.path.split("?", 1)[0].lstrip("/")
+                server.paths.append(path)
+                if path in empty_paths:
+                    self.send_response(204)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeFeedServer":
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,129 @@
+from datetime import date
+from typing import Any, Dict, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from app.models.mongo.mysportsfeeds import (
+    DATE_FORMAT,
+    DailyFantasySports,
+    Futures,
+    GameLines,
+    GameLogs,
+    Games,
+    PlayerStatsTotals,
+    TeamGameLogs,
+    TeamStatsTotals,
+)
+
+
+class Feed(BaseModel):
+    """
+    A MySportsFeeds feed and how its responses map onto a `mysportsfeeds` model.
+    """
+
+    name: str
+    # Mongo collection, see app.db.mongo.indexes
+    collection: str
+    # Relative to MSF_BASE_URL, formatted with ``season`` and ``date``
+    path: str
+    model: Type[BaseModel]
+    # Model field -> key of the response payload
+    fields: Dict[str, str]
+    # Daily feeds have one response per date, season feeds take ``date`` as a
+    # query parameter and return the totals up to that date
+    daily: bool = True
+    # Tag of the API's cached responses showing this feed's documents, see
+    # app.crud.mongo.base.CRUDBase.cache_tag; None when none are cached
+    cache_tag: Optional[str] = None
+
+    def request(self, season: str, day: date) -> Tuple[str, Dict[str, str]]:
+        """
+        Path and query parameters to fetch this feed for ``day``.
+        """
+        msf_date = day.strftime(DATE_FORMAT)
+        path = self.path.format(season=season, date=msf_date)
+        return path, {} if self.daily else {"date": msf_date}
+
+    def to_document(self, day: date, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate ``payload`` against :attr:`model` and return the Mongo document.
+        """
+        msf_date = day.strftime(DATE_FORMAT)
+        values = {field: payload.get(key) for field, key in self.fields.items()}
+        if self.model.__fields__["id"].required:
+            # Models without a generated id are keyed by their date
+            values["_id"] = msf_date
+        return self.model(date=msf_date, **values).dict(by_alias=True)
+
+
+FEEDS: Dict[str, Feed] = {
+    feed.name: feed
+    for feed in (
+        Feed(
+            name="games",
+            collection="games",
+            path="{season}/date/{date}/games.json",
+            model=Games,
+            fields={"games": "games"},
+            cache_tag="games",
+        ),
+        Feed(
+            name="gamelogs",
+            collection="gamelogs",
+            path="{season}/date/{date}/player_gamelogs.json",
+            model=GameLogs,
+            fields={"gamelogs": "gamelogs"},
+        ),
+        Feed(
+            name="team_gamelogs",
+            collection="team_gamelogs",
+            path="{season}/date/{date}/team_gamelogs.json",
+            model=TeamGameLogs,
+            fields={"team_gamelogs": "gamelogs"},
+        ),
+        Feed(
+            name="lines",
+            collection="game_lines",
+            path="{season}/date/{date}/odds_gamelines.json",
+            model=GameLines,
+            fields={"gameLines": "gameLines"},
+        ),
+        Feed(
+            name="futures",
+            collection="futures",
+            path="{season}/date/{date}/odds_futures.json",
+            model=Futures,
+            fields={"futures": "futures"},
+        ),
+        Feed(
+            name="player_stats_totals",
+            collection="player_stats_totals",
+            path="{season}/player_stats_totals.json",
+            model=PlayerStatsTotals,
+            fields={"playerStatsTotals": "playerStatsTotals"},
+            daily=False,
+        ),
+        Feed(
+            name="team_stats_totals",
+            collection="team_stats_totals",
+            path="{season}/team_stats_totals.json",
+            model=TeamStatsTotals,
+            fields={"teramStatsTotals": "teamStatsTotals"},
+            daily=False,
+        ),
+        Feed(
+            name="dfs",
+            collection="dfs",
+            path="{season}/date/{date}/dfs.json",
+            model=DailyFantasySports,
+            fields={"dfs": "sources", "dfs_players": "references"},
+        ),
+    )
+}
+
+
+def get_feed(name: str) -> Feed:
+    feed: Optional[Feed] = FEEDS.get(name)
+    if feed is None:
+        raise ValueError(f"Unknown feed {name}, expected one of {', '.join(FEEDS)}")
+    return feed
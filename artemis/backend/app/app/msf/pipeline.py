@@ -0,0 +1,183 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import requests
+from pydantic import BaseModel
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+from pymongo.database import Database
+from redis import Redis
+
+from app.core.cache import invalidate_tags_sync
+from app.core.config import settings
+from app.models.mongo.mysportsfeeds import DATE_FORMAT
+from app.msf.client import MSFClient
+from app.msf.feeds import Feed
+
+logger = logging.getLogger(__name__)
+
+
+class IngestStats(BaseModel):
+    feed: str
+    fetched: int = 0
+    empty: int = 0
+    failed: int = 0
+    upserted: int = 0
+    matched: int = 0
+    seconds: float = 0.0
+    failed_dates: List[date] = []
+
+    @property
+    def documents(self) -> int:
+        return self.upserted + self.matched
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.documents / self.seconds if self.seconds else 0.0
+
+
+def date_range(date_from: date, date_to: date) -> List[date]:
+    """
+    Every date from ``date_from`` to ``date_to``, both inclusive.
+    """
+    return [
+        date_from + timedelta(days=n) for n in range((date_to - date_from).days + 1)
+    ]
+
+
+def upsert_operation(feed: Feed, day: date, payload: Dict[str, Any]) -> UpdateOne:
+    """
+    Upsert the document of ``day``, keyed by its unique ``date``.
+
+    The ``_id`` is only written when the document is inserted, so re-ingesting
+    a date keeps the document's identity, and the revision the API serves as
+    the document's ETag is bumped.
+    """
+    document = feed.to_document(day, payload)
+    _id = document.pop("_id")
+    return UpdateOne(
+        {"date": document["date"]},
+        {"$set": document, "$setOnInsert": {"_id": _id}, "$inc": {"_rev": 1}},
+        upsert=True,
+    )
+
+
+def invalidate_cached(
+    feed: Feed, collection: Collection, dates: Sequence[str], redis: Redis
+) -> None:
+    """
+    Drop the API's cached responses showing the documents of ``dates``, whose
+    revisions, and so ETags, an upsert bumped.
+    """
+    if feed.cache_tag is None or not dates:
+        return
+    documents = collection.find({"date": {"$in": list(dates)}}, {"_id": 1})
+    ids = [str(document["_id"]) for document in documents]
+    invalidate_tags_sync(
+        redis, feed.cache_tag, *(f"{feed.cache_tag}:{id}" for id in ids)
+    )
+
+
+def _fetch_all(
+    feed: Feed,
+    season: str,
+    dates: Sequence[date],
+    client: MSFClient,
+    concurrency: int,
+    extra_params: Dict[str, str],
+) -> Iterator[Tuple[date, Optional[Dict[str, Any]], Optional[Exception]]]:
+    def fetch(day: date) -> Tuple[Optional[Dict[str, Any]], Optional[Exception]]:
+        path, params = feed.request(season, day)
+        try:
+            return client.fetch(path, {**params, **extra_params}), None
+        except (requests.RequestException, ValueError) as e:
+            return None, e
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for day, (payload, error) in zip(dates, executor.map(fetch, dates)):
+            yield day, payload, error
+
+
+def ingest(
+    feed: Feed,
+    season: str,
+    dates: Sequence[date],
+    *,
+    client: MSFClient,
+    database: Database,
+    concurrency: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    params: Optional[Dict[str, str]] = None,
+    redis: Optional[Redis] = None,
+) -> IngestStats:
+    """
+    Fetch ``feed`` for every date and upsert the documents into Mongo.
+
+    Fetches run on ``concurrency`` threads behind the client's rate limiter, and
+    documents are written with unordered ``bulk_write`` upserts of
+    ``batch_size`` operations while the next ones download. A date that still
+    fails after the client's retries is logged and counted, and the run goes on.
+    With ``redis``, the cached API responses showing the written documents are
+    invalidated after every ``bulk_write``.
+
+    Args:
+        feed (Feed): feed to ingest
+        season (str): MySportsFeeds season, e.g. ``2022-regular``
+        dates (Sequence[date]): dates to fetch
+        client (MSFClient): feed client, possibly pointed at a fake server
+        database (Database): database holding ``feed.collection``
+        concurrency (Optional[int]): parallel fetches, defaults to
+            ``MSF_CONCURRENCY``
+        batch_size (Optional[int]): upserts per ``bulk_write``, defaults to
+            ``MSF_BULK_WRITE_BATCH_SIZE``
+        params (Optional[Dict[str, str]]): extra query parameters for every
+            request, e.g. ``force=false``
+        redis (Optional[Redis]): Redis of the API's response cache
+
+    Returns:
+        IngestStats: counts and throughput of the run
+    """
+    concurrency = concurrency or settings.MSF_CONCURRENCY
+    batch_size = batch_size or settings.MSF_BULK_WRITE_BATCH_SIZE
+    collection = database[feed.collection]
+    stats = IngestStats(feed=feed.name)
+    operations: List[UpdateOne] = []
+    written: List[str] = []
+
+    def flush() -> None:
+        if not operations:
+            return
+        result = collection.bulk_write(operations, ordered=False)
+        stats.upserted += result.upserted_count
+        stats.matched += result.matched_count
+        if redis is not None:
+            invalidate_cached(feed, collection, written, redis)
+        operations.clear()
+        written.clear()
+
+    start = time.perf_counter()
+    fetched = _fetch_all(feed, season, dates, client, concurrency, params or {})
+    for day, payload, error in fetched:
+        if error is not None:
+            stats.failed += 1
+            stats.failed_dates.append(day)
+            logger.error(f"Could not fetch {feed.name} for {day}: {error}")
+            continue
+        stats.fetched += 1
+        if payload is None:
+            stats.empty += 1
+            continue
+        operations.append(upsert_operation(feed, day, payload))
+        written.append(day.strftime(DATE_FORMAT))
+        if len(operations) >= batch_size:
+            flush()
+    flush()
+    stats.seconds = time.perf_counter() - start
+    logger.info(
+        f"Ingested {stats.documents} {feed.name} documents in "
+        f"{stats.seconds:.2f}s ({stats.docs_per_second:.1f} docs/s)"
+    )
+    return stats
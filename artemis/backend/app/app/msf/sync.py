@@ -0,0 +1,133 @@
+import logging
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from pymongo.database import Database
+from redis import Redis
+from redis.exceptions import LockError
+
+from app.core.config import settings
+from app.models.mongo.mysportsfeeds import DATE_FORMAT
+from app.msf.client import MSFClient
+from app.msf.feeds import Feed
+from app.msf.pipeline import IngestStats, date_range, ingest
+
+logger = logging.getLogger(__name__)
+
+# One document per feed: ``{"_id": feed, "date": "YYYYMMDD", "updated_at": ...}``
+CHECKPOINTS_COLLECTION = "sync_checkpoints"
+
+
+class SyncInProgressError(Exception):
+    """
+    Raised when another worker holds the sync lock of a feed.
+    """
+
+
+def load_checkpoint(database: Database, feed: Feed) -> Optional[date]:
+    """
+    Last date up to which ``feed`` was fully synced, ``None`` if never.
+    """
+    checkpoint = database[CHECKPOINTS_COLLECTION].find_one({"_id": feed.name})
+    if checkpoint is None:
+        return None
+    return datetime.strptime(checkpoint["date"], DATE_FORMAT).date()
+
+
+def save_checkpoint(database: Database, feed: Feed, day: date) -> None:
+    database[CHECKPOINTS_COLLECTION].update_one(
+        {"_id": feed.name},
+        {
+            "$set": {
+                "date": day.strftime(DATE_FORMAT),
+                "updated_at": datetime.utcnow(),
+            }
+        },
+        upsert=True,
+    )
+
+
+def sync_dates(
+    checkpoint: Optional[date],
+    today: date,
+    *,
+    lookback_days: int,
+    start_date: Optional[date] = None,
+) -> List[date]:
+    """
+    Dates to fetch: from ``lookback_days`` before the checkpoint, or from
+    ``start_date`` (else ``today`` minus the lookback) on the first run, to
+    ``today``.
+    """
+    if checkpoint is not None:
+        first = checkpoint - timedelta(days=lookback_days)
+    else:
+        first = start_date or today - timedelta(days=lookback_days)
+    return date_range(first, today) if first <= today else []
+
+
+def sync_feed(
+    feed: Feed,
+    season: str,
+    *,
+    client: MSFClient,
+    database: Database,
+    redis: Redis,
+    today: Optional[date] = None,
+) -> IngestStats:
+    """
+    Fetch what changed in ``feed`` since its checkpoint and move the checkpoint.
+
+    Requests are sent with ``force=false`` so MySportsFeeds answers 304 for
+    dates that did not change since the last pull. The checkpoint only moves
+    up to the day before the first date that failed, so failed dates are
+    retried by the next run. A Redis lock keeps overlapping runs of the same
+    feed, from beat or from other workers, from racing on the checkpoint.
+
+    Raises:
+        SyncInProgressError: another run of this feed holds the lock
+    """
+    today = today or date.today()
+    lock = redis.lock(
+        f"msf-sync:{feed.name}",
+        timeout=settings.MSF_SYNC_LOCK_TIMEOUT,
+        blocking=False,
+    )
+    if not lock.acquire():
+        raise SyncInProgressError(feed.name)
+    try:
+        checkpoint = load_checkpoint(database, feed)
+        if feed.daily:
+            dates = sync_dates(
+                checkpoint,
+                today,
+                lookback_days=settings.MSF_SYNC_LOOKBACK_DAYS,
+                start_date=settings.MSF_SYNC_START_DATE,
+            )
+        else:
+            # Season feeds return the totals up to a date, today's are enough
+            dates = [today]
+        stats = ingest(
+            feed,
+            season,
+            dates,
+            client=client,
+            database=database,
+            params={"force": "false"},
+            redis=redis,
+        )
+        if stats.failed_dates:
+            synced_to = min(stats.failed_dates) - timedelta(days=1)
+        else:
+            synced_to = today
+        if dates and (checkpoint is None or synced_to > checkpoint):
+            save_checkpoint(database, feed, synced_to)
+        return stats
+    finally:
+        try:
+            lock.release()
+        except LockError:
+            logger.warning(
+                f"Sync lock of {feed.name} expired before the run finished, "
+                "raise MSF_SYNC_LOCK_TIMEOUT"
+            )
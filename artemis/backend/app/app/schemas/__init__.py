@@ -1,4 +1,16 @@
 from .msg import Msg
 from .postgres.item import ItemCreate, ItemInDB, ItemInDBBase, ItemUpdate
-from .postgres.user import UserCreate, UserInDB, UserInDBBase, UserUpdate
+from .postgres.user import User, UserCreate, UserInDB, UserInDBBase, UserUpdate
+from .stats import (
+    DBPoolStats,
+    LoopLagStats,
+    MemorySnapshot,
+    MemoryStatDiff,
+    MemoryStatus,
+    ProfilerStatus,
+    ResponseCacheStats,
+    RouteMemoryStats,
+    SlowCallback,
+    UserCacheStats,
+)
 from .token import Token, TokenPayload
@@ -1,5 +1,24 @@
+from typing import List, Optional
+
 from pydantic import BaseModel
 
+from app.models.redis.item import Item
+
 
 class ItemCreate(BaseModel):
     name: str
+
+
+class ItemBulkCreate(BaseModel):
+    items: List[ItemCreate]
+
+
+class ItemBulkPks(BaseModel):
+    pks: List[str]
+
+
+class ItemBulkResult(BaseModel):
+    pk: Optional[str] = None
+    item: Optional[Item] = None
+    deleted: Optional[bool] = None
+    error: Optional[str] = None
@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class DBPoolStats(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int = 0
+    timeouts: int = 0
+    total_wait_seconds: float = 0.0
+    avg_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+class UserCacheStats(BaseModel):
+    local_hits: int
+    redis_hits: int
+    misses: int
+    hit_rate: float
+    local_size: int
+
+
+class ResponseCacheStats(BaseModel):
+    local_hits: int
+    redis_hits: int
+    misses: int
+    coalesced: int
+    local_hit_rate: float
+    redis_hit_rate: float
+    local_size: int
+    in_flight: int
+
+
+class ProfilerStatus(BaseModel):
+    running: bool
+    interval: float
+    samples: int
+    started_at: Optional[datetime] = None
+
+
+class LoopLagStats(BaseModel):
+    running: bool
+    samples: int
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+
+class SlowCallback(BaseModel):
+    at: datetime
+    duration: float
+    task: Optional[str] = None
+    coroutine: Optional[str] = None
+    stack: List[str] = []
+
+
+class MemoryStatus(BaseModel):
+    tracing: bool
+    frames: int
+    sample_rate: float
+    traced_current: int
+    traced_peak: int
+    snapshots: List[str] = []
+
+
+class MemorySnapshot(BaseModel):
+    name: str
+    taken_at: datetime
+    size: int
+
+
+class MemoryStatDiff(BaseModel):
+    filename: str
+    lineno: Optional[int] = None
+    size: int
+    size_diff: int
+    count: int
+    count_diff: int
+
+
+class RouteMemoryStats(BaseModel):
+    route: str
+    samples: int
+    max_peak: int
+    avg_peak: float
@@ -1,15 +1,18 @@
 import pytest
 from httpx import AsyncClient
+from motor.motor_asyncio import AsyncIOMotorClient
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
+from app.db.mongo.indexes import ensure_mongo_indexes
 from app.tests.utils.item import create_random_item
+from app.tests.utils.utils import random_game_date
 
 
 @pytest.mark.asyncio
 async def test_create_game(client: AsyncClient, superuser_token_headers: dict) -> None:
     data = {
-        "date": "10-12-2920",
+        "date": random_game_date(),
         "games": {
             "0": {
                 "schedule": {"away": "CHC", "home": "CWS"},
@@ -29,6 +32,19 @@ async def test_create_game(client: AsyncClient, superuser_token_headers: dict) -
     assert content["id"]
 
 
+@pytest.mark.asyncio
+async def test_create_game_invalid_date(
+    client: AsyncClient, superuser_token_headers: dict
+) -> None:
+    for game_date in ["05-18-2022", "2022-05-18", "20220532", "2022518"]:
+        response = await client.post(
+            f"{settings.API_V1_STR}/games/",
+            headers=superuser_token_headers,
+            json={"date": game_date, "games": {}},
+        )
+        assert response.status_code == 422, game_date
+
+
 @pytest.mark.asyncio
 async def test_read_game(
     client: AsyncClient, superuser_token_headers: dict, db_session: AsyncSession
@@ -56,3 +72,152 @@ async def test_read_games(
     )
     assert response.status_code == 200
     content = response.json()
+
+
+@pytest.mark.asyncio
+async def test_read_games_projection(
+    client: AsyncClient, superuser_token_headers: dict
+) -> None:
+    data = {"date": random_game_date(), "games": {"0": {"score": {"home": 2}}}}
+    response = await client.post(
+        f"{settings.API_V1_STR}/games/",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    game_id = response.json()["_id"]
+    response = await client.get(
+        f"{settings.API_V1_STR}/games/",
+        headers=superuser_token_headers,
+        params={"fields": "date", "limit": 5},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content
+    for game in content:
+        assert set(game) == {"_id", "date"}
+
+    response = await client.get(
+        f"{settings.API_V1_STR}/games/{game_id}", params={"fields": "date"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"_id": game_id, "date": data["date"]}
+
+    response = await client.get(
+        f"{settings.API_V1_STR}/games/",
+        headers=superuser_token_headers,
+        params={"fields": "nope"},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_game(
+    client: AsyncClient, superuser_token_headers: dict
+) -> None:
+    data = {"date": random_game_date(), "games": {"0": {"score": {"home": 4}}}}
+    response = await client.post(
+        f"{settings.API_V1_STR}/games/",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    game_id = response.json()["_id"]
+    new_date = random_game_date()
+    response = await client.patch(
+        f"{settings.API_V1_STR}/games/{game_id}",
+        headers=superuser_token_headers,
+        json={"date": new_date},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["date"] == new_date
+    assert content["games"] == data["games"]
+    response = await client.patch(
+        f"{settings.API_V1_STR}/games/{game_id}",
+        headers=superuser_token_headers,
+        json={"date": "05-18-2022"},
+    )
+    assert response.status_code == 422
+
+    response = await client.delete(
+        f"{settings.API_V1_STR}/games/{game_id}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    response = await client.delete(
+        f"{settings.API_V1_STR}/games/{game_id}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Game not found"}
+    response = await client.patch(
+        f"{settings.API_V1_STR}/games/{game_id}",
+        headers=superuser_token_headers,
+        json={"date": new_date},
+    )
+    assert response.status_code == 404
+
+    for method in ("PATCH", "DELETE"):
+        response = await client.request(
+            method,
+            f"{settings.API_V1_STR}/games/not-an-id",
+            headers=superuser_token_headers,
+            json={"date": new_date},
+        )
+        assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_read_games_date_range(
+    client: AsyncClient, superuser_token_headers: dict, mongo_db: AsyncIOMotorClient
+) -> None:
+    await ensure_mongo_indexes(mongo_db)
+    dates = ["29200301", "29200302", "29200303"]
+    for game_date in dates:
+        await client.post(
+            f"{settings.API_V1_STR}/games/",
+            headers=superuser_token_headers,
+            json={"date": game_date, "games": {}},
+        )
+    response = await client.get(
+        f"{settings.API_V1_STR}/games/",
+        headers=superuser_token_headers,
+        params={"from": "2920-03-02", "to": "2920-03-03", "fields": "date"},
+    )
+    assert response.status_code == 200
+    assert [game["date"] for game in response.json()] == dates[1:]
+
+    response = await client.post(
+        f"{settings.API_V1_STR}/games/",
+        headers=superuser_token_headers,
+        json={"date": dates[0], "games": {}},
+    )
+    assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_game_etag(client: AsyncClient, superuser_token_headers: dict) -> None:
+    data = {"date": random_game_date(), "games": {}}
+    response = await client.post(
+        f"{settings.API_V1_STR}/games/",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    url = f"{settings.API_V1_STR}/games/{response.json()['_id']}"
+    response = await client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+    response = await client.patch(
+        url, headers={"If-Match": etag}, json={"date": random_game_date()}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    response = await client.patch(
+        url, headers={"If-Match": etag}, json={"date": random_game_date()}
+    )
+    assert response.status_code == 412
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
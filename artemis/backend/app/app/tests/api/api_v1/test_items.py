@@ -1,3 +1,6 @@
+import json
+from typing import Callable
+
 import pytest
 from httpx import AsyncClient
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -37,3 +40,242 @@ async def test_read_item(
     assert content["description"] == item.description
     assert content["id"] == item.id
     assert content["owner_id"] == item.owner_id
+
+
+@pytest.mark.asyncio
+async def test_read_items_cursor(
+    client: AsyncClient, superuser_token_headers: dict, db_session: AsyncSession
+) -> None:
+    for _ in range(3):
+        await create_random_item(db_session=db_session)
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=superuser_token_headers,
+        params={"limit": 2},
+    )
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page) == 2
+    cursor = response.headers["X-Next-Cursor"]
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=superuser_token_headers,
+        params={"limit": 2, "cursor": cursor},
+    )
+    assert response.status_code == 200
+    second_page = response.json()
+    assert second_page
+    assert second_page[0]["id"] > first_page[-1]["id"]
+
+
+@pytest.mark.asyncio
+async def test_read_items_ndjson(
+    client: AsyncClient, superuser_token_headers: dict, db_session: AsyncSession
+) -> None:
+    for _ in range(3):
+        await create_random_item(db_session=db_session)
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=superuser_token_headers,
+        params={"limit": 2},
+    )
+    expected = response.json()
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers={**superuser_token_headers, "Accept": "application/x-ndjson"},
+        params={"limit": 2},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [i["id"] for i in expected]
+
+
+@pytest.mark.asyncio
+async def test_read_items_queries(
+    client: AsyncClient,
+    superuser_token_headers: dict,
+    db_session: AsyncSession,
+    assert_max_queries: Callable,
+) -> None:
+    for _ in range(5):
+        await create_random_item(db_session=db_session)
+    # The user, then the page, however many items it holds
+    with assert_max_queries(2, backend="postgres") as small:
+        await client.get(
+            f"{settings.API_V1_STR}/items/",
+            headers=superuser_token_headers,
+            params={"limit": 1},
+        )
+    with assert_max_queries(2, backend="postgres") as large:
+        await client.get(
+            f"{settings.API_V1_STR}/items/",
+            headers=superuser_token_headers,
+            params={"limit": 5},
+        )
+    assert large.postgres == small.postgres
+
+
+@pytest.mark.asyncio
+async def test_update_item_queries(
+    client: AsyncClient,
+    superuser_token_headers: dict,
+    db_session: AsyncSession,
+    assert_max_queries: Callable,
+) -> None:
+    item = await create_random_item(db_session=db_session)
+    # The user, then a single UPDATE ... RETURNING
+    with assert_max_queries(2, backend="postgres"):
+        response = await client.put(
+            f"{settings.API_V1_STR}/items/{item.id}",
+            headers=superuser_token_headers,
+            json={"title": "Updated"},
+        )
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_read_items_invalid_cursor(
+    client: AsyncClient, superuser_token_headers: dict
+) -> None:
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=superuser_token_headers,
+        params={"cursor": "not-a-cursor"},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_read_items_fields(
+    client: AsyncClient, superuser_token_headers: dict, db_session: AsyncSession
+) -> None:
+    item = await create_random_item(db_session=db_session)
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=superuser_token_headers,
+        params={"fields": "title", "limit": 5},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content
+    for record in content:
+        assert set(record) == {"id", "title"}
+
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/{item.id}",
+        headers=superuser_token_headers,
+        params={"fields": "title"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"id": item.id, "title": item.title}
+    assert response.headers["ETag"]
+
+    response = await client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=superuser_token_headers,
+        params={"fields": "nope"},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_create_items_bulk(
+    client: AsyncClient, superuser_token_headers: dict
+) -> None:
+    data = [{"title": f"Foo {i}", "description": "Fighters"} for i in range(3)]
+    response = await client.post(
+        f"{settings.API_V1_STR}/items/bulk",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [item["title"] for item in content] == [item["title"] for item in data]
+    assert all("id" in item and "owner_id" in item for item in content)
+
+
+@pytest.mark.asyncio
+async def test_update_item_not_owner(
+    client: AsyncClient, normal_user_token_headers: dict, db_session: AsyncSession
+) -> None:
+    item = await create_random_item(db_session=db_session)
+    response = await client.put(
+        f"{settings.API_V1_STR}/items/{item.id}",
+        headers=normal_user_token_headers,
+        json={"title": "Foo"},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_delete_item_not_found(
+    client: AsyncClient, superuser_token_headers: dict, db_session: AsyncSession
+) -> None:
+    item = await create_random_item(db_session=db_session)
+    response = await client.delete(
+        f"{settings.API_V1_STR}/items/{item.id}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["id"] == item.id
+    response = await client.delete(
+        f"{settings.API_V1_STR}/items/{item.id}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_read_item_cached(
+    client: AsyncClient,
+    superuser_token_headers: dict,
+    db_session: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", True)
+    item = await create_random_item(db_session=db_session)
+    url = f"{settings.API_V1_STR}/items/{item.id}"
+    response = await client.get(url, headers=superuser_token_headers)
+    assert response.headers["X-Cache"] == "MISS"
+    response = await client.get(url, headers=superuser_token_headers)
+    assert response.headers["X-Cache"] == "HIT"
+    assert response.json()["title"] == item.title
+
+    response = await client.put(
+        url, headers=superuser_token_headers, json={"title": "Foo"}
+    )
+    assert response.status_code == 200
+    response = await client.get(url, headers=superuser_token_headers)
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json()["title"] == "Foo"
+
+
+@pytest.mark.asyncio
+async def test_item_etag(
+    client: AsyncClient, superuser_token_headers: dict, db_session: AsyncSession
+) -> None:
+    item = await create_random_item(db_session=db_session)
+    url = f"{settings.API_V1_STR}/items/{item.id}"
+    response = await client.get(url, headers=superuser_token_headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    response = await client.get(
+        url, headers={**superuser_token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    response = await client.put(
+        url,
+        headers={**superuser_token_headers, "If-Match": etag},
+        json={"title": "Foo"},
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] == f'"{response.json()["version_id"]}"'
+    assert response.headers["ETag"] != etag
+    response = await client.put(
+        url,
+        headers={**superuser_token_headers, "If-Match": etag},
+        json={"title": "Bar"},
+    )
+    assert response.status_code == 412
@@ -1,9 +1,10 @@
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
 import pytest
 from httpx import AsyncClient
 
 from app.core.config import settings
+from app.tests.utils.utils import random_lower_string
 
 
 @pytest.mark.asyncio
@@ -50,3 +51,108 @@ async def test_get_items(
     assert response.status_code == 200
     content = response.json()
     assert isinstance(content["name"], dict)
+
+
+@pytest.mark.asyncio
+async def test_list_redis_items_filters_by_name_newest_first(
+    client: AsyncClient, superuser_token_headers: Dict[Any, Any]
+) -> None:
+    name = random_lower_string()
+    for _ in range(3):
+        await client.post(
+            url=f"{settings.API_V1_STR}/redis_item/",
+            headers=superuser_token_headers,
+            json={"name": name},
+        )
+    response = await client.get(
+        url=f"{settings.API_V1_STR}/redis_item/",
+        headers=superuser_token_headers,
+        params={"name": name, "limit": 2},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert len(content) == 2
+    assert all(item["name"] == name for item in content)
+    assert content[0]["timestamp"] >= content[1]["timestamp"]
+
+
+@pytest.mark.asyncio
+async def test_get_redis_item(
+    client: AsyncClient, superuser_token_headers: Dict[Any, Any]
+) -> None:
+    response = await client.post(
+        url=f"{settings.API_V1_STR}/redis_item/",
+        headers=superuser_token_headers,
+        json={"name": "hello"},
+    )
+    pk = response.json()["pk"]
+    response = await client.get(
+        url=f"{settings.API_V1_STR}/redis_item/{pk}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["pk"] == pk
+
+    response = await client.get(
+        url=f"{settings.API_V1_STR}/redis_item/missing-{pk}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_bulk_redis_items_keep_request_order(
+    client: AsyncClient, superuser_token_headers: Dict[Any, Any]
+) -> None:
+    names = [random_lower_string() for _ in range(5)]
+    response = await client.post(
+        url=f"{settings.API_V1_STR}/redis_item/bulk",
+        headers=superuser_token_headers,
+        json={"items": [{"name": name} for name in names]},
+    )
+    assert response.status_code == 200
+    created = response.json()
+    assert [r["item"]["name"] for r in created] == names
+    pks = [created[3]["pk"], "missing", created[0]["pk"]]
+
+    response = await client.post(
+        url=f"{settings.API_V1_STR}/redis_item/bulk/get",
+        headers=superuser_token_headers,
+        json={"pks": pks},
+    )
+    assert response.status_code == 200
+    fetched = response.json()
+    assert [r["pk"] for r in fetched] == pks
+    assert fetched[0]["item"]["name"] == names[3]
+    assert fetched[1]["item"] is None
+    assert fetched[1]["error"] == "Item missing not found"
+    assert fetched[2]["item"]["name"] == names[0]
+
+    response = await client.post(
+        url=f"{settings.API_V1_STR}/redis_item/bulk/delete",
+        headers=superuser_token_headers,
+        json={"pks": pks},
+    )
+    assert response.status_code == 200
+    assert [r["deleted"] for r in response.json()] == [True, False, True]
+
+
+@pytest.mark.asyncio
+async def test_list_redis_items_queries(
+    client: AsyncClient,
+    superuser_token_headers: Dict[Any, Any],
+    assert_max_queries: Callable,
+) -> None:
+    for _ in range(3):
+        await client.post(
+            url=f"{settings.API_V1_STR}/redis_item/",
+            headers=superuser_token_headers,
+            json={"name": random_lower_string()},
+        )
+    # A single FT.SEARCH, not one HGETALL per item
+    with assert_max_queries(1, backend="redis"):
+        response = await client.get(
+            url=f"{settings.API_V1_STR}/redis_item/",
+            headers=superuser_token_headers,
+        )
+    assert response.status_code == 200
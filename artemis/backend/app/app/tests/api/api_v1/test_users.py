@@ -38,6 +38,24 @@ async def test_get_users_normal_user_me(
     assert current_user["email"] == settings.EMAIL_TEST_USER
 
 
+@pytest.mark.asyncio
+async def test_get_users_me_cached(
+    client: AsyncClient,
+    normal_user_token_headers: Dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # The second request authenticates with the cached user
+    monkeypatch.setattr(settings, "USER_CACHE_ENABLED", True)
+    for _ in range(2):
+        r = await client.get(
+            f"{settings.API_V1_STR}/users/me", headers=normal_user_token_headers
+        )
+        assert r.status_code == 200
+        current_user = r.json()
+        assert current_user["email"] == settings.EMAIL_TEST_USER
+        assert "hashed_password" not in current_user
+
+
 @pytest.mark.skip(reason="Email is not active yet")
 @pytest.mark.asyncio
 async def test_create_user_new_email(
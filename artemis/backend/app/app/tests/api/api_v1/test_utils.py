@@ -0,0 +1,101 @@
+import asyncio
+from typing import Dict
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+
+
+@pytest.mark.asyncio
+async def test_read_db_pool_stats(
+    client: AsyncClient, superuser_token_headers: Dict[str, str]
+) -> None:
+    r = await client.get(
+        f"{settings.API_V1_STR}/utils/db-pool-stats/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    stats = r.json()
+    assert stats["size"] == settings.MIN_CONNECTION_COUNT
+    assert stats["checked_out"] >= 0
+    assert stats["max_wait_seconds"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_read_db_pool_stats_normal_user(
+    client: AsyncClient, normal_user_token_headers: Dict[str, str]
+) -> None:
+    r = await client.get(
+        f"{settings.API_V1_STR}/utils/db-pool-stats/", headers=normal_user_token_headers
+    )
+    assert r.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_read_response_cache_stats(
+    client: AsyncClient, superuser_token_headers: Dict[str, str]
+) -> None:
+    r = await client.get(
+        f"{settings.API_V1_STR}/utils/response-cache-stats/",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    stats = r.json()
+    assert 0 <= stats["local_hit_rate"] <= 1
+    assert 0 <= stats["redis_hit_rate"] <= 1
+    assert stats["coalesced"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_profiler(
+    client: AsyncClient, superuser_token_headers: Dict[str, str]
+) -> None:
+    r = await client.post(
+        f"{settings.API_V1_STR}/utils/profiler/start/",
+        headers=superuser_token_headers,
+        params={"interval": 0.001},
+    )
+    assert r.status_code == 200
+    assert r.json()["running"]
+    r = await client.post(
+        f"{settings.API_V1_STR}/utils/profiler/start/", headers=superuser_token_headers
+    )
+    assert r.status_code == 409
+    await asyncio.sleep(0.05)
+    r = await client.post(
+        f"{settings.API_V1_STR}/utils/profiler/stop/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    assert not r.json()["running"]
+    assert r.json()["samples"] > 0
+
+    r = await client.get(
+        f"{settings.API_V1_STR}/utils/profiler/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    assert "profile.collapsed" in r.headers["content-disposition"]
+    stack, count = r.text.splitlines()[0].rsplit(" ", 1)
+    assert int(count) > 0
+
+    for params in (
+        {"interval": -1},
+        {"duration": 0},
+        {"duration": settings.PROFILER_MAX_SECONDS + 1},
+    ):
+        r = await client.post(
+            f"{settings.API_V1_STR}/utils/profiler/start/",
+            headers=superuser_token_headers,
+            params=params,
+        )
+        assert r.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_normal_user(
+    client: AsyncClient, normal_user_token_headers: Dict[str, str]
+) -> None:
+    for path in ("loop-lag/", "slow-callbacks/", "profiler/", "memory/routes/"):
+        r = await client.get(
+            f"{settings.API_V1_STR}/utils/{path}", headers=normal_user_token_headers
+        )
+        assert r.status_code == 400
@@ -0,0 +1,42 @@
+from datetime import datetime
+from decimal import Decimal
+
+import orjson
+from bson import ObjectId
+
+from app.api.responses import dumps, trusted_record
+from app.models.mongo.mysportsfeeds import Games, PartialGames
+from app.models.postgres.item import Item
+from app.models.postgres.user import User as UserRow
+from app.schemas.postgres.user import User
+
+
+def test_dumps_encodes_like_pydantic() -> None:
+    _id = ObjectId()
+    when = datetime(2022, 10, 1, 12, 30)
+    content = {"_id": _id, "when": when, "odds": Decimal("1.5"), 1: {"a"}}
+    assert orjson.loads(dumps(content)) == {
+        "_id": str(_id),
+        "when": "2022-10-01T12:30:00",
+        "odds": 1.5,
+        "1": ["a"],
+    }
+
+
+def test_trusted_record_matches_validated_model() -> None:
+    document = {"_id": ObjectId(), "date": "20221001", "games": {}, "_rev": 3}
+    assert orjson.loads(dumps(trusted_record(document, Games))) == orjson.loads(
+        Games.validate(document).json(by_alias=True)
+    )
+    partial = trusted_record({"_id": document["_id"]}, PartialGames, exclude_unset=True)
+    assert partial == {"_id": document["_id"]}
+
+    item = Item(id=1, title="Foo", description="Fighters", owner_id=2)
+    assert trusted_record(item, Item) == Item.validate(item).dict()
+
+
+def test_trusted_record_only_keeps_model_fields() -> None:
+    row = UserRow(id=1, email="user@example.com", hashed_password="secret")
+    record = trusted_record(row, User)
+    assert "hashed_password" not in record
+    assert record == User.from_orm(row).dict()
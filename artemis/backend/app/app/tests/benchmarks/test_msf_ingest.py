@@ -0,0 +1,41 @@
+import os
+from datetime import date, timedelta
+from typing import Generator
+
+import pytest
+from pymongo.database import Database
+
+from app.db.mongo.session import get_sync_client
+from app.msf.client import MSFClient
+from app.msf.fake import FakeFeedServer, fake_payload
+from app.msf.feeds import get_feed
+from app.msf.pipeline import date_range, ingest
+
+DAYS = int(os.getenv("BENCH_MSF_DAYS", "365"))
+RECORDS = int(os.getenv("BENCH_MSF_RECORDS", "15"))
+LATENCY = float(os.getenv("BENCH_MSF_LATENCY", "0.02"))
+BENCH_DB = "MySportsFeedsBench"
+
+pytestmark = pytest.mark.bench
+
+
+@pytest.fixture
+def bench_db() -> Generator:
+    client = get_sync_client()
+    yield client[BENCH_DB]
+    client.drop_database(BENCH_DB)
+
+
+def test_msf_ingest_throughput(bench_db: Database) -> None:
+    feed = get_feed("games")
+    first = date(2022, 4, 1)
+    dates = date_range(first, first + timedelta(days=DAYS - 1))
+    with FakeFeedServer(fake_payload(records=RECORDS), latency=LATENCY) as server:
+        client = MSFClient(server.base_url, requests_per_second=0)
+        serial = ingest(
+            feed, "bench", dates, client=client, database=bench_db, concurrency=1
+        )
+        bench_db.drop_collection(feed.collection)
+        parallel = ingest(feed, "bench", dates, client=client, database=bench_db)
+    assert serial.documents == parallel.documents == DAYS
+    assert parallel.docs_per_second > serial.docs_per_second
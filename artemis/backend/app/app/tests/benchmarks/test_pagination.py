@@ -0,0 +1,82 @@
+import os
+import statistics
+import time
+from typing import Any, Awaitable, Callable
+
+import pytest
+from sqlalchemy import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud.postgres.item import item_crud
+from app.models.postgres.item import Item
+from app.tests.utils.user import create_random_user
+
+ROWS = int(os.getenv("BENCH_PAGINATION_ROWS", "20000"))
+PAGE_SIZE = 100
+REPEATS = 15
+
+pytestmark = pytest.mark.bench
+
+
+async def median_latency(query: Callable[[], Awaitable[Any]]) -> float:
+    samples = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        await query()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+@pytest.mark.asyncio
+async def test_keyset_deep_page_latency_is_flat(db_session: AsyncSession) -> None:
+    user = await create_random_user(db_session)
+    await db_session.execute(
+        insert(Item.__table__),  # type: ignore
+        [
+            {"title": f"item {i}", "description": "bench", "owner_id": user.id}
+            for i in range(ROWS)
+        ],
+    )
+    deep_skip = ROWS - PAGE_SIZE
+    q = await db_session.exec(
+        select(Item.id)  # type: ignore
+        .where(Item.owner_id == user.id)
+        .order_by(Item.id)
+        .offset(deep_skip - 1)
+        .limit(1)
+    )
+    deep_after_id = q.one()
+
+    async def first_page() -> Any:
+        return await item_crud.get_multi_by_owner(
+            db_session, owner_id=user.id, limit=PAGE_SIZE  # type: ignore
+        )
+
+    async def deep_page_keyset() -> Any:
+        return await item_crud.get_multi_by_owner(
+            db_session,
+            owner_id=user.id,  # type: ignore
+            limit=PAGE_SIZE,
+            after_id=deep_after_id,
+        )
+
+    async def deep_page_offset() -> Any:
+        return await item_crud.get_multi_by_owner(
+            db_session,
+            owner_id=user.id,  # type: ignore
+            skip=deep_skip,
+            limit=PAGE_SIZE,
+        )
+
+    keyset_items = await deep_page_keyset()
+    offset_items = await deep_page_offset()
+    assert [item.id for item in keyset_items] == [item.id for item in offset_items]
+    assert len(keyset_items) == PAGE_SIZE
+
+    first = await median_latency(first_page)
+    keyset = await median_latency(deep_page_keyset)
+    offset = await median_latency(deep_page_offset)
+    assert keyset < offset
+    # Keyset pages cost the same at any depth; allow for timer noise on tiny pages
+    assert keyset < first * 3 + 0.002
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import statistics
+import time
+from typing import AsyncGenerator, List
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+
+LOGINS = int(os.getenv("BENCH_LOGIN_STORM", "32"))
+PROBE_INTERVAL = 0.01
+
+pytestmark = pytest.mark.bench
+
+
+@pytest_asyncio.fixture
+async def live_client() -> AsyncGenerator:
+    """
+    Client whose requests each get their own database session, the shared test
+    session cannot serve concurrent requests.
+    """
+    from app.main import app
+
+    overrides = app.dependency_overrides.copy()
+    app.dependency_overrides.clear()
+    async with AsyncClient(app=app, base_url="http://127.0.0.1") as c:
+        yield c
+    app.dependency_overrides.update(overrides)
+
+
+def p99(samples: List[float]) -> float:
+    return statistics.quantiles(samples, n=100)[98]
+
+
+async def probe_latencies(client: AsyncClient, stop: asyncio.Event) -> List[float]:
+    samples = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        r = await client.get(f"{settings.API_V1_STR}/openapi.json")
+        assert r.status_code == 200
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(PROBE_INTERVAL)
+    return samples
+
+
+@pytest.mark.asyncio
+async def test_login_storm_does_not_stall_other_requests(
+    live_client: AsyncClient,
+) -> None:
+    client = live_client
+    start = time.perf_counter()
+    get_password_hash("password")
+    hash_time = time.perf_counter() - start
+
+    stop = asyncio.Event()
+    idle = asyncio.ensure_future(probe_latencies(client, stop))
+    await asyncio.sleep(1)
+    stop.set()
+    idle_samples = await idle
+
+    login_data = {
+        "username": settings.FIRST_SUPERUSER,
+        "password": settings.FIRST_SUPERUSER_PASSWORD,
+    }
+    stop = asyncio.Event()
+    busy = asyncio.ensure_future(probe_latencies(client, stop))
+    responses = await asyncio.gather(
+        *(
+            client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+            for _ in range(LOGINS)
+        )
+    )
+    stop.set()
+    busy_samples = await busy
+
+    assert all(r.status_code in (200, 503) for r in responses)
+    # A single bcrypt call on the event loop would stall the probe for a whole hash
+    assert p99(busy_samples) < max(hash_time, p99(idle_samples) * 3)
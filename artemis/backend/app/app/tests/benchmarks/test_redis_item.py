@@ -0,0 +1,79 @@
+import os
+import time
+from typing import Any, AsyncIterator, List
+
+import pytest
+import pytest_asyncio
+from aredis_om import Migrator
+
+from app.db.redis.session import redis_conn
+from app.models.redis.item import Item
+
+ITEMS = int(os.getenv("BENCH_REDIS_ITEMS", "5000"))
+PIPELINE_SIZE = 1000
+PAGE_SIZE = 100
+
+pytestmark = pytest.mark.bench
+
+
+@pytest_asyncio.fixture
+async def seeded_items() -> AsyncIterator[List[Item]]:
+    await Migrator().run()
+    items = [Item(name=f"bench-{i % 100}") for i in range(ITEMS)]
+    for start in range(0, ITEMS, PIPELINE_SIZE):
+        end = start + PIPELINE_SIZE
+        async with redis_conn.pipeline(transaction=False) as pipe:
+            for item in items[start:end]:
+                await item.save(pipeline=pipe)
+            await pipe.execute()
+    yield items
+    for start in range(0, ITEMS, PIPELINE_SIZE):
+        end = start + PIPELINE_SIZE
+        keys = [item.key() for item in items[start:end]]
+        await redis_conn.delete(*keys)
+
+
+async def scan_list(name: str) -> List[Item]:
+    items = []
+    pks = [pk async for pk in await Item.all_pks()]
+    for pk in pks:
+        item = await Item.get(pk)
+        if item.name == name:
+            items.append(item)
+    return items
+
+
+async def scan_get(pk: str) -> Any:
+    pks = [val async for val in await Item.all_pks()]
+    for val in pks:
+        item = await Item.get(val)
+        if item.pk == pk:
+            return item
+
+
+async def timed(coro: Any) -> Any:
+    start = time.perf_counter()
+    result = await coro
+    return result, time.perf_counter() - start
+
+
+@pytest.mark.asyncio
+async def test_indexed_list_and_get_beat_full_scan(seeded_items: List[Item]) -> None:
+    target = seeded_items[-1]
+    query = Item.find(Item.name == target.name).sort_by("-timestamp")
+
+    page, indexed_list = await timed(
+        query.copy(offset=0, limit=PAGE_SIZE).execute(exhaust_results=False)
+    )
+    fetched, indexed_get = await timed(Item.get(target.pk))
+    scanned, scan_list_time = await timed(scan_list(target.name))
+    scanned_item, scan_get_time = await timed(scan_get(target.pk))
+
+    assert len(page) == min(PAGE_SIZE, len(scanned))
+    assert all(item.name == target.name for item in page)
+    assert [item.timestamp for item in page] == sorted(
+        (item.timestamp for item in page), reverse=True
+    )
+    assert fetched == scanned_item == target
+    assert indexed_list < scan_list_time
+    assert indexed_get < scan_get_time
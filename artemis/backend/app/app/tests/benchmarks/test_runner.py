@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pytest
+
+from app.benchmarks.__main__ import main, parse_args
+from app.benchmarks.runner import BenchmarkReport, ScenarioResult, compare
+from app.benchmarks.scenarios import SCENARIOS
+from app.benchmarks.seed import SeedCounts
+
+
+def report(requests_per_second: float, p95: float, errors: int = 0) -> BenchmarkReport:
+    result = ScenarioResult(
+        name="items_list",
+        requests=100,
+        errors=errors,
+        seconds=100 / requests_per_second,
+        requests_per_second=requests_per_second,
+        p50=p95 / 2,
+        p95=p95,
+        p99=p95 * 2,
+        max=p95 * 3,
+    )
+    return BenchmarkReport(
+        created_at=datetime.utcnow(),
+        backends="stand-in",
+        concurrency=10,
+        seed=SeedCounts(),
+        results={"items_list": result},
+    )
+
+
+def test_compare() -> None:
+    baseline = report(1000, 10)
+    assert compare(report(950, 10.5), baseline, tolerance=0.1) == []
+    regressions = compare(report(800, 12, errors=1), baseline, tolerance=0.1)
+    assert len(regressions) == 3
+    assert all(r.startswith("items_list: ") for r in regressions)
+    assert (
+        compare(
+            report(1000, 10),
+            report(1000, 10).copy(update={"results": {}}),
+            tolerance=0.1,
+        )
+        == []
+    )
+
+
+@pytest.mark.asyncio
+async def test_stand_in_scenarios() -> None:
+    args = parse_args(
+        [
+            "--backends=stand-in",
+            "--users=2",
+            "--items=20",
+            "--games=5",
+            "--redis-items=5",
+            "--requests=5",
+            "--concurrency=2",
+        ]
+    )
+    report = await main(args)
+    assert report.backends == "stand-in"
+    expected = {scenario.name for scenario in SCENARIOS if not scenario.redisearch}
+    assert set(report.results) == expected
+    for result in report.results.values():
+        assert result.errors == 0, result.name
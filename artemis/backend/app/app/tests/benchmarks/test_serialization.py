@@ -0,0 +1,81 @@
+import os
+import time
+from typing import Any, Callable, Dict, List
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse
+from httpx import AsyncClient
+from sqlalchemy import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.deps import get_current_active_user, get_db, get_db_readonly
+from app.core.config import settings
+from app.crud.postgres.item import item_crud
+from app.crud.postgres.user import user_crud
+from app.models.postgres.item import Item
+from app.models.postgres.user import User
+
+ROWS = 1000
+REQUESTS = int(os.getenv("BENCH_SERIALIZATION_REQUESTS", "50"))
+
+pytestmark = pytest.mark.bench
+
+
+def baseline_app(override_get_db: Callable) -> FastAPI:
+    """
+    ``GET /items`` as it was served before the fast path: rows validated against
+    ``response_model``, run through ``jsonable_encoder`` and rendered with the
+    standard library ``json``.
+    """
+    app = FastAPI(default_response_class=JSONResponse)
+
+    @app.get(f"{settings.API_V1_STR}/items/", response_model=List[Item])
+    async def read_items(
+        db: AsyncSession = Depends(get_db_readonly),
+        skip: int = 0,
+        limit: int = 100,
+        current_user: User = Depends(get_current_active_user),
+    ) -> Any:
+        return await item_crud.get_multi(db, skip=skip, limit=limit)
+
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+async def requests_per_second(client: AsyncClient, headers: Dict[str, str]) -> float:
+    url = f"{settings.API_V1_STR}/items/?limit={ROWS}"
+    await client.get(url, headers=headers)
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        response = await client.get(url, headers=headers)
+        assert response.status_code == 200
+    return REQUESTS / (time.perf_counter() - start)
+
+
+@pytest.mark.asyncio
+async def test_fast_path_serves_more_requests(
+    client: AsyncClient,
+    superuser_token_headers: Dict[str, str],
+    db_session: AsyncSession,
+    override_get_db: Callable,
+) -> None:
+    superuser = await user_crud.get_by_email(db_session, email=settings.FIRST_SUPERUSER)
+    assert superuser is not None
+    await db_session.execute(
+        insert(Item.__table__),  # type: ignore
+        [
+            {"title": f"item {i}", "description": "bench", "owner_id": superuser.id}
+            for i in range(ROWS)
+        ],
+    )
+    url = f"{settings.API_V1_STR}/items/?limit={ROWS}"
+    async with AsyncClient(
+        app=baseline_app(override_get_db), base_url="http://127.0.0.1"
+    ) as baseline_client:
+        baseline = await baseline_client.get(url, headers=superuser_token_headers)
+        fast = await client.get(url, headers=superuser_token_headers)
+        assert fast.json() == baseline.json()
+        before = await requests_per_second(baseline_client, superuser_token_headers)
+    after = await requests_per_second(client, superuser_token_headers)
+    assert after > before
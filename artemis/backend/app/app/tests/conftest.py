@@ -1,19 +1,39 @@
 import asyncio
-from typing import AsyncGenerator, Callable, Dict, Generator
+import os
+from typing import AsyncGenerator, Callable, Dict, Generator, List
 
+import pytest
 import pytest_asyncio
 from fastapi import FastAPI
 from httpx import AsyncClient
+from motor.motor_asyncio import AsyncIOMotorClient
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
-from app.db.mongo.session import mongo_client
+from app.core.metrics import MongoCommandMetrics, instrument_engine
+from app.tests.utils.queries import max_queries
 from app.tests.utils.user import authentication_token_from_email
 from app.tests.utils.utils import get_superuser_token_headers
 
 
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line("markers", "bench: timing benchmark, run with BENCH=1")
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: List[pytest.Item]
+) -> None:
+    # Wall-clock comparisons are too noisy for every test run
+    if os.getenv("BENCH") == "1":
+        return
+    skip = pytest.mark.skip(reason="benchmark, set BENCH=1 to run it")
+    for item in items:
+        if "bench" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest_asyncio.fixture(scope="session")
 def event_loop(request) -> Generator:  # type: ignore
     loop = asyncio.get_event_loop_policy().new_event_loop()
@@ -24,6 +44,7 @@ def event_loop(request) -> Generator:  # type: ignore
 @pytest_asyncio.fixture
 async def db_session() -> AsyncGenerator:
     engine = create_async_engine(settings.SQLALCHEMY_DATABASE_URI, echo=True)
+    instrument_engine(engine.sync_engine)
     async with engine.begin() as connection:
         async_session = sessionmaker(
             autocommit=False,
@@ -47,11 +68,30 @@ def override_get_db(db_session: AsyncSession) -> Callable:
 
 
 @pytest_asyncio.fixture
-def app(override_get_db: AsyncSession) -> FastAPI:
+async def mongo_db() -> AsyncGenerator:
+    client = AsyncIOMotorClient(
+        settings.MONGO_DATABASE_URI, event_listeners=[MongoCommandMetrics()]
+    )
+    yield client
+    client.close()
+
+
+@pytest_asyncio.fixture
+def app(
+    override_get_db: AsyncSession,
+    mongo_db: AsyncIOMotorClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> FastAPI:
     from app.api.deps import get_db
+    from app.db.mongo.session import get_database
     from app.main import app
 
+    # Each test rolls its writes back, cached responses would outlive them
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", False)
+    # A user cached by an earlier test would change the query counts
+    monkeypatch.setattr(settings, "USER_CACHE_ENABLED", False)
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_database] = lambda: mongo_db
 
     return app
 
@@ -62,11 +102,6 @@ async def client(app: FastAPI) -> AsyncGenerator:
         yield c
 
 
-@pytest_asyncio.fixture
-def mongo_db() -> Generator:
-    yield mongo_client
-
-
 @pytest_asyncio.fixture
 async def superuser_token_headers(client: AsyncClient) -> Dict[str, str]:
     return await get_superuser_token_headers(client)
@@ -79,3 +114,13 @@ async def normal_user_token_headers(
     return await authentication_token_from_email(
         client=client, email=settings.EMAIL_TEST_USER, db_session=db_session
     )
+
+
+@pytest.fixture
+def assert_max_queries() -> Callable:
+    """
+    ``with assert_max_queries(n):`` fails the test when the block makes more
+    than ``n`` Postgres, Mongo and Redis round trips, see
+    :func:`app.tests.utils.queries.max_queries`.
+    """
+    return max_queries
@@ -0,0 +1,142 @@
+import asyncio
+from typing import Any, Dict
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+from prometheus_client import REGISTRY
+
+from app.core.cache import ResponseCache, SingleFlight, response_cache
+from app.tests.utils.utils import random_lower_string
+
+
+@pytest.mark.asyncio
+async def test_response_cache_invalidate() -> None:
+    key = random_lower_string()
+    tags = [random_lower_string(), random_lower_string()]
+    entry = {"status_code": 200, "headers": {}, "body": "[]"}
+
+    cached, versions = await response_cache.lookup(key, tags)
+    assert cached is None
+    await response_cache.store(key, entry, ttl=60, versions=versions)
+    cached, _ = await response_cache.lookup(key, tags)
+    assert cached == entry
+
+    await response_cache.invalidate(tags[1])
+    cached, versions = await response_cache.lookup(key, tags)
+    assert cached is None
+    await response_cache.store(key, entry, ttl=60, versions=versions)
+    cached, _ = await response_cache.lookup(key, tags)
+    assert cached == entry
+
+
+@pytest.mark.asyncio
+async def test_response_cache_stale_store() -> None:
+    key = random_lower_string()
+    tags = [random_lower_string()]
+    entry = {"status_code": 200, "headers": {}, "body": "[]"}
+
+    _, versions = await response_cache.lookup(key, tags)
+    # A write lands while the response is computed
+    await response_cache.invalidate(*tags)
+    await response_cache.store(key, entry, ttl=60, versions=versions)
+    cached, _ = await response_cache.lookup(key, tags)
+    assert cached is None
+
+
+@pytest.mark.asyncio
+async def test_single_flight() -> None:
+    flights = SingleFlight()
+    calls = 0
+
+    async def call() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    results = await asyncio.gather(*(flights.do("key", call) for _ in range(10)))
+    assert calls == 1
+    assert [result for result, _ in results] == [1] * 10
+    assert sum(shared for _, shared in results) == 9
+    assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_error() -> None:
+    flights = SingleFlight()
+
+    async def call() -> None:
+        await asyncio.sleep(0.05)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        *(flights.do("key", call) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_response_cache_fetch() -> None:
+    key = random_lower_string()
+    tags = [random_lower_string()]
+    computed = 0
+
+    async def compute() -> Dict[str, Any]:
+        nonlocal computed
+        computed += 1
+        await asyncio.sleep(0.05)
+        return {"status_code": 200, "headers": {}, "body": str(computed)}
+
+    coalesced = response_cache.coalesced
+    results = await asyncio.gather(
+        *(response_cache.fetch(key, tags, ttl=60, compute=compute) for _ in range(5))
+    )
+    assert computed == 1
+    assert all(entry["body"] == "1" and not hit for entry, hit in results)
+    assert response_cache.coalesced - coalesced == 4
+
+    local_hits = response_cache.local_hits
+    entry, hit = await response_cache.fetch(key, tags, ttl=60, compute=compute)
+    assert hit and entry["body"] == "1"
+    assert response_cache.local_hits - local_hits == 1
+
+    redis_hits = response_cache.redis_hits
+    response_cache.local.delete(key)
+    entry, hit = await response_cache.fetch(key, tags, ttl=60, compute=compute)
+    assert hit and entry["body"] == "1"
+    assert response_cache.redis_hits - redis_hits == 1
+
+    await response_cache.invalidate(*tags)
+    entry, hit = await response_cache.fetch(key, tags, ttl=60, compute=compute)
+    assert not hit and entry["body"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_response_cache_metrics() -> None:
+    cache = ResponseCache(FakeRedis(decode_responses=True))
+    key = random_lower_string()
+    tags = [random_lower_string()]
+
+    async def compute() -> Dict[str, Any]:
+        await asyncio.sleep(0.05)
+        return {"status_code": 200, "headers": {}, "body": "[]"}
+
+    def lookups(result: str) -> float:
+        name = "response_cache_lookups_total"
+        return REGISTRY.get_sample_value(name, {"result": result}) or 0
+
+    before = {result: lookups(result) for result in ("local", "redis", "miss")}
+    coalesced = REGISTRY.get_sample_value("response_cache_coalesced_total") or 0
+    await asyncio.gather(
+        *(cache.fetch(key, tags, ttl=60, compute=compute) for _ in range(3))
+    )
+    await cache.fetch(key, tags, ttl=60, compute=compute)
+    cache.local.delete(key)
+    await cache.fetch(key, tags, ttl=60, compute=compute)
+
+    assert lookups("miss") - before["miss"] == 3
+    assert lookups("local") - before["local"] == 1
+    assert lookups("redis") - before["redis"] == 1
+    assert REGISTRY.get_sample_value("response_cache_coalesced_total") == coalesced + 2
+    assert REGISTRY.get_sample_value("response_cache_in_flight") == 0
@@ -0,0 +1,56 @@
+from typing import List
+
+import pytest
+
+from app.core.memory import MemoryTracingError, MemoryTracker
+
+retained: List[bytearray] = []
+
+
+def allocate() -> None:
+    retained.append(bytearray(1_000_000))
+
+
+def test_memory_diff() -> None:
+    tracker = MemoryTracker()
+    with pytest.raises(MemoryTracingError):
+        tracker.take_snapshot("before")
+    tracker.start(frames=1)
+    try:
+        tracker.take_snapshot("before")
+        allocate()
+        tracker.take_snapshot("after")
+        top = tracker.diff("before", "after", limit=1)[0]
+        assert top["filename"] == __file__
+        assert top["size_diff"] >= 1_000_000
+        assert tracker.diff("before", group_by="filename", limit=1)[0]["lineno"] is None
+        with pytest.raises(KeyError):
+            tracker.diff("nope")
+    finally:
+        tracker.stop()
+        retained.clear()
+    assert not tracker.tracing
+    assert not tracker.snapshots
+
+
+def test_route_stats() -> None:
+    tracker = MemoryTracker()
+    tracker.record_peak("GET /a", 100)
+    tracker.record_peak("GET /a", 300)
+    tracker.record_peak("GET /b", 1000)
+    assert tracker.route_stats() == [
+        {
+            "route": "GET /b",
+            "samples": 1,
+            "max_peak": 1000,
+            "total_peak": 1000,
+            "avg_peak": 1000.0,
+        },
+        {
+            "route": "GET /a",
+            "samples": 2,
+            "max_peak": 300,
+            "total_peak": 400,
+            "avg_peak": 200.0,
+        },
+    ]
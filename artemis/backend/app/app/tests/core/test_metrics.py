@@ -0,0 +1,47 @@
+from typing import Dict, Optional
+
+import pytest
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.core.metrics import instrument_engine
+
+
+def sample(name: str, labels: Dict[str, str]) -> Optional[float]:
+    return REGISTRY.get_sample_value(name, labels)
+
+
+@pytest.mark.asyncio
+async def test_metrics_route_template(
+    client: AsyncClient, superuser_token_headers: Dict[str, str]
+) -> None:
+    labels = {
+        "method": "GET",
+        "route": f"{settings.API_V1_STR}/items/{{id}}",
+        "status": "404",
+    }
+    before = sample("http_request_duration_seconds_count", labels) or 0
+    r = await client.get(
+        f"{settings.API_V1_STR}/items/987654321", headers=superuser_token_headers
+    )
+    assert r.status_code == 404
+    assert sample("http_request_duration_seconds_count", labels) == before + 1
+
+    r = await client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert "postgres_query_duration_seconds_bucket" in r.text
+    assert f'route="{settings.API_V1_STR}/items/{{id}}"' in r.text
+    assert "/items/987654321" not in r.text
+
+
+def test_instrument_engine() -> None:
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    labels = {"operation": "SELECT"}
+    before = sample("postgres_query_duration_seconds_count", labels) or 0
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert sample("postgres_query_duration_seconds_count", labels) == before + 1
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.profiling import MIN_INTERVAL_SECONDS, LoopMonitor, SamplingProfiler
+
+
+def busy_function(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampling_profiler() -> None:
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_function, args=(stop,), name="busy")
+    thread.start()
+    profiler = SamplingProfiler()
+    profiler.start(interval=0.001)
+    time.sleep(0.1)
+    profiler.stop()
+    stop.set()
+    thread.join()
+
+    assert not profiler.running
+    assert profiler.samples > 0
+    lines = profiler.collapsed().splitlines()
+    busy = [line for line in lines if line.startswith("busy;")]
+    assert busy
+    stack, count = busy[0].rsplit(" ", 1)
+    assert "busy_function" in stack.split(";")[-1]
+    assert int(count) > 0
+
+
+def test_sampling_profiler_bounds(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "PROFILER_MAX_SECONDS", 0.05)
+    profiler = SamplingProfiler()
+    profiler.start(interval=-1, duration=3600)
+    assert profiler.interval == MIN_INTERVAL_SECONDS
+    time.sleep(0.2)
+    assert not profiler.running
+    profiler.stop()
+
+
+async def blocking_handler() -> None:
+    time.sleep(0.2)
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor() -> None:
+    monitor = LoopMonitor(interval=0.01, slow_threshold=0.05)
+    await monitor.start()
+    await asyncio.sleep(0.05)
+    await blocking_handler()
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    stats = monitor.stats()
+    assert stats["samples"] > 0
+    assert stats["max"] >= 0.15
+    slow = monitor.slow_callbacks[-1]
+    assert slow["duration"] >= 0.15
+    assert "blocking_handler" in slow["coroutine"]
@@ -0,0 +1,26 @@
+import pytest
+
+from app.core.query_counter import count_queries, record_query
+from app.tests.utils.queries import max_queries
+
+
+def test_count_queries_nested() -> None:
+    record_query("postgres", "SELECT 1")
+    with count_queries() as outer:
+        record_query("postgres", "SELECT 1")
+        with count_queries() as inner:
+            record_query("redis", "GET")
+            record_query("mongo", "find")
+        assert (inner.postgres, inner.mongo, inner.redis) == (0, 1, 1)
+    assert (outer.postgres, outer.mongo, outer.redis) == (1, 1, 1)
+    assert str(outer) == "postgres=1, mongo=1, redis=1"
+
+
+def test_max_queries() -> None:
+    with max_queries(1, backend="redis"):
+        record_query("redis", "GET")
+        record_query("postgres", "SELECT 1")
+    with pytest.raises(AssertionError, match="SELECT 2"):
+        with max_queries(1):
+            record_query("postgres", "SELECT 1")
+            record_query("postgres", "SELECT 2")
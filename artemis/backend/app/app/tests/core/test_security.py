@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.security import (
+    PasswordHasherBusyError,
+    get_password_hash_async,
+    password_hasher,
+    verify_password,
+    verify_password_async,
+)
+from app.tests.utils.utils import random_lower_string
+
+
+@pytest.mark.asyncio
+async def test_password_hash_async() -> None:
+    password = random_lower_string()
+    hashed_password = await get_password_hash_async(password)
+    assert verify_password(password, hashed_password)
+    assert await verify_password_async(password, hashed_password)
+    assert not await verify_password_async(random_lower_string(), hashed_password)
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_queue_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "PASSWORD_HASH_QUEUE_LIMIT", 1)
+    pending = asyncio.ensure_future(get_password_hash_async(random_lower_string()))
+    await asyncio.sleep(0)
+    assert password_hasher.pending == 1
+    with pytest.raises(PasswordHasherBusyError):
+        await get_password_hash_async(random_lower_string())
+    await pending
+    assert password_hasher.pending == 0
@@ -0,0 +1,41 @@
+from datetime import date
+from typing import Any, List
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.crud.mongo.game import mongo_game_crud
+from app.db.mongo.indexes import MYSPORTSFEEDS_DB, ensure_mongo_indexes
+
+
+def plan_stages(plan: Any) -> List[str]:
+    if isinstance(plan, list):
+        return [stage for p in plan for stage in plan_stages(p)]
+    if not isinstance(plan, dict):
+        return []
+    stages = [plan["stage"]] if "stage" in plan else []
+    return stages + [stage for p in plan.values() for stage in plan_stages(p)]
+
+
+@pytest.mark.asyncio
+async def test_date_range_uses_date_index(mongo_db: AsyncIOMotorClient) -> None:
+    await ensure_mongo_indexes(mongo_db)
+    coll = mongo_db[MYSPORTSFEEDS_DB].games
+    query = mongo_game_crud.date_range(date(2920, 1, 1), date(2920, 1, 31))
+    assert query == {"date": {"$gte": "29200101", "$lte": "29200131"}}
+
+    explain = await coll.find(query).sort("date", 1).explain()
+    stages = plan_stages(explain["queryPlanner"]["winningPlan"])
+    assert "IXSCAN" in stages
+    assert "COLLSCAN" not in stages
+    assert "SORT" not in stages
+
+
+@pytest.mark.asyncio
+async def test_ensure_mongo_indexes_is_idempotent(
+    mongo_db: AsyncIOMotorClient,
+) -> None:
+    await ensure_mongo_indexes(mongo_db)
+    await ensure_mongo_indexes(mongo_db)
+    info = await mongo_db[MYSPORTSFEEDS_DB].games.index_information()
+    assert info["date_unique"]["unique"] is True
@@ -3,6 +3,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import schemas
 from app.crud.postgres.item import item_crud
+from app.db.postgres.session import READ_ONLY, ReadOnlySessionError
 from app.tests.utils.user import create_random_user
 from app.tests.utils.utils import random_lower_string
 
@@ -72,3 +73,126 @@ async def test_delete_item(db_session: AsyncSession) -> None:
     assert item2.title == title
     assert item2.description == description
     assert item2.owner_id == user.id
+
+
+@pytest.mark.asyncio
+async def test_create_many_items(db_session: AsyncSession) -> None:
+    user = await create_random_user(db_session)
+    items_in = [
+        schemas.ItemCreate(
+            title=random_lower_string(), description=random_lower_string()
+        )
+        for _ in range(5)
+    ]
+    items = await item_crud.create_many_with_owner(
+        db=db_session, objs_in=items_in, owner_id=user.id, chunk_size=2  # type: ignore
+    )
+    assert [item.title for item in items] == [item_in.title for item_in in items_in]
+    assert all(item.id is not None for item in items)
+    assert all(item.owner_id == user.id for item in items)
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_items(db_session: AsyncSession) -> None:
+    user = await create_random_user(db_session)
+    item_in = schemas.ItemCreate(
+        title=random_lower_string(), description=random_lower_string()
+    )
+    item = await item_crud.create_with_owner(
+        db=db_session, obj_in=item_in, owner_id=user.id  # type: ignore
+    )
+    title2 = random_lower_string()
+    rows = [
+        {
+            "id": item.id,
+            "title": title2,
+            "description": item.description,
+            "owner_id": user.id,
+        }
+    ]
+    items = await item_crud.upsert_many(db=db_session, objs_in=rows)
+    assert len(items) == 1
+    assert items[0].id == item.id
+    assert items[0].title == title2
+    stored_item = await item_crud.get(db=db_session, id=item.id)
+    assert stored_item
+    assert stored_item.title == title2
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_items_mixed_columns(db_session: AsyncSession) -> None:
+    user = await create_random_user(db_session)
+    rows = [
+        {"title": random_lower_string(), "owner_id": user.id},
+        {
+            "title": random_lower_string(),
+            "description": random_lower_string(),
+            "owner_id": user.id,
+        },
+    ]
+    with pytest.raises(ValueError):
+        await item_crud.upsert_many(db=db_session, objs_in=rows)
+
+
+@pytest.mark.asyncio
+async def test_update_item_with_owner(db_session: AsyncSession) -> None:
+    item_in = schemas.ItemCreate(
+        title=random_lower_string(), description=random_lower_string()
+    )
+    user = await create_random_user(db_session)
+    other_user = await create_random_user(db_session)
+    item = await item_crud.create_with_owner(
+        db=db_session, obj_in=item_in, owner_id=user.id  # type: ignore
+    )
+    item_update = schemas.ItemUpdate(description=random_lower_string())
+    forbidden = await item_crud.update_with_owner(
+        db=db_session,
+        id=item.id,  # type: ignore
+        obj_in=item_update,
+        owner_id=other_user.id,
+    )
+    assert forbidden is None
+    assert await item_crud.exists(db=db_session, id=item.id)
+    item2 = await item_crud.update_with_owner(
+        db=db_session, id=item.id, obj_in=item_update, owner_id=user.id  # type: ignore
+    )
+    assert item2
+    assert item2.description == item_update.description
+
+
+@pytest.mark.asyncio
+async def test_delete_item_with_owner(db_session: AsyncSession) -> None:
+    item_in = schemas.ItemCreate(
+        title=random_lower_string(), description=random_lower_string()
+    )
+    user = await create_random_user(db_session)
+    other_user = await create_random_user(db_session)
+    item = await item_crud.create_with_owner(
+        db=db_session, obj_in=item_in, owner_id=user.id  # type: ignore
+    )
+    forbidden = await item_crud.remove_with_owner(
+        db=db_session, id=item.id, owner_id=other_user.id  # type: ignore
+    )
+    assert forbidden is None
+    item2 = await item_crud.remove_with_owner(
+        db=db_session, id=item.id, owner_id=user.id  # type: ignore
+    )
+    assert item2
+    assert item2.id == item.id
+    assert not await item_crud.exists(db=db_session, id=item.id)
+
+
+@pytest.mark.asyncio
+async def test_read_only_session_rejects_writes(db_session: AsyncSession) -> None:
+    user = await create_random_user(db_session)
+    item_in = schemas.ItemCreate(
+        title=random_lower_string(), description=random_lower_string()
+    )
+    db_session.info[READ_ONLY] = True
+    try:
+        with pytest.raises(ReadOnlySessionError):
+            await item_crud.create_many_with_owner(
+                db=db_session, objs_in=[item_in], owner_id=user.id  # type: ignore
+            )
+    finally:
+        db_session.info.pop(READ_ONLY, None)
@@ -5,6 +5,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from app import schemas
 from app.core.security import verify_password
 from app.crud.postgres.user import user_crud
+from app.crud.postgres.user_cache import user_cache
 from app.tests.utils.utils import random_email, random_lower_string
 
 
@@ -104,3 +105,41 @@ async def test_update_user(db_session: AsyncSession) -> None:
     assert user_2
     assert user.email == user_2.email
     assert verify_password(new_password, user_2.hashed_password)
+
+
+@pytest.mark.asyncio
+async def test_get_cached_user(db_session: AsyncSession) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user_in = schemas.UserCreate(email=email, password=password)
+    user = await user_crud.create(db_session, obj_in=user_in)
+    misses = user_cache.misses
+    user_2 = await user_crud.get_cached(db_session, id=user.id)
+    assert user_2
+    assert user_2.email == email
+    assert user_cache.misses == misses + 1
+    local_hits = user_cache.local_hits
+    user_3 = await user_crud.get_cached(db_session, id=user.id)
+    assert user_3
+    assert user_3.email == email
+    assert user_3.hashed_password is None
+    assert user_cache.local_hits == local_hits + 1
+    cached = user_cache.local.get(user.id)
+    assert cached
+    assert "hashed_password" not in cached
+
+
+@pytest.mark.asyncio
+async def test_update_user_invalidates_cache(db_session: AsyncSession) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user_in = schemas.UserCreate(email=email, password=password)
+    user = await user_crud.create(db_session, obj_in=user_in)
+    cached_user = await user_crud.get_cached(db_session, id=user.id)
+    assert cached_user
+    assert cached_user.is_active
+    user_in_update = schemas.UserUpdate(is_active=False)
+    await user_crud.update(db_session, db_obj=user, obj_in=user_in_update)
+    user_2 = await user_crud.get_cached(db_session, id=user.id)
+    assert user_2
+    assert user_2.is_active is False
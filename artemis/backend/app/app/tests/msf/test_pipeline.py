@@ -0,0 +1,88 @@
+import time
+from datetime import date
+from typing import Generator
+
+import pytest
+from fakeredis import FakeRedis
+from pymongo.database import Database
+
+from app.core.cache import response_cache
+from app.db.mongo.session import get_sync_client
+from app.msf.client import MSFClient, RateLimiter
+from app.msf.fake import FakeFeedServer
+from app.msf.feeds import get_feed
+from app.msf.pipeline import date_range, ingest
+
+TEST_DB = "MySportsFeedsTest"
+
+
+@pytest.fixture
+def msf_db() -> Generator:
+    client = get_sync_client()
+    yield client[TEST_DB]
+    client.drop_database(TEST_DB)
+
+
+def test_rate_limiter_spaces_calls() -> None:
+    limiter = RateLimiter(50)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - start >= 5 / 50
+
+
+def test_ingest_upserts_one_document_per_date(msf_db: Database) -> None:
+    feed = get_feed("games")
+    dates = date_range(date(2022, 4, 1), date(2022, 4, 10))
+    with FakeFeedServer(empty={"2022-regular/date/20220405/games.json"}) as server:
+        client = MSFClient(server.base_url, requests_per_second=0)
+        first = ingest(
+            feed, "2022-regular", dates, client=client, database=msf_db, batch_size=3
+        )
+        again = ingest(
+            feed, "2022-regular", dates, client=client, database=msf_db, batch_size=3
+        )
+
+    assert first.fetched == 10
+    assert first.empty == 1
+    assert first.upserted == 9
+    assert first.docs_per_second > 0
+    assert again.upserted == 0
+    assert again.matched == 9
+    assert msf_db[feed.collection].count_documents({}) == 9
+    game = msf_db[feed.collection].find_one({"date": "20220401"})
+    assert game is not None
+    assert len(game["games"]) == 15
+
+
+def test_ingest_invalidates_cached_documents(msf_db: Database) -> None:
+    feed = get_feed("games")
+    redis = FakeRedis()
+    with FakeFeedServer() as server:
+        client = MSFClient(server.base_url, requests_per_second=0)
+        ingest(
+            feed,
+            "2022-regular",
+            [date(2022, 4, 1)],
+            client=client,
+            database=msf_db,
+            redis=redis,
+        )
+
+    game = msf_db[feed.collection].find_one({"date": "20220401"})
+    assert game is not None
+    assert redis.get(response_cache.tag_key("games")) == b"1"
+    assert redis.get(response_cache.tag_key(f"games:{game['_id']}")) == b"1"
+
+
+def test_ingest_counts_failed_dates(msf_db: Database) -> None:
+    client = MSFClient("http://127.0.0.1:9", requests_per_second=0, max_retries=1)
+    stats = ingest(
+        get_feed("games"),
+        "2022-regular",
+        [date(2022, 4, 1)],
+        client=client,
+        database=msf_db,
+    )
+    assert stats.failed == 1
+    assert stats.documents == 0
@@ -0,0 +1,95 @@
+from datetime import date
+from typing import Generator
+
+import pytest
+from pymongo.database import Database
+
+from app.core.config import settings
+from app.db.mongo.session import get_sync_client
+from app.db.redis.session import get_sync_redis
+from app.msf.client import MSFClient
+from app.msf.fake import FakeFeedServer
+from app.msf.feeds import get_feed
+from app.msf.sync import SyncInProgressError, load_checkpoint, sync_dates, sync_feed
+
+TEST_DB = "MySportsFeedsSyncTest"
+
+
+@pytest.fixture
+def msf_db() -> Generator:
+    client = get_sync_client()
+    yield client[TEST_DB]
+    client.drop_database(TEST_DB)
+
+
+def test_sync_dates() -> None:
+    today = date(2022, 5, 10)
+    assert sync_dates(date(2022, 5, 8), today, lookback_days=2) == [
+        date(2022, 5, 6),
+        date(2022, 5, 7),
+        date(2022, 5, 8),
+        date(2022, 5, 9),
+        date(2022, 5, 10),
+    ]
+    assert sync_dates(None, today, lookback_days=1) == [
+        date(2022, 5, 9),
+        date(2022, 5, 10),
+    ]
+    assert len(sync_dates(None, today, lookback_days=1, start_date=date(2022, 5, 1)))
+    assert sync_dates(date(2022, 5, 20), today, lookback_days=2) == []
+
+
+def test_sync_feed_moves_checkpoint(
+    msf_db: Database, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "MSF_SYNC_LOOKBACK_DAYS", 2)
+    feed = get_feed("games")
+    redis = get_sync_redis()
+    with FakeFeedServer() as server:
+        client = MSFClient(server.base_url, requests_per_second=0)
+        sync_feed(
+            feed,
+            "2022-regular",
+            client=client,
+            database=msf_db,
+            redis=redis,
+            today=date(2022, 5, 10),
+        )
+        assert load_checkpoint(msf_db, feed) == date(2022, 5, 10)
+        first_run = len(server.paths)
+        sync_feed(
+            feed,
+            "2022-regular",
+            client=client,
+            database=msf_db,
+            redis=redis,
+            today=date(2022, 5, 11),
+        )
+    # Only the two lookback days, the checkpoint day and the new day are
+    # fetched again
+    assert sorted(server.paths[first_run:]) == [
+        "2022-regular/date/20220508/games.json",
+        "2022-regular/date/20220509/games.json",
+        "2022-regular/date/20220510/games.json",
+        "2022-regular/date/20220511/games.json",
+    ]
+    assert load_checkpoint(msf_db, feed) == date(2022, 5, 11)
+
+
+def test_sync_feed_skips_when_locked(msf_db: Database) -> None:
+    feed = get_feed("games")
+    redis = get_sync_redis()
+    lock = redis.lock(f"msf-sync:{feed.name}", timeout=10)
+    assert lock.acquire(blocking=False)
+    try:
+        with pytest.raises(SyncInProgressError):
+            sync_feed(
+                feed,
+                "2022-regular",
+                client=MSFClient(),
+                database=msf_db,
+                redis=redis,
+            )
+    finally:
+        lock.release()
+    assert load_checkpoint(msf_db, feed) is None
@@ -0,0 +1,21 @@
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from app.core.query_counter import QueryCounts, count_queries
+
+
+@contextmanager
+def max_queries(n: int, *, backend: Optional[str] = None) -> Iterator[QueryCounts]:
+    """
+    Fail when the block makes more than ``n`` round trips, to any backend or to
+    ``backend`` only, e.g. ``"postgres"``, listing the queries it ran.
+    """
+    with count_queries() as counts:
+        yield counts
+    count = counts.total if backend is None else getattr(counts, backend)
+    if count > n:
+        queries = "\n".join(f"  {b}: {q}" for b, q in counts.queries)
+        raise AssertionError(
+            f"Expected at most {n} {backend or 'backend'} queries, "
+            f"ran {count} ({counts}):\n{queries}"
+        )
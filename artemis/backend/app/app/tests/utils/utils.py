@@ -1,10 +1,12 @@
 import random
 import string
+from datetime import date, timedelta
 from typing import Dict
 
 from httpx import AsyncClient
 
 from app.core.config import settings
+from app.models.mongo.mysportsfeeds import DATE_FORMAT
 
 
 def random_lower_string() -> str:
@@ -15,6 +17,12 @@ def random_email() -> str:
     return f"{random_lower_string()}@{random_lower_string()}.com"
 
 
+def random_game_date() -> str:
+    # Game dates are unique, pick one far from real and fixed test dates
+    day = date(3000, 1, 1) + timedelta(days=random.randrange(2_000_000))
+    return day.strftime(DATE_FORMAT)
+
+
 async def get_superuser_token_headers(client: AsyncClient) -> Dict[str, str]:
     login_data = {
         "username": settings.FIRST_SUPERUSER,
@@ -1,10 +1,24 @@
+import logging
+from datetime import date
+from typing import Any, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
 from raven import Client
 
 from app.core.celery_app import celery_app
 from app.core.config import settings
+from app.db.mongo.indexes import MYSPORTSFEEDS_DB
+from app.db.mongo.session import get_sync_client
+from app.db.redis.session import get_sync_redis
+from app.msf.client import MSFClient
+from app.msf.feeds import get_feed
+from app.msf.pipeline import IngestStats, date_range, ingest
+from app.msf.sync import SyncInProgressError, sync_feed
 
 client_sentry = Client(settings.SENTRY_DSN)
 
+logger = logging.getLogger(__name__)
+
 
 @celery_app.task(acks_late=True)
 def test_celery(word: str) -> str:
@@ -12,5 +26,73 @@ def test_celery(word: str) -> str:
 
 
 @celery_app.task(acks_late=True)
-def get_msf_data():
-    pass
+def get_msf_data(
+    feed: str, season: str, date_from: str, date_to: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Ingest one MySportsFeeds feed for every date of a range into Mongo.
+
+    Args:
+        feed (str): name of a feed in :data:`app.msf.feeds.FEEDS`
+        season (str): MySportsFeeds season, e.g. ``2022-regular``
+        date_from (str): first date, ISO formatted
+        date_to (Optional[str]): last date, ISO formatted, defaults to
+            ``date_from``
+
+    Returns:
+        Dict[str, Any]: :class:`app.msf.pipeline.IngestStats` with throughput
+    """
+    first = date.fromisoformat(date_from)
+    last = date.fromisoformat(date_to) if date_to else first
+    client = MSFClient()
+    try:
+        stats = ingest(
+            get_feed(feed),
+            season,
+            date_range(first, last),
+            client=client,
+            database=get_sync_client()[MYSPORTSFEEDS_DB],
+            redis=get_sync_redis(),
+        )
+    finally:
+        client.close()
+    return stats_result(stats)
+
+
+@celery_app.task(acks_late=True)
+def sync_msf_feed(feed: str, season: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Incrementally sync one feed from its checkpoint, scheduled by Celery beat
+    for every feed in ``MSF_SYNC_FEEDS``.
+
+    Args:
+        feed (str): name of a feed in :data:`app.msf.feeds.FEEDS`
+        season (Optional[str]): MySportsFeeds season, defaults to ``MSF_SEASON``
+
+    Returns:
+        Dict[str, Any]: :class:`app.msf.pipeline.IngestStats` with throughput,
+            or ``{"skipped": True}`` when another run holds the feed's lock
+    """
+    client = MSFClient()
+    try:
+        stats = sync_feed(
+            get_feed(feed),
+            season or settings.MSF_SEASON,
+            client=client,
+            database=get_sync_client()[MYSPORTSFEEDS_DB],
+            redis=get_sync_redis(),
+        )
+    except SyncInProgressError:
+        logger.info(f"Skipping {feed} sync, another run is in progress")
+        return {"feed": feed, "skipped": True}
+    finally:
+        client.close()
+    return stats_result(stats)
+
+
+def stats_result(stats: IngestStats) -> Dict[str, Any]:
+    return dict(
+        jsonable_encoder(stats),
+        documents=stats.documents,
+        docs_per_second=stats.docs_per_second,
+    )